@@ -57,6 +57,15 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    # migrate.py passes its connection, which holds the migration lock
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+        connection.commit()
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
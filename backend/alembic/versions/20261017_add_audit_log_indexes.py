@@ -0,0 +1,31 @@
+"""Add audit_logs indexes for per-entity history and recent-first listing
+
+Revision ID: audit_log_indexes
+Revises: revenue_reports
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "audit_log_indexes"
+down_revision: Union[str, None] = "revenue_reports"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # id last: it is the keyset cursor's tie-breaker
+    op.create_index(
+        "ix_audit_logs_entity_entity_id_timestamp",
+        "audit_logs",
+        ["entity", "entity_id", "timestamp", "id"],
+    )
+    op.create_index("ix_audit_logs_timestamp_id", "audit_logs", ["timestamp", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_audit_logs_timestamp_id", table_name="audit_logs")
+    op.drop_index("ix_audit_logs_entity_entity_id_timestamp", table_name="audit_logs")
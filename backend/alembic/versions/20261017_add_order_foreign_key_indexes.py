@@ -0,0 +1,33 @@
+"""Index the order foreign keys
+
+Revision ID: order_fk_indexes
+Revises: shopee_listings
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "order_fk_indexes"
+down_revision: Union[str, None] = "shopee_listings"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_orders_distributor_detail_id", "orders", "distributor_detail_id"),
+    ("ix_order_details_order_id", "order_details", "order_id"),
+    ("ix_order_details_product_id", "order_details", "product_id"),
+    ("ix_payments_order_id", "payments", "order_id"),
+]
+
+
+def upgrade() -> None:
+    for name, table, column in INDEXES:
+        op.create_index(name, table, [column])
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,48 @@
+"""Add outbox table for the change feed
+
+Revision ID: outbox
+Revises: audit_log_indexes
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "outbox"
+down_revision: Union[str, None] = "audit_log_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Feed positions, drawn after commit (services/outbox.py)
+    op.execute("CREATE SEQUENCE outbox_seq")
+    op.create_table(
+        "outbox",
+        sa.Column("id", sa.BigInteger(), primary_key=True),
+        sa.Column("seq", sa.BigInteger(), nullable=True),
+        sa.Column("entity", sa.String(), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("action", sa.String(), nullable=False),
+        sa.Column("payload", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_outbox_seq", "outbox", ["seq"], unique=True)
+    op.create_index("ix_outbox_entity_seq", "outbox", ["entity", "seq"])
+    op.create_index(
+        "ix_outbox_unsequenced",
+        "outbox",
+        ["id"],
+        postgresql_where=sa.text("seq IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_outbox_unsequenced", table_name="outbox")
+    op.drop_index("ix_outbox_entity_seq", table_name="outbox")
+    op.drop_index("ix_outbox_seq", table_name="outbox")
+    op.drop_table("outbox")
+    op.execute("DROP SEQUENCE outbox_seq")
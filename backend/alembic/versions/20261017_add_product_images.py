@@ -0,0 +1,30 @@
+"""Uploaded product images
+
+Revision ID: product_images
+Revises: order_fk_indexes
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "product_images"
+down_revision: Union[str, None] = "order_fk_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("products", sa.Column("image_key", sa.String(64), nullable=True))
+    op.add_column(
+        "products", sa.Column("image_widths", postgresql.ARRAY(sa.Integer()), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("products", "image_widths")
+    op.drop_column("products", "image_key")
@@ -0,0 +1,44 @@
+"""Add product filter/sort indexes and trigram search index
+
+Revision ID: product_search_indexes
+Revises: add_shopee_link
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "product_search_indexes"
+down_revision: Union[str, None] = "add_shopee_link"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match CRUDQueries._search_document() for ProductCRUD exactly, or the
+# planner will not use the index
+SEARCH_DOCUMENT = "(coalesce(name, '') || ' ' || coalesce(description, ''))"
+
+
+def upgrade() -> None:
+    op.create_index("ix_products_category_id", "products", ["category", "id"])
+    op.create_index("ix_products_price_id", "products", ["price", "id"])
+    op.create_index("ix_products_name_id", "products", ["name", "id"])
+    op.create_index(
+        "ix_inventory_stock_product_id", "inventory", ["stock", "product_id"]
+    )
+    # Trigrams need no word segmentation, so substring search also works for
+    # Vietnamese and Japanese names (a tsvector config would not)
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX ix_products_search_trgm ON products "
+        f"USING gin ({SEARCH_DOCUMENT} gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_products_search_trgm")
+    op.drop_index("ix_inventory_stock_product_id", table_name="inventory")
+    op.drop_index("ix_products_name_id", table_name="products")
+    op.drop_index("ix_products_price_id", table_name="products")
+    op.drop_index("ix_products_category_id", table_name="products")
@@ -0,0 +1,197 @@
+"""Add daily revenue summary tables maintained by triggers
+
+Revision ID: revenue_reports
+Revises: product_search_indexes
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "revenue_reports"
+down_revision: Union[str, None] = "product_search_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Statement-level triggers read the changed rows from transition tables and
+# append one aggregated delta per (report, day, key): +1 x the new rows,
+# -1 x the old rows (an UPDATE does both). Appending (instead of upserting the
+# daily rows) keeps writers from queueing on a shared summary row such as
+# today's ONLINE revenue until they commit.
+ORDER_DETAIL_DELTA = """
+    INSERT INTO report_deltas (report, day, key, count, quantity, amount)
+    SELECT 'product', o.date::date, l.product_id::text, 0,
+           {sign} * sum(coalesce(l.quantity, 0)),
+           {sign} * sum(coalesce(l.quantity, 0) * coalesce(l.price, 0))
+    FROM {rows} l JOIN orders o ON o.id = l.order_id
+    WHERE l.product_id IS NOT NULL AND o.date IS NOT NULL
+    GROUP BY o.date::date, l.product_id;
+"""
+
+ORDER_DELTA = """
+    INSERT INTO report_deltas (report, day, key, count, quantity, amount)
+    SELECT 'channel', o.date::date, coalesce(d.channel, 'UNKNOWN'),
+           {sign} * count(*), 0, {sign} * sum(coalesce(o.total_price, 0))
+    FROM {rows} o
+    LEFT JOIN distributor_details d ON d.id = o.distributor_detail_id
+    WHERE o.date IS NOT NULL
+    GROUP BY o.date::date, coalesce(d.channel, 'UNKNOWN');
+"""
+
+# Moving an order to another day moves its lines' product revenue too
+ORDER_MOVED_DELTA = """
+    IF TG_OP = 'UPDATE' THEN
+        INSERT INTO report_deltas (report, day, key, count, quantity, amount)
+        SELECT 'product', m.day, l.product_id::text, 0,
+               sum(m.sign * coalesce(l.quantity, 0)),
+               sum(m.sign * coalesce(l.quantity, 0) * coalesce(l.price, 0))
+        FROM old_rows o
+        JOIN new_rows n ON n.id = o.id
+        CROSS JOIN LATERAL (VALUES (o.date::date, -1), (n.date::date, 1)) AS m(day, sign)
+        JOIN order_details l ON l.order_id = o.id
+        WHERE o.date::date IS DISTINCT FROM n.date::date
+          AND m.day IS NOT NULL AND l.product_id IS NOT NULL
+        GROUP BY m.day, l.product_id;
+    END IF;
+"""
+
+PAYMENT_DELTA = """
+    INSERT INTO report_deltas (report, day, key, count, quantity, amount)
+    SELECT 'payment_status', p.date::date, coalesce(p.status, 'UNKNOWN'),
+           {sign} * count(*), 0, {sign} * sum(coalesce(p.amount, 0))
+    FROM {rows} p
+    WHERE p.date IS NOT NULL
+    GROUP BY p.date::date, coalesce(p.status, 'UNKNOWN');
+"""
+
+
+def _delta_function(name: str, delta: str, extra: str = "") -> str:
+    # Each transition table is only referenced on the branch where it exists
+    return f"""
+CREATE FUNCTION {name}() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP <> 'DELETE' THEN
+        {delta.format(rows="new_rows", sign=1)}
+    END IF;
+    IF TG_OP <> 'INSERT' THEN
+        {delta.format(rows="old_rows", sign=-1)}
+    END IF;
+    {extra}
+    RETURN NULL;
+END $$ LANGUAGE plpgsql
+"""
+
+
+# table -> trigger function
+TRIGGERS = {
+    "order_details": "report_order_details_delta",
+    "orders": "report_orders_delta",
+    "payments": "report_payments_delta",
+}
+
+BACKFILL = (
+    """
+    INSERT INTO revenue_daily_product (day, product_id, quantity, revenue)
+    SELECT o.date::date, l.product_id, sum(coalesce(l.quantity, 0)),
+           sum(coalesce(l.quantity, 0) * coalesce(l.price, 0))
+    FROM order_details l JOIN orders o ON o.id = l.order_id
+    WHERE l.product_id IS NOT NULL AND o.date IS NOT NULL
+    GROUP BY 1, 2
+    """,
+    """
+    INSERT INTO revenue_daily_channel (day, channel, orders, revenue)
+    SELECT o.date::date, coalesce(d.channel, 'UNKNOWN'), count(*),
+           sum(coalesce(o.total_price, 0))
+    FROM orders o LEFT JOIN distributor_details d ON d.id = o.distributor_detail_id
+    WHERE o.date IS NOT NULL
+    GROUP BY 1, 2
+    """,
+    """
+    INSERT INTO payments_daily_status (day, status, payments, amount)
+    SELECT date::date, coalesce(status, 'UNKNOWN'), count(*), sum(coalesce(amount, 0))
+    FROM payments
+    WHERE date IS NOT NULL
+    GROUP BY 1, 2
+    """,
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "report_deltas",
+        sa.Column("id", sa.BigInteger(), primary_key=True),
+        sa.Column("report", sa.String(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("key", sa.String(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("quantity", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("amount", sa.Float(), nullable=False, server_default="0"),
+    )
+    op.create_table(
+        "revenue_daily_product",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("product_id", sa.Integer(), primary_key=True),
+        sa.Column("quantity", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("revenue", sa.Float(), nullable=False, server_default="0"),
+    )
+    op.create_index(
+        "ix_revenue_daily_product_product_id_day",
+        "revenue_daily_product",
+        ["product_id", "day"],
+    )
+    op.create_table(
+        "revenue_daily_channel",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("channel", sa.String(), primary_key=True),
+        sa.Column("orders", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("revenue", sa.Float(), nullable=False, server_default="0"),
+    )
+    op.create_table(
+        "payments_daily_status",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("status", sa.String(), primary_key=True),
+        sa.Column("payments", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("amount", sa.Float(), nullable=False, server_default="0"),
+    )
+
+    op.execute(_delta_function("report_order_details_delta", ORDER_DETAIL_DELTA))
+    op.execute(_delta_function("report_orders_delta", ORDER_DELTA, ORDER_MOVED_DELTA))
+    op.execute(_delta_function("report_payments_delta", PAYMENT_DELTA))
+    # One trigger per operation: INSERT triggers only get new_rows, DELETE
+    # triggers only old_rows
+    for table, function in TRIGGERS.items():
+        op.execute(
+            f"CREATE TRIGGER {table}_report_insert AFTER INSERT ON {table} "
+            f"REFERENCING NEW TABLE AS new_rows "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION {function}()"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_report_update AFTER UPDATE ON {table} "
+            f"REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION {function}()"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_report_delete AFTER DELETE ON {table} "
+            f"REFERENCING OLD TABLE AS old_rows "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION {function}()"
+        )
+
+    for statement in BACKFILL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for table, function in TRIGGERS.items():
+        for op_name in ("insert", "update", "delete"):
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_report_{op_name} ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS {function}()")
+    op.drop_table("payments_daily_status")
+    op.drop_table("revenue_daily_channel")
+    op.drop_index(
+        "ix_revenue_daily_product_product_id_day", table_name="revenue_daily_product"
+    )
+    op.drop_table("revenue_daily_product")
+    op.drop_table("report_deltas")
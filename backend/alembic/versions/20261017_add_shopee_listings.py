@@ -0,0 +1,38 @@
+"""Add shopee_listings sync state
+
+Revision ID: shopee_listings
+Revises: outbox
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "shopee_listings"
+down_revision: Union[str, None] = "outbox"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "shopee_listings",
+        sa.Column(
+            "product_id",
+            sa.Integer(),
+            sa.ForeignKey("products.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("item_id", sa.BigInteger(), nullable=True),
+        sa.Column("synced_price", sa.Float(), nullable=True),
+        sa.Column("synced_stock", sa.Integer(), nullable=True),
+        sa.Column("synced_at", sa.DateTime(), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("shopee_listings")
@@ -0,0 +1,61 @@
+"""Audit log API router — history of CRUD writes."""
+from datetime import datetime
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.auth import get_current_user
+from core.deps import get_async_db
+from crud.audit_log import audit_log_crud
+from crud.base import NEXT_CURSOR_HEADER
+from models.schemas import AuditLogBase
+
+router = APIRouter(
+    prefix="/audit-logs",
+    tags=["audit-logs"],
+    dependencies=[Depends(get_current_user)],
+)
+
+AuditLogSort = Literal["-timestamp", "timestamp"]
+
+
+@router.get("", response_model=List[AuditLogBase])
+async def list_audit_logs(
+    response: Response,
+    entity: Optional[str] = None,
+    entity_id: Optional[int] = None,
+    action: Optional[str] = None,
+    changed_by: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    sort: AuditLogSort = "-timestamp",
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """List audit entries, newest first (``X-Next-Cursor`` pagination as for
+    products). ``details`` is a JSON object of field -> {"old", "new"}.
+
+    Filtering by ``entity`` and ``entity_id`` (one row's history) is served by
+    the (entity, entity_id, timestamp) index. Entries appear within about
+    AUDIT_FLUSH_SECONDS of the write's commit.
+    """
+    items = await audit_log_crud.get_multi(
+        db,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        order_by=sort,
+        entity=entity,
+        entity_id=entity_id,
+        action=action,
+        changed_by=changed_by,
+        timestamp__gte=start,
+        timestamp__lte=end,
+    )
+    next_cursor = audit_log_crud.next_cursor(items, limit=limit, order_by=sort)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
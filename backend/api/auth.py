@@ -5,13 +5,14 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.deps import get_db
+from core.deps import get_async_db
 from core.config import settings
-from models.database import User
 from models.schemas import Token, UserBase, UserLogin
-from services.crud import authenticate_user
+from services.audit import audit_actor
+from services.crud import authenticate_user_async, get_user_by_email_async
+from services.user_cache import cache_user, get_cached_user, user_cache
 
 security = HTTPBearer()
 
@@ -32,10 +33,11 @@ def create_access_token(
     )
 
 
-def get_current_user(
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
-) -> User:
+    db: AsyncSession = Depends(get_async_db),
+) -> UserBase:
+    """Resolve the Bearer token to its user, from the user cache when possible."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -50,21 +52,32 @@ def get_current_user(
         email: Optional[str] = payload.get("sub")
         if email is None:
             raise credentials_exception
-        user = db.query(User).filter(User.email == email).first()
-        if user is None:
-            raise credentials_exception
-        return user
     except JWTError:
         raise credentials_exception
+    cached = await get_cached_user(email)
+    if cached is not None:
+        audit_actor.set(cached.email)
+        return cached
+    user = await get_user_by_email_async(db, email)
+    if user is None:
+        raise credentials_exception
+    current_user = UserBase.model_validate(user, from_attributes=True)
+    await cache_user(current_user)
+    # Writes later in this request are attributed to the user in audit_logs
+    audit_actor.set(current_user.email)
+    return current_user
 
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
 
 @router.post("/login", response_model=Token)
-async def login(user_data: UserLogin, db: Session = Depends(get_db)):
+async def login(
+    user_data: UserLogin,
+    db: AsyncSession = Depends(get_async_db),
+):
     """Login and get JWT. Use token in Authorize for protected routes."""
-    user = authenticate_user(db, user_data.email, user_data.password)
+    user = await authenticate_user_async(db, user_data.email, user_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -82,6 +95,12 @@ async def login(user_data: UserLogin, db: Session = Depends(get_db)):
 
 
 @router.get("/me", response_model=UserBase)
-async def read_users_me(current_user: User = Depends(get_current_user)):
+async def read_users_me(current_user: UserBase = Depends(get_current_user)):
     """Current user (requires Bearer token)."""
     return current_user
+
+
+@router.get("/cache-stats")
+async def user_cache_stats(current_user: UserBase = Depends(get_current_user)):
+    """Hit/miss counters of this worker's resolved-user cache."""
+    return user_cache.stats()
@@ -0,0 +1,25 @@
+"""Bill-of-materials API router — material cost and buildability per product."""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.deps import get_async_db
+from models.schemas import BomProductRow, BomReport
+from services.bom import bom_engine
+
+router = APIRouter(prefix="/bom", tags=["bom"])
+
+
+@router.get("/", response_model=BomReport)
+async def bom_report(db: AsyncSession = Depends(get_async_db)):
+    """Material cost and buildable units for every product with a BOM, and
+    the materials below their min_stock_level."""
+    return await bom_engine.report(db)
+
+
+@router.get("/products/{product_id}", response_model=BomProductRow)
+async def product_bom(product_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Material cost and buildable units for one product."""
+    row = await bom_engine.product(db, product_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Product has no bill of materials")
+    return row
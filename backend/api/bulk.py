@@ -0,0 +1,94 @@
+"""Shared handler behind the POST /<module>/bulk endpoints."""
+import json
+from typing import Any, Dict, List, Type
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from crud.base import AsyncBaseCRUD
+from models.schemas import BulkRowError, BulkWriteRequest, BulkWriteResult
+
+
+def _validation_detail(exc: ValidationError) -> Any:
+    return json.loads(exc.json(include_url=False))
+
+
+async def bulk_write(
+    db: AsyncSession,
+    crud: AsyncBaseCRUD,
+    payload: BulkWriteRequest,
+    *,
+    create_schema: Type[BaseModel],
+    update_schema: Type[BaseModel],
+) -> BulkWriteResult:
+    """Validate every row, then apply all valid ones in a single transaction.
+
+    Invalid rows, and updates/deletes whose id does not exist, are returned in
+    ``errors`` by position. A database constraint error rolls everything back
+    and returns 409.
+    """
+    total = len(payload.create) + len(payload.update) + len(payload.delete)
+    if total > settings.bulk_max_rows:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.bulk_max_rows} rows per bulk request",
+        )
+    errors: List[BulkRowError] = []
+
+    def reject(op: str, index: int, detail: Any) -> None:
+        errors.append(BulkRowError(op=op, index=index, detail=detail))
+
+    creates = []
+    for index, row in enumerate(payload.create):
+        try:
+            creates.append(create_schema.model_validate(row))
+        except ValidationError as exc:
+            reject("create", index, _validation_detail(exc))
+
+    updates: List[Dict[str, Any]] = []
+    update_index: Dict[int, int] = {}
+    for index, row in enumerate(payload.update):
+        row_id = row.get("id")
+        if not isinstance(row_id, int) or isinstance(row_id, bool):
+            reject("update", index, "id must be an integer")
+            continue
+        if row_id in update_index:
+            reject("update", index, "Duplicate id")
+            continue
+        try:
+            patch = update_schema.model_validate(row).model_dump(exclude_unset=True)
+        except ValidationError as exc:
+            reject("update", index, _validation_detail(exc))
+            continue
+        if not patch:
+            reject("update", index, "No fields to update")
+            continue
+        updates.append({"id": row_id, **patch})
+        update_index[row_id] = index
+
+    delete_ids = list(dict.fromkeys(payload.delete))
+    try:
+        created = await crud.create_many(db, schemas=creates, commit=False)
+        updated = await crud.update_many(db, rows=updates, commit=False)
+        deleted = await crud.delete_many(db, ids=delete_ids, commit=False)
+        await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        # The driver error (not the DBAPI adapter wrapper) has the readable message
+        reason = exc.orig.__cause__ or exc.orig
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(reason))
+    await crud.invalidate_cache(*created, *updated, *deleted)
+
+    for row_id in set(update_index) - set(updated):
+        reject("update", update_index[row_id], "Not found")
+    missing = set(delete_ids) - set(deleted)
+    for index, row_id in enumerate(payload.delete):
+        if row_id in missing:
+            reject("delete", index, "Not found")
+    errors.sort(key=lambda e: (e.op, e.index))
+    return BulkWriteResult(
+        created=created, updated=updated, deleted=deleted, errors=errors
+    )
@@ -0,0 +1,192 @@
+"""
+Read-through response caching for the catalog routers.
+
+A cached entry is the rendered JSON body plus its ETag and any extra headers
+(e.g. X-Next-Cursor), so a hit costs one cache lookup and no DB query or
+Pydantic work. Clients that send a matching If-None-Match get an empty 304.
+Concurrent misses for one key within a worker share a single render, so a
+burst of requests for a hot product right after an invalidation runs one
+query. List routes can opt into stale-while-revalidate.
+
+A miss renders through a serializer compiled once per response schema: it
+reads the schema's fields straight off the ORM objects and orjson encodes the
+result, skipping Pydantic validation of rows the database already typed
+(benchmarks/serialization.py measures the difference).
+"""
+import hashlib
+import json
+import time
+import typing
+from collections import Counter
+from functools import partial
+from operator import attrgetter
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type
+
+import orjson
+from fastapi import Request, Response
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.background import BackgroundTask
+
+from core.cache import Cache
+from core.deps import read_session
+from core.replicas import reads_own_writes
+from core.singleflight import SingleFlight
+
+# render(db) returns the JSON body and the headers to send (and cache) with it
+Renderer = Callable[[AsyncSession], Awaitable[Tuple[bytes, Dict[str, str]]]]
+
+# Renders of cache misses, keyed by (cache namespace, cache key)
+flights = SingleFlight()
+# Stale entries served while refreshing, by cache namespace
+stale_served: Counter = Counter()
+
+
+# Turns one ORM object into the JSON-ready dict of a response schema
+Serializer = Callable[[Any], Dict[str, Any]]
+
+
+def _nested_model(annotation: Any) -> Optional[Type[BaseModel]]:
+    """The model in ``annotation`` / ``Optional[annotation]``, if it is one."""
+    if typing.get_origin(annotation) is typing.Union:
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        annotation = args[0] if len(args) == 1 else None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    return None
+
+
+def compile_serializer(model: Type[BaseModel]) -> Serializer:
+    """Serializer for ``model`` that reads its fields off an ORM object.
+
+    Plain fields are copied as loaded (SQLAlchemy already returns the
+    column types); fields holding another schema (e.g. ``inventory``) are
+    serialized the same way and may be None.
+    """
+    keys, names, nested = [], [], {}
+    for name, field in model.model_fields.items():
+        key = field.serialization_alias or field.alias or name
+        submodel = _nested_model(field.annotation)
+        if submodel is not None:
+            nested[key] = (attrgetter(name), compile_serializer(submodel))
+        else:
+            keys.append(key)
+            names.append(name)
+    # attrgetter with several names returns a tuple (one name: the bare value)
+    get_values = attrgetter(*names) if len(names) > 1 else (lambda obj: (getattr(obj, names[0]),))
+
+    def serialize(obj: Any) -> Dict[str, Any]:
+        data = dict(zip(keys, get_values(obj)))
+        for key, (get, sub) in nested.items():
+            value = get(obj)
+            data[key] = None if value is None else sub(value)
+        return data
+
+    return serialize
+
+
+def render_json(serialize: Serializer, value: Any) -> bytes:
+    """Render one ORM object, or a list of them, as JSON."""
+    if isinstance(value, (list, tuple)):
+        return orjson.dumps([serialize(item) for item in value])
+    return orjson.dumps(serialize(value))
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def _pack(body: bytes, headers: Dict[str, str], fresh_until: Optional[float] = None) -> bytes:
+    meta = {"etag": _etag(body), "headers": headers, "fresh_until": fresh_until}
+    return json.dumps(meta).encode() + b"\n" + body
+
+
+def _unpack(entry: bytes) -> Tuple[str, Dict[str, str], bytes, Optional[float]]:
+    meta, body = entry.split(b"\n", 1)
+    data = json.loads(meta)
+    return data["etag"], data["headers"], body, data.get("fresh_until")
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+async def list_cache_key(request: Request, cache: Optional[Cache]) -> str:
+    """Key for a list endpoint: current generation plus the query parameters."""
+    generation = await cache.generation() if cache is not None else ""
+    params = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    return f"list:{generation}:{params}"
+
+
+async def _render_entry(
+    cache: Optional[Cache],
+    key: str,
+    render: Renderer,
+    stale_seconds: float,
+    db: AsyncSession,
+) -> bytes:
+    body, headers = await render(db)
+    if cache is None:
+        return _pack(body, headers)
+    # Wall clock, since a Redis entry is read by every worker
+    fresh_until = time.time() + cache.ttl if stale_seconds else None
+    entry = _pack(body, headers, fresh_until)
+    # Right after a write a replica may render the old rows; storing them would
+    # serve them for the whole TTL, so such a render only answers this request
+    if "replica" in db.info and await cache.recently_written():
+        return entry
+    await cache.set(key, entry, ttl=cache.ttl + stale_seconds)
+    return entry
+
+
+async def _refresh(cache: Cache, key: str, render: Renderer, stale_seconds: float) -> None:
+    """Re-render a stale entry after the response, in a session of its own:
+    the request's may be closed by then."""
+    async with read_session() as db:
+        await flights.do(
+            cache.namespace, key, partial(_render_entry, cache, key, render, stale_seconds, db)
+        )
+
+
+async def cached_json(
+    request: Request,
+    db: AsyncSession,
+    cache: Optional[Cache],
+    key: str,
+    render: Renderer,
+    *,
+    stale_seconds: float = 0,
+) -> Response:
+    """Serve ``key`` from ``cache``, rendering and storing it on a miss.
+
+    ``render`` runs on ``db`` (the route's read session). Concurrent misses for
+    the same key share one render (core/singleflight.py). With
+    ``stale_seconds``, an entry past the cache TTL is still served for that
+    long while one refresh runs after the response has been sent.
+    """
+    namespace = cache.namespace if cache is not None else ""
+    render_entry = partial(_render_entry, cache, key, render, stale_seconds, db)
+    # A client that just wrote reads from the primary (core/replicas.py) and
+    # must not get an entry rendered from a lagging replica (or before its
+    # write); its render replaces that entry
+    fresh = reads_own_writes(request)
+    entry = await cache.get(key) if cache is not None and not fresh else None
+    if entry is None:
+        entry = await (render_entry() if fresh else flights.do(namespace, key, render_entry))
+    etag, headers, body, fresh_until = _unpack(entry)
+    background = None
+    if fresh_until is not None and fresh_until < time.time():
+        stale_served[namespace] += 1
+        # Only a fresh entry from a client that just wrote skips this branch,
+        # so the refresh may read from a replica
+        background = BackgroundTask(_refresh, cache, key, render, stale_seconds)
+    headers = {**headers, "ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers, background=background)
+    return Response(
+        content=body, media_type="application/json", headers=headers, background=background
+    )
@@ -0,0 +1,96 @@
+"""Change feed API router — outbox events after a given sequence number."""
+import asyncio
+import json
+from typing import AsyncIterator, List, Optional
+
+from fastapi import APIRouter, Depends, Header, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.auth import get_current_user
+from core.config import settings
+from core.deps import get_async_db
+from models.database import AsyncSessionLocal, OutboxEvent
+from models.schemas import ChangeEvent, ChangeFeedPage
+from services.outbox import read_changes, wait_for_changes
+
+router = APIRouter(
+    prefix="/changes",
+    tags=["changes"],
+    dependencies=[Depends(get_current_user)],
+)
+
+MAX_WAIT_SECONDS = 30
+# SSE comment sent while idle, so proxies keep the stream open
+HEARTBEAT_SECONDS = 15
+
+
+def _change(event: OutboxEvent) -> ChangeEvent:
+    return ChangeEvent(
+        seq=event.seq,
+        entity=event.entity,
+        entity_id=event.entity_id,
+        action=event.action,
+        payload=json.loads(event.payload) if event.payload else None,
+        created_at=event.created_at,
+    )
+
+
+@router.get("", response_model=ChangeFeedPage)
+async def list_changes(
+    after: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    entity: List[str] = Query([]),
+    wait: float = Query(0, ge=0, le=MAX_WAIT_SECONDS),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Changes with ``seq > after``, oldest first (long-poll).
+
+    With ``wait`` > 0 the request blocks up to that many seconds until there
+    is something new. Pass the returned ``last_seq`` as the next ``after``.
+    ``entity`` (repeatable: products, materials, inventory) filters.
+    """
+    events = await wait_for_changes(db, after, wait=wait, limit=limit, entities=entity)
+    return ChangeFeedPage(
+        changes=[_change(e) for e in events],
+        last_seq=events[-1].seq if events else after,
+    )
+
+
+@router.get("/stream")
+async def stream_changes(
+    request: Request,
+    after: int = 0,
+    entity: List[str] = Query([]),
+    last_event_id: Optional[int] = Header(None),
+):
+    """Server-sent events: one ``change`` event per outbox event, ``id`` = seq.
+
+    Resumes after ``Last-Event-ID`` on reconnect, else after ``after``.
+    """
+    start = last_event_id if last_event_id is not None else after
+
+    async def events() -> AsyncIterator[str]:
+        position, idle = start, 0.0
+        while not await request.is_disconnected():
+            # A short session per poll: no connection is held while idle
+            async with AsyncSessionLocal() as db:
+                batch = await read_changes(db, position, limit=500, entities=entity)
+            for event in batch:
+                data = _change(event).model_dump_json()
+                yield f"id: {event.seq}\nevent: change\ndata: {data}\n\n"
+                position = event.seq
+            if batch:
+                idle = 0.0
+                continue
+            if idle >= HEARTBEAT_SECONDS:
+                yield ": keep-alive\n\n"
+                idle = 0.0
+            await asyncio.sleep(settings.outbox_poll_seconds)
+            idle += settings.outbox_poll_seconds
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
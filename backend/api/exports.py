@@ -0,0 +1,89 @@
+"""Export API router — streams whole tables as CSV or NDJSON."""
+from typing import Literal
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select
+
+from api.auth import get_current_user
+from models.database import (
+    Inventory,
+    Material,
+    Order,
+    OrderDetail,
+    Payment,
+    Product,
+)
+from services.export import EXPORT_FORMATS, stream_export
+
+router = APIRouter(
+    prefix="/exports",
+    tags=["exports"],
+    dependencies=[Depends(get_current_user)],
+)
+
+ExportFormat = Literal["csv", "ndjson"]
+
+
+def _export_response(stmt: Select, name: str, fmt: str) -> StreamingResponse:
+    return StreamingResponse(
+        stream_export(stmt, fmt),
+        media_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
+
+
+@router.get("/products")
+async def export_products(format: ExportFormat = "csv"):
+    """All products with their inventory (stock, status)."""
+    stmt = (
+        select(
+            Product.id,
+            Product.name,
+            Product.description,
+            Product.category,
+            Product.price,
+            Product.cost,
+            Product.image,
+            Product.shopee_link,
+            Inventory.stock,
+            Inventory.status.label("inventory_status"),
+        )
+        .outerjoin(Inventory, Inventory.product_id == Product.id)
+        .order_by(Product.id)
+    )
+    return _export_response(stmt, "products", format)
+
+
+@router.get("/materials")
+async def export_materials(format: ExportFormat = "csv"):
+    """All materials."""
+    stmt = select(*Material.__table__.c).order_by(Material.id)
+    return _export_response(stmt, "materials", format)
+
+
+@router.get("/orders")
+async def export_orders(format: ExportFormat = "csv"):
+    """One row per order line: order columns plus the line's product, qty, price."""
+    stmt = (
+        select(
+            Order.id.label("order_id"),
+            Order.date,
+            Order.distributor_detail_id,
+            Order.total_price,
+            OrderDetail.id.label("order_detail_id"),
+            OrderDetail.product_id,
+            OrderDetail.quantity,
+            OrderDetail.price,
+        )
+        .outerjoin(OrderDetail, OrderDetail.order_id == Order.id)
+        .order_by(Order.id, OrderDetail.id)
+    )
+    return _export_response(stmt, "orders", format)
+
+
+@router.get("/payments")
+async def export_payments(format: ExportFormat = "csv"):
+    """All payments."""
+    stmt = select(*Payment.__table__.c).order_by(Payment.id)
+    return _export_response(stmt, "payments", format)
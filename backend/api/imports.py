@@ -0,0 +1,34 @@
+"""Shared handler behind the POST /<module>/import endpoints."""
+from typing import Literal, Optional
+
+from fastapi import HTTPException, UploadFile, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from crud.base import AsyncBaseCRUD
+from models.schemas import ImportResult
+from services.importer import (
+    ImportSpec,
+    import_rows,
+    iter_upload_rows,
+    upload_format,
+)
+
+ImportFormat = Literal["csv", "ndjson"]
+
+
+async def import_upload(
+    db: AsyncSession,
+    crud: AsyncBaseCRUD,
+    spec: ImportSpec,
+    file: UploadFile,
+    fmt: Optional[str],
+) -> ImportResult:
+    """Run an uploaded file through the COPY import pipeline and drop stale cache."""
+    rows = iter_upload_rows(file.file, upload_format(file.filename or "", fmt))
+    try:
+        result = await import_rows(db, spec, rows)
+    except (ValueError, UnicodeDecodeError) as exc:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    await crud.invalidate_cache(*result.inserted_ids, *result.updated_ids)
+    return result
@@ -1,54 +1,113 @@
 """Materials API router — uses BaseCRUD pattern (scalable retail module)."""
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Request, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.deps import get_db
+from api.bulk import bulk_write
+from api.caching import cached_json, compile_serializer, list_cache_key, render_json
+from api.imports import ImportFormat, import_upload
+from core.config import settings
+from core.deps import get_async_db, get_read_db
+from crud.base import NEXT_CURSOR_HEADER
 from crud.material import material_crud
-from models.schemas import MaterialBase, MaterialCreate, MaterialUpdate
+from models.schemas import (
+    BulkWriteRequest,
+    BulkWriteResult,
+    ImportResult,
+    MaterialBase,
+    MaterialCreate,
+    MaterialUpdate,
+)
+from services.importer import MATERIAL_IMPORT
 
 router = APIRouter(prefix="/materials", tags=["materials"])
 
+_serialize = compile_serializer(MaterialBase)
+
 
 @router.get("/", response_model=List[MaterialBase])
 async def list_materials(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """List materials with pagination."""
-    return material_crud.get_multi(db, skip=skip, limit=limit)
+    """List materials with pagination (``skip`` or ``cursor``, see list_products)."""
+    async def render(db: AsyncSession):
+        items = await material_crud.get_multi(
+            db, skip=skip, limit=limit, cursor=cursor
+        )
+        next_cursor = material_crud.next_cursor(items, limit=limit)
+        headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+        return render_json(_serialize, items), headers
+
+    cache = material_crud.__cache__
+    key = await list_cache_key(request, cache)
+    return await cached_json(
+        request, db, cache, key, render, stale_seconds=settings.response_cache_stale_seconds
+    )
 
 
 @router.get("/{material_id}", response_model=MaterialBase)
 async def get_material(
+    request: Request,
     material_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Get a single material by ID."""
-    return material_crud.get_or_404(
-        db, material_id, detail="Material not found"
-    )
+    """Get a single material by ID (cached, with ETag)."""
+    async def render(db: AsyncSession):
+        material = await material_crud.get_or_404(
+            db, material_id, detail="Material not found"
+        )
+        return render_json(_serialize, material), {}
+
+    key = material_crud.item_cache_key(material_id)
+    return await cached_json(request, db, material_crud.__cache__, key, render)
 
 
 @router.post("/", response_model=MaterialBase)
 async def create_material(
     material: MaterialCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Create a new material."""
-    return material_crud.create(db, schema=material)
+    return await material_crud.create(db, schema=material)
+
+
+@router.post("/bulk", response_model=BulkWriteResult)
+async def bulk_materials(
+    payload: BulkWriteRequest,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Create, update and delete many materials in one transaction.
+
+    Invalid rows are skipped and reported in ``errors`` by position.
+    """
+    return await bulk_write(
+        db, material_crud, payload, create_schema=MaterialCreate, update_schema=MaterialUpdate
+    )
+
+
+@router.post("/import", response_model=ImportResult)
+async def import_materials(
+    file: UploadFile,
+    format: Optional[ImportFormat] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Import materials from a CSV or NDJSON file (see import_products)."""
+    return await import_upload(db, material_crud, MATERIAL_IMPORT, file, format)
 
 
 @router.put("/{material_id}", response_model=MaterialBase)
 async def update_material(
     material_id: int,
     material: MaterialUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Update a material by ID."""
-    return material_crud.update(
+    return await material_crud.update(
         db, material_id, schema=material, detail="Material not found"
     )
 
@@ -56,8 +115,8 @@ async def update_material(
 @router.delete("/{material_id}")
 async def delete_material(
     material_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Delete a material by ID."""
-    material_crud.delete(db, material_id, detail="Material not found")
+    await material_crud.delete(db, material_id, detail="Material not found")
     return {"message": "Material deleted successfully"}
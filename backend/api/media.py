@@ -0,0 +1,17 @@
+"""Serving of stored product image variants (services/images.py)."""
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+# Paths are content-addressed, so a file never changes once written
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+class ImmutableFiles(StaticFiles):
+    """StaticFiles with a year-long immutable Cache-Control."""
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = await super().get_response(path, scope)
+        if response.status_code in (200, 304):
+            response.headers["Cache-Control"] = IMMUTABLE
+        return response
@@ -0,0 +1,115 @@
+"""Metrics API router — live worker-local stats.
+
+Under /api (which the proxy serves publicly) a Bearer token is required;
+Prometheus scrapes the unauthenticated ``/metrics`` on the backend port,
+outside the proxied prefix (see main.py).
+"""
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from api.auth import get_current_user
+from api.caching import flights, stale_served
+from core.cache import caches
+from core.metrics import REGISTRY
+from core.pool import pool_stats
+from models.database import async_engine, engine, replicas
+from services.audit import audit_queue
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["metrics"],
+    dependencies=[Depends(get_current_user)],
+)
+
+_ENGINES = {
+    "async": async_engine,
+    "sync": engine,
+    **{f"replica {r.name}": r.engine for r in replicas.replicas},
+}
+
+POOL_CONNECTIONS = REGISTRY.family(
+    "db_pool_connections",
+    "Pooled connections by state.",
+    "gauge",
+    ("engine", "state"),
+)
+POOL_CHECKOUT_WAIT = REGISTRY.family(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection.",
+    "histogram",
+    ("engine",),
+)
+CACHE_LOOKUPS = REGISTRY.family(
+    "cache_lookups_total",
+    "Cache lookups by namespace and result.",
+    "counter",
+    ("cache", "result"),
+)
+REPLICA_UP = REGISTRY.family(
+    "db_replica_up",
+    "1 while a read replica passes its health checks.",
+    "gauge",
+    ("replica",),
+)
+CACHE_RENDERS = REGISTRY.family(
+    "cache_miss_renders_total",
+    "Cache misses by whether the request rendered (leader) or shared a render in flight (coalesced).",
+    "counter",
+    ("cache", "result"),
+)
+CACHE_STALE = REGISTRY.family(
+    "cache_stale_served_total",
+    "Entries served past their TTL while being refreshed (stale-while-revalidate).",
+    "counter",
+    ("cache",),
+)
+AUDIT_QUEUE_DEPTH = REGISTRY.family(
+    "audit_queue_entries",
+    "Audit entries waiting to be written.",
+    "gauge",
+)
+AUDIT_ENTRIES = REGISTRY.family(
+    "audit_entries_total",
+    "Audit entries by outcome (written, dropped when the queue was full, failed).",
+    "counter",
+    ("result",),
+)
+
+
+def _collect() -> None:
+    for name, db_engine in _ENGINES.items():
+        stats = pool_stats(db_engine.pool)
+        for state in ("checked_in", "checked_out", "overflow"):
+            if state in stats:
+                POOL_CONNECTIONS.labels(name, state).set(stats[state])
+        histogram = getattr(db_engine.pool, "wait_histogram", None)
+        if histogram is not None:
+            POOL_CHECKOUT_WAIT.attach((name,), histogram)
+    for replica in replicas.replicas:
+        REPLICA_UP.labels(replica.name).set(1 if replica.healthy else 0)
+    for namespace, cache in caches.items():
+        CACHE_LOOKUPS.labels(namespace, "hit").value = cache.hits
+        CACHE_LOOKUPS.labels(namespace, "miss").value = cache.misses
+        CACHE_RENDERS.labels(namespace, "leader").value = flights.leaders[namespace]
+        CACHE_RENDERS.labels(namespace, "coalesced").value = flights.coalesced[namespace]
+        CACHE_STALE.labels(namespace).value = stale_served[namespace]
+    AUDIT_QUEUE_DEPTH.labels().set(len(audit_queue))
+    for result in ("written", "dropped", "failed"):
+        AUDIT_ENTRIES.labels(result).value = getattr(audit_queue, result)
+
+
+REGISTRY.add_collector(_collect)
+
+
+@router.get("", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """All metrics of this worker in the Prometheus text exposition format."""
+    return PlainTextResponse(
+        REGISTRY.render(), media_type="text/plain; version=0.0.4"
+    )
+
+
+@router.get("/pool")
+async def database_pool_metrics():
+    """Connection pool usage and checkout wait histogram for this worker."""
+    return {name: pool_stats(db_engine.pool) for name, db_engine in _ENGINES.items()}
@@ -0,0 +1,50 @@
+"""Orders API router — order placement with stock reservation."""
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.auth import get_current_user
+from core.deps import get_async_db
+from crud.base import NEXT_CURSOR_HEADER
+from crud.order import order_crud
+from models.schemas import OrderCreate, OrderWithDetails
+from services.orders import place_order
+
+router = APIRouter(
+    prefix="/orders",
+    tags=["orders"],
+    dependencies=[Depends(get_current_user)],
+)
+
+
+@router.get("/", response_model=List[OrderWithDetails])
+async def list_orders(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """List orders with their lines (``X-Next-Cursor`` pagination as for products)."""
+    items = await order_crud.get_multi(db, skip=skip, limit=limit, cursor=cursor)
+    next_cursor = order_crud.next_cursor(items, limit=limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
+
+
+@router.get("/{order_id}", response_model=OrderWithDetails)
+async def get_order(order_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Get one order with its lines."""
+    return await order_crud.get_or_404(db, order_id, detail="Order not found")
+
+
+@router.post("/", response_model=OrderWithDetails)
+async def create_order(payload: OrderCreate, db: AsyncSession = Depends(get_async_db)):
+    """Place an order: records it and takes its quantities out of inventory.
+
+    All or nothing: if any product is short of stock the request fails with
+    409 and nothing is written. Line prices are the products' current prices.
+    """
+    return await place_order(db, payload)
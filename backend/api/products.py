@@ -1,56 +1,153 @@
 """Products API router — uses BaseCRUD pattern."""
-from typing import List
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.deps import get_db
+from api.bulk import bulk_write
+from api.caching import cached_json, compile_serializer, list_cache_key, render_json
+from api.imports import ImportFormat, import_upload
+from core.config import settings
+from core.deps import get_async_db, get_read_db
+from core.jobs import enqueue
+from crud.base import NEXT_CURSOR_HEADER
 from crud.product import product_crud
+from models.database import Product
 from models.schemas import (
+    BulkWriteRequest,
+    BulkWriteResult,
+    ImportResult,
     ProductCreate,
+    ProductImageUpdate,
     ProductUpdate,
     ProductWithInventory,
 )
+from services.image_urls import default_url
+from services.images import store_image
+from services.importer import PRODUCT_IMPORT
 
 router = APIRouter(prefix="/products", tags=["products"])
 
+ProductSort = Literal["id", "-id", "name", "-name", "price", "-price", "stock", "-stock"]
+
+_serialize = compile_serializer(ProductWithInventory)
+
 
 @router.get("/", response_model=List[ProductWithInventory])
 async def list_products(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    category: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    q: Optional[str] = None,
+    sort: ProductSort = "id",
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """List products with pagination. Testable in Swagger."""
-    return product_crud.get_multi(db, skip=skip, limit=limit)
+    """List products with pagination, filters and sorting. Testable in Swagger.
+
+    ``q`` matches a substring of name or description (case-insensitive);
+    ``sort`` is a column name, ``-`` prefixed for descending.
+    Pass the ``X-Next-Cursor`` response header back as ``cursor`` (with the
+    same filters and sort) to fetch the next page by keyset instead of ``skip``;
+    the header is absent on the last page.
+    Responses are cached and carry an ETag (send If-None-Match for a 304).
+    """
+    async def render(db: AsyncSession):
+        items = await product_crud.get_multi(
+            db,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            order_by=sort,
+            search=q,
+            category=category,
+            price__gte=min_price,
+            price__lte=max_price,
+        )
+        next_cursor = product_crud.next_cursor(items, limit=limit, order_by=sort)
+        headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+        return render_json(_serialize, items), headers
+
+    cache = product_crud.__cache__
+    key = await list_cache_key(request, cache)
+    return await cached_json(
+        request, db, cache, key, render, stale_seconds=settings.response_cache_stale_seconds
+    )
 
 
 @router.get("/{product_id}", response_model=ProductWithInventory)
 async def get_product(
+    request: Request,
     product_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Get a single product by ID."""
-    return product_crud.get_or_404(db, product_id, detail="Product not found")
+    """Get a single product by ID (cached, with ETag)."""
+    async def render(db: AsyncSession):
+        product = await product_crud.get_or_404(
+            db, product_id, detail="Product not found"
+        )
+        return render_json(_serialize, product), {}
+
+    key = product_crud.item_cache_key(product_id)
+    return await cached_json(request, db, product_crud.__cache__, key, render)
 
 
 @router.post("/", response_model=ProductWithInventory)
 async def create_product(
     product: ProductCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Create a new product."""
-    return product_crud.create(db, schema=product)
+    return await product_crud.create(db, schema=product)
+
+
+@router.post("/bulk", response_model=BulkWriteResult)
+async def bulk_products(
+    payload: BulkWriteRequest,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Create, update and delete many products in one transaction.
+
+    Invalid rows are skipped and reported in ``errors`` by position.
+    """
+    return await bulk_write(
+        db, product_crud, payload, create_schema=ProductCreate, update_schema=ProductUpdate
+    )
+
+
+@router.post("/import", response_model=ImportResult)
+async def import_products(
+    file: UploadFile,
+    format: Optional[ImportFormat] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Import products from a CSV or NDJSON file (ProductCreate columns).
+
+    Rows with an ``id`` update that product, rows without one are inserted;
+    optional ``stock`` / ``inventory_status`` columns upsert inventory. Rows
+    are loaded with COPY and merged in one transaction; invalid rows are
+    skipped and reported by row number.
+    """
+    result = await import_upload(db, product_crud, PRODUCT_IMPORT, file, format)
+    # Imported stock may come without (or with a stale) inventory_status
+    ids = result.inserted_ids + result.updated_ids
+    if ids:
+        await enqueue("services.tasks.recompute_stock_statuses", product_ids=ids)
+    return result
 
 
 @router.put("/{product_id}", response_model=ProductWithInventory)
 async def update_product(
     product_id: int,
     product: ProductUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Update a product by ID."""
-    return product_crud.update(
+    return await product_crud.update(
         db, product_id, schema=product, detail="Product not found"
     )
 
@@ -58,8 +155,46 @@ async def update_product(
 @router.delete("/{product_id}")
 async def delete_product(
     product_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Delete a product by ID."""
-    product_crud.delete(db, product_id, detail="Product not found")
+    await product_crud.delete(db, product_id, detail="Product not found")
     return {"message": "Product deleted successfully"}
+
+
+@router.post("/{product_id}/image", response_model=ProductWithInventory)
+async def upload_product_image(
+    product_id: int,
+    file: UploadFile,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Upload a product image (JPEG, PNG, WebP, AVIF or GIF).
+
+    Resized AVIF / WebP copies are listed in ``image_variants``, and ``image``
+    points at the IMAGE_DEFAULT_WIDTH WebP copy. Uploading the same file
+    again reuses the stored copies.
+    """
+    data = await file.read(settings.image_max_bytes + 1)
+    if len(data) > settings.image_max_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Image is larger than {settings.image_max_bytes} bytes",
+        )
+    # Before the encode, so an unknown id costs no CPU and leaves no files;
+    # the rollback frees the connection while the pool works
+    exists = await db.scalar(select(Product.id).where(Product.id == product_id))
+    await db.rollback()
+    if exists is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
+    try:
+        stored = await store_image(data)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    update = ProductImageUpdate(
+        image=default_url(stored.key, stored.widths),
+        image_key=stored.key,
+        image_widths=stored.widths,
+    )
+    return await product_crud.update(
+        db, product_id, schema=update, detail="Product not found"
+    )
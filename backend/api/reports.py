@@ -0,0 +1,72 @@
+"""Reports API router — daily revenue from the summary tables.
+
+Reports read on the primary: the fold just before the read is a write, and a
+replica may not have received it yet.
+"""
+from datetime import date
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.auth import get_current_user
+from core.deps import get_async_db
+from models.database import DailyChannelRevenue, DailyPaymentStatus, DailyProductRevenue
+from models.schemas import (
+    DailyChannelRevenueRow,
+    DailyPaymentStatusRow,
+    DailyProductRevenueRow,
+)
+from services.reports import daily_report, fold_deltas
+
+
+async def fold_pending_deltas(db: AsyncSession = Depends(get_async_db)) -> None:
+    """Fold one batch of pending deltas (the rest are left to the periodic
+    fold), in the route's own session."""
+    await fold_deltas(db)
+
+
+router = APIRouter(
+    prefix="/reports",
+    tags=["reports"],
+    dependencies=[Depends(get_current_user), Depends(fold_pending_deltas)],
+)
+
+
+@router.get("/revenue/products", response_model=List[DailyProductRevenueRow])
+async def daily_product_revenue(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    product_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Units sold and revenue per product per day (default: last 30 days)."""
+    return await daily_report(
+        db, DailyProductRevenue, start=start, end=end, product_id=product_id
+    )
+
+
+@router.get("/revenue/channels", response_model=List[DailyChannelRevenueRow])
+async def daily_channel_revenue(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    channel: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Orders and revenue per distributor channel per day."""
+    return await daily_report(
+        db, DailyChannelRevenue, start=start, end=end, channel=channel
+    )
+
+
+@router.get("/payments/status", response_model=List[DailyPaymentStatusRow])
+async def daily_payment_status(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    status: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Payment count and amount per payment status per day."""
+    return await daily_report(
+        db, DailyPaymentStatus, start=start, end=end, status=status
+    )
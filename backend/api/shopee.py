@@ -0,0 +1,54 @@
+"""Shopee listing sync API router — trigger a sync, inspect its state."""
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.auth import get_current_user
+from core.config import settings
+from core.deps import get_async_db
+from core.jobs import enqueue
+from models.database import ShopeeListing
+from models.schemas import ShopeeListingBase
+
+router = APIRouter(
+    prefix="/shopee",
+    tags=["shopee"],
+    dependencies=[Depends(get_current_user)],
+)
+
+
+@router.post("/sync", status_code=status.HTTP_202_ACCEPTED)
+async def sync_listings():
+    """Queue a push of changed prices / stock to Shopee (it also runs every
+    SHOPEE_SYNC_SECONDS on the worker). 503 without a worker: the sync makes
+    rate-limited calls for minutes and must not run in the API process."""
+    if settings.celery_always_eager:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="No background worker configured (CELERY_BROKER_URL)",
+        )
+    await enqueue("services.tasks.sync_shopee_listings")
+    return {"queued": True}
+
+
+@router.get("/listings", response_model=List[ShopeeListingBase])
+async def list_listings(
+    failed: bool = False,
+    after: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Last pushed state per product, by product id (pass the last
+    ``product_id`` as ``after`` for the next page). ``failed=true`` lists
+    only listings whose last push failed."""
+    stmt = (
+        select(ShopeeListing)
+        .where(ShopeeListing.product_id > after)
+        .order_by(ShopeeListing.product_id)
+        .limit(limit)
+    )
+    if failed:
+        stmt = stmt.where(ShopeeListing.last_error.is_not(None))
+    return (await db.scalars(stmt)).all()
@@ -0,0 +1 @@
+# Benchmarks: standalone scripts run against a live API (python -m benchmarks.<name>)
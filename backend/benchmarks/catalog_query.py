@@ -0,0 +1,130 @@
+"""
+Catalog query latency: filters, sorting and search on a large synthetic catalog.
+
+Generates ``--rows`` products (with inventory) server-side in the configured
+database, runs each product list query through ProductCRUD.get_multi, and
+prints the median latency and the indexes the plan used. Synthetic rows are
+deleted afterwards unless ``--keep`` is given.
+
+    python -m benchmarks.catalog_query --rows 1000000 --repeat 20
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from sqlalchemy import text
+
+from crud.product import product_crud
+from models.database import AsyncSessionLocal
+
+PREFIX = "bench-catalog-"
+
+# Vietnamese / Japanese / ASCII words so search exercises multi-byte trigrams
+GENERATE = """
+WITH words(w) AS (
+    SELECT unnest(ARRAY['Cáo', 'mùa hè', 'mùa thu', 'Sticker', 'つばめ', '狐',
+                        'Tote', 'Keychain', 'hoa anh đào', '桜', 'Postcard'])
+), new_products AS (
+    INSERT INTO products (name, description, category, price, cost, image)
+    SELECT
+        :prefix || i || ' ' || (SELECT w FROM words OFFSET i % 11 LIMIT 1),
+        'Synthetic ' || (SELECT w FROM words OFFSET (i / 11) % 11 LIMIT 1),
+        (ARRAY['Sticker', 'Bag', 'Keychain', 'Postcard', 'Print'])[1 + i % 5],
+        1000 + (i::bigint * 7919) % 500000,
+        1000,
+        'https://placehold.co/300x300'
+    FROM generate_series(1, :rows) AS i
+    RETURNING id
+)
+INSERT INTO inventory (product_id, stock, status)
+SELECT id, id % 50, CASE WHEN id % 50 > 0 THEN 'In Stock' ELSE 'Sold Out' END
+FROM new_products
+"""
+
+QUERIES = {
+    "first page": dict(),
+    "category": dict(category="Bag"),
+    "price range by price": dict(price__gte=100000, price__lte=120000, order_by="price"),
+    "sort by -price": dict(order_by="-price"),
+    "sort by name": dict(order_by="name"),
+    "sort by stock": dict(order_by="-stock"),
+    "search (vi)": dict(search="hoa anh"),
+    "search (ja)": dict(search="つばめ"),
+    "search + category": dict(search="mùa thu", category="Print"),
+}
+
+
+def _indexes(plan) -> set:
+    found = set()
+    if isinstance(plan, dict):
+        if "Index Name" in plan:
+            found.add(plan["Index Name"])
+        for value in plan.values():
+            found |= _indexes(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            found |= _indexes(value)
+    return found
+
+
+async def generate(rows: int) -> None:
+    async with AsyncSessionLocal() as db:
+        start = time.perf_counter()
+        await db.execute(text(GENERATE), {"prefix": PREFIX, "rows": rows})
+        await db.commit()
+        print(f"generated {rows} products in {time.perf_counter() - start:.1f}s")
+        await db.execute(text("ANALYZE products"))
+        await db.execute(text("ANALYZE inventory"))
+        await db.commit()
+
+
+async def bench(repeat: int, limit: int) -> None:
+    async with AsyncSessionLocal() as db:
+        for name, params in QUERIES.items():
+            # Nullable sort columns page through two statements; plan each
+            plan = []
+            for stmt in product_crud._select_multi(limit=limit, **params):
+                compiled = stmt.compile(db.bind, compile_kwargs={"literal_binds": True})
+                part = (await db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))).scalar()
+                plan.append(json.loads(part) if isinstance(part, str) else part)
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                await product_crud.get_multi(db, limit=limit, **params)
+                timings.append((time.perf_counter() - start) * 1000)
+            indexes = ", ".join(sorted(_indexes(plan)))
+            print(f"{name:22} {statistics.median(timings):8.2f} ms  [{indexes or 'seq scan'}]")
+
+
+async def cleanup() -> None:
+    async with AsyncSessionLocal() as db:
+        ids = "SELECT id FROM products WHERE name LIKE :pattern"
+        await db.execute(
+            text(f"DELETE FROM inventory WHERE product_id IN ({ids})"),
+            {"pattern": f"{PREFIX}%"},
+        )
+        await db.execute(
+            text("DELETE FROM products WHERE name LIKE :pattern"),
+            {"pattern": f"{PREFIX}%"},
+        )
+        await db.commit()
+
+
+async def main(args) -> None:
+    await generate(args.rows)
+    try:
+        await bench(args.repeat, args.limit)
+    finally:
+        if not args.keep:
+            await cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--keep", action="store_true", help="keep the synthetic rows")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,116 @@
+"""
+Checkout contention: many simultaneous orders for one product must not oversell.
+
+Creates a product with ``--stock`` units, fires ``--checkouts`` concurrent
+place_order calls of ``--quantity`` each (every one on its own session, so
+they race for the same inventory row), then checks that exactly
+``stock // quantity`` succeeded and the stock never went negative. Prints
+throughput and cleans up.
+
+    python -m benchmarks.checkout_contention --checkouts 500 --stock 300
+"""
+import argparse
+import asyncio
+import time
+
+from fastapi import HTTPException
+from sqlalchemy import delete, func, insert, select
+
+from models.database import (
+    AsyncSessionLocal,
+    Distributor,
+    DistributorDetail,
+    Inventory,
+    Order,
+    OrderDetail,
+    Product,
+)
+from models.schemas import OrderCreate, OrderLineCreate
+from services.orders import place_order
+
+NAME = "bench-checkout"
+
+
+async def setup(stock: int):
+    async with AsyncSessionLocal() as db:
+        distributor_id = await db.scalar(
+            insert(Distributor).values(name=NAME).returning(Distributor.id)
+        )
+        detail_id = await db.scalar(
+            insert(DistributorDetail)
+            .values(distributor_id=distributor_id, channel="ONLINE")
+            .returning(DistributorDetail.id)
+        )
+        product_id = await db.scalar(
+            insert(Product).values(name=NAME, price=35000, cost=10000).returning(Product.id)
+        )
+        await db.execute(
+            insert(Inventory).values(product_id=product_id, stock=stock, status="In Stock")
+        )
+        await db.commit()
+    return distributor_id, detail_id, product_id
+
+
+async def checkout(detail_id: int, product_id: int, quantity: int) -> int:
+    payload = OrderCreate(
+        distributor_detail_id=detail_id,
+        items=[OrderLineCreate(product_id=product_id, quantity=quantity)],
+    )
+    async with AsyncSessionLocal() as db:
+        try:
+            await place_order(db, payload)
+        except HTTPException as exc:
+            return exc.status_code
+    return 200
+
+
+async def cleanup(distributor_id: int, detail_id: int, product_id: int) -> None:
+    async with AsyncSessionLocal() as db:
+        order_ids = select(OrderDetail.order_id).where(OrderDetail.product_id == product_id)
+        order_ids = list(await db.scalars(order_ids))
+        await db.execute(delete(OrderDetail).where(OrderDetail.order_id.in_(order_ids)))
+        await db.execute(delete(Order).where(Order.id.in_(order_ids)))
+        await db.execute(delete(Inventory).where(Inventory.product_id == product_id))
+        await db.execute(delete(Product).where(Product.id == product_id))
+        await db.execute(delete(DistributorDetail).where(DistributorDetail.id == detail_id))
+        await db.execute(delete(Distributor).where(Distributor.id == distributor_id))
+        await db.commit()
+
+
+async def main(args) -> None:
+    distributor_id, detail_id, product_id = await setup(args.stock)
+    try:
+        start = time.perf_counter()
+        statuses = await asyncio.gather(
+            *(checkout(detail_id, product_id, args.quantity) for _ in range(args.checkouts))
+        )
+        elapsed = time.perf_counter() - start
+        async with AsyncSessionLocal() as db:
+            inventory = await db.scalar(
+                select(Inventory).where(Inventory.product_id == product_id)
+            )
+            lines = await db.scalar(
+                select(func.count()).where(OrderDetail.product_id == product_id)
+            )
+    finally:
+        await cleanup(distributor_id, detail_id, product_id)
+
+    succeeded = statuses.count(200)
+    expected = min(args.checkouts, args.stock // args.quantity)
+    print(f"{args.checkouts} checkouts in {elapsed:.2f}s ({args.checkouts / elapsed:.0f}/s)")
+    rejected = statuses.count(409)
+    other = len(statuses) - succeeded - rejected
+    print(f"succeeded: {succeeded} (expected {expected}), 409: {rejected}, other: {other}")
+    print(f"final stock: {inventory.stock} ({inventory.status})")
+    assert succeeded == expected, "oversold or lost orders"
+    assert inventory.stock == args.stock - succeeded * args.quantity >= 0
+    assert lines == succeeded, "order lines do not match successful checkouts"
+    print("OK: no overselling")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--checkouts", type=int, default=500)
+    parser.add_argument("--stock", type=int, default=300)
+    parser.add_argument("--quantity", type=int, default=1)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,264 @@
+"""
+Synthetic data at scale for load tests and benchmarks.
+
+Bulk-loads, server-side and in ``--chunk``-sized transactions, a catalog of
+``--products`` products with inventory and ``--orders`` orders spread over
+the last ``--days`` days. Each order has 1 to ``--max-lines`` lines priced
+from the products it picks and one payment. Orders come from
+``--distributors`` distributors with one ONLINE, one OFFLINE and one
+CONSIGNMENT branch each. All rows are tagged with a ``bench-data-`` prefix
+(product and distributor names, payment transaction ids), so
+``--clean`` removes exactly them again. Re-running adds to what is there:
+new products are numbered after the existing synthetic ones, and
+distributors are only topped up to ``--distributors``.
+
+    python -m benchmarks.datagen --products 1000000 --orders 2000000
+    python -m benchmarks.datagen --clean
+
+Rows go in with plain SQL, so they produce no audit entries or change-feed
+events; the report triggers do run, so the daily revenue tables include
+them.
+"""
+import argparse
+import time
+
+from sqlalchemy import text
+
+from core.config import settings
+from models.database import SessionLocal
+
+PREFIX = "bench-data-"
+CHANNELS = ("ONLINE", "OFFLINE", "CONSIGNMENT")
+
+# Vietnamese / Japanese / ASCII words, as in the real catalog
+_PRODUCTS = """
+WITH words(w) AS (
+    SELECT unnest(ARRAY['Cáo', 'mùa hè', 'mùa thu', 'Sticker', 'つばめ', '狐',
+                        'Tote', 'Keychain', 'hoa anh đào', '桜', 'Postcard'])
+), new_products AS (
+    INSERT INTO products (name, description, category, price, cost, image)
+    SELECT
+        :prefix || i || ' ' || (SELECT w FROM words OFFSET i % 11 LIMIT 1),
+        'Synthetic ' || (SELECT w FROM words OFFSET (i / 11) % 11 LIMIT 1),
+        (ARRAY['Sticker', 'Bag', 'Keychain', 'Postcard', 'Print'])[1 + i % 5],
+        (1000 + (i::bigint * 7919) % 500000) / 1000 * 1000,
+        1000 + (i::bigint * 7919) % 500000 / 3,
+        'https://placehold.co/300x300'
+    FROM generate_series(:start, :stop) AS i
+    RETURNING id
+)
+INSERT INTO inventory (product_id, stock, status)
+SELECT id, :stock, 'In Stock' FROM new_products
+"""
+
+_DISTRIBUTORS = """
+WITH new_distributors AS (
+    INSERT INTO distributors (name)
+    SELECT :prefix || i FROM generate_series(:start, :stop) AS i
+    RETURNING id, name
+)
+INSERT INTO distributor_details
+    (distributor_id, branch, address, contact_name, phone_number, channel, contract)
+SELECT d.id, d.name || ' ' || c, 'Synthetic address', 'Bench', '0900000000', c, 'Standard'
+FROM new_distributors d CROSS JOIN unnest(CAST(:channels AS text[])) AS c
+"""
+
+# Order and line ids are drawn first so the order total can be the sum of its
+# lines in the same statement. Products are picked uniformly from the
+# synthetic id range; a pick that lands on a gap just drops that line.
+_ORDERS = """
+WITH details AS MATERIALIZED (
+    SELECT array_agg(dd.id) AS ids
+    FROM distributor_details dd
+    JOIN distributors d ON d.id = dd.distributor_id
+    WHERE d.name LIKE :pattern
+), new_orders AS MATERIALIZED (
+    SELECT nextval('orders_id_seq') AS id,
+           now() AT TIME ZONE 'utc' - random() * make_interval(days => :days) AS date,
+           details.ids[1 + floor(random() * cardinality(details.ids))::int] AS detail_id,
+           1 + floor(random() * :max_lines)::int AS lines
+    FROM generate_series(1, :count), details
+), new_lines AS MATERIALIZED (
+    SELECT o.id AS order_id, p.id AS product_id,
+           1 + floor(random() * 5)::int AS quantity, p.price
+    FROM new_orders o
+    CROSS JOIN LATERAL (
+        SELECT :min_id + floor(random() * (:max_id - :min_id + 1))::int AS pick
+        FROM generate_series(1, o.lines)
+    ) l
+    JOIN products p ON p.id = l.pick
+), totals AS MATERIALIZED (
+    SELECT order_id, sum(quantity * price) AS total FROM new_lines GROUP BY order_id
+), inserted_orders AS (
+    INSERT INTO orders (id, date, distributor_detail_id, total_price)
+    SELECT o.id, o.date, o.detail_id, t.total
+    FROM new_orders o JOIN totals t ON t.order_id = o.id
+), inserted_lines AS (
+    INSERT INTO order_details (order_id, product_id, quantity, price)
+    SELECT order_id, product_id, quantity, price FROM new_lines
+)
+INSERT INTO payments (date, order_id, method, status, amount, transaction_id)
+SELECT o.date + interval '5 minutes', o.id,
+       (ARRAY['Bank Transfer', 'Cash', 'Credit Card', 'E-Wallet'])[1 + o.id % 4],
+       CASE WHEN o.id % 20 = 0 THEN 'Failed'
+            WHEN o.id % 7 = 0 THEN 'Pending'
+            ELSE 'Completed' END,
+       t.total, :prefix || o.id
+FROM new_orders o JOIN totals t ON t.order_id = o.id
+"""
+
+# Highest N among the bench-data-N names of a table, 0 if there are none
+_LAST_NUMBER = """
+SELECT coalesce(max(substring(name FROM '^' || :prefix || '([0-9]+)')::int), 0)
+FROM {table} WHERE name LIKE :pattern
+"""
+
+_PRODUCT_RANGE = text(
+    "SELECT min(id), max(id) FROM products WHERE name LIKE :pattern"
+)
+
+_CLEAN = [
+    """DELETE FROM payments WHERE order_id IN (SELECT id FROM bench_orders)""",
+    """DELETE FROM order_details WHERE order_id IN (SELECT id FROM bench_orders)""",
+    """DELETE FROM orders WHERE id IN (SELECT id FROM bench_orders)""",
+    # Orders placed by load tests on synthetic products, from any distributor
+    """DELETE FROM payments WHERE order_id IN (SELECT order_id FROM bench_lines)""",
+    """DELETE FROM order_details WHERE order_id IN (SELECT order_id FROM bench_lines)""",
+    """DELETE FROM orders WHERE id IN (SELECT order_id FROM bench_lines)""",
+    """DELETE FROM distributor_details WHERE distributor_id IN (
+           SELECT id FROM distributors WHERE name LIKE :pattern)""",
+    """DELETE FROM distributors WHERE name LIKE :pattern""",
+    """DELETE FROM inventory WHERE product_id IN (SELECT id FROM bench_products)""",
+    """DELETE FROM product_materials WHERE product_id IN (SELECT id FROM bench_products)""",
+    """DELETE FROM products WHERE id IN (SELECT id FROM bench_products)""",
+]
+
+
+def _chunks(total: int, size: int):
+    for start in range(1, total + 1, size):
+        yield start, min(start + size - 1, total)
+
+
+def _progress(label: str, done: int, total: int, started: float) -> None:
+    elapsed = time.perf_counter() - started
+    print(f"\r{label}: {done}/{total} ({done / elapsed:,.0f} rows/s)", end="", flush=True)
+
+
+def _last_number(db, table: str) -> int:
+    return db.execute(text(_LAST_NUMBER.format(table=table)), {
+        "prefix": PREFIX, "pattern": f"{PREFIX}%",
+    }).scalar_one()
+
+
+def generate_products(count: int, chunk: int, stock: int) -> None:
+    with SessionLocal() as db:
+        offset = _last_number(db, "products")
+    started = time.perf_counter()
+    for start, stop in _chunks(count, chunk):
+        with SessionLocal() as db:
+            db.execute(text(_PRODUCTS), {
+                "prefix": PREFIX,
+                "start": offset + start,
+                "stop": offset + stop,
+                "stock": stock,
+            })
+            db.commit()
+        _progress("products", stop, count, started)
+    print()
+
+
+def generate_distributors(count: int) -> None:
+    """Top the synthetic distributors up to ``count``."""
+    with SessionLocal() as db:
+        last = _last_number(db, "distributors")
+        if last >= count:
+            return
+        db.execute(text(_DISTRIBUTORS), {
+            "prefix": PREFIX, "start": last + 1, "stop": count,
+            "channels": list(CHANNELS),
+        })
+        db.commit()
+
+
+def generate_orders(count: int, chunk: int, days: int, max_lines: int) -> None:
+    with SessionLocal() as db:
+        min_id, max_id = db.execute(_PRODUCT_RANGE, {"pattern": f"{PREFIX}%"}).one()
+    if min_id is None:
+        raise SystemExit("no synthetic products; generate some with --products first")
+    started = time.perf_counter()
+    for start, stop in _chunks(count, chunk):
+        with SessionLocal() as db:
+            db.execute(text(_ORDERS), {
+                "prefix": PREFIX,
+                "pattern": f"{PREFIX}%",
+                "count": stop - start + 1,
+                "days": days,
+                "max_lines": max_lines,
+                "min_id": min_id,
+                "max_id": max_id,
+            })
+            db.commit()
+        _progress("orders", stop, count, started)
+    print()
+
+
+def analyze() -> None:
+    with SessionLocal() as db:
+        for table in ("products", "inventory", "distributor_details", "orders",
+                      "order_details", "payments"):
+            db.execute(text(f"ANALYZE {table}"))
+        db.commit()
+
+
+def clean() -> None:
+    """Delete every synthetic row (and load-test orders for synthetic products)."""
+    with SessionLocal() as db:
+        db.execute(text("""
+            CREATE TEMP TABLE bench_products ON COMMIT DROP AS
+            SELECT id FROM products WHERE name LIKE :pattern
+        """), {"pattern": f"{PREFIX}%"})
+        db.execute(text("""
+            CREATE TEMP TABLE bench_orders ON COMMIT DROP AS
+            SELECT o.id FROM orders o
+            JOIN distributor_details dd ON dd.id = o.distributor_detail_id
+            JOIN distributors d ON d.id = dd.distributor_id
+            WHERE d.name LIKE :pattern
+        """), {"pattern": f"{PREFIX}%"})
+        db.execute(text("""
+            CREATE TEMP TABLE bench_lines ON COMMIT DROP AS
+            SELECT DISTINCT order_id FROM order_details
+            WHERE product_id IN (SELECT id FROM bench_products)
+        """))
+        for statement in _CLEAN:
+            db.execute(text(statement), {"pattern": f"{PREFIX}%"})
+        db.commit()
+
+
+def main(args) -> None:
+    # Every statement here is slow by design
+    settings.slow_query_ms = float("inf")
+    started = time.perf_counter()
+    if args.clean:
+        clean()
+        print(f"removed synthetic data in {time.perf_counter() - started:.1f}s")
+        return
+    if args.products:
+        generate_products(args.products, args.chunk, args.stock)
+    if args.orders:
+        generate_distributors(args.distributors)
+        generate_orders(args.orders, args.chunk, args.days, args.max_lines)
+    analyze()
+    print(f"done in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--products", type=int, default=1_000_000)
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--max-lines", type=int, default=4, help="lines per order, at most")
+    parser.add_argument("--distributors", type=int, default=200)
+    parser.add_argument("--days", type=int, default=365, help="order dates span")
+    parser.add_argument("--stock", type=int, default=1_000_000, help="inventory per product")
+    parser.add_argument("--chunk", type=int, default=100_000, help="rows per transaction")
+    parser.add_argument("--clean", action="store_true", help="delete the synthetic rows")
+    main(parser.parse_args())
@@ -0,0 +1,84 @@
+"""
+Import throughput: per-row BaseCRUD.create vs the COPY import pipeline.
+
+Inserts synthetic products into the configured database through both paths,
+prints rows/sec for each, then deletes what it inserted.
+
+    python -m benchmarks.import_throughput --rows 50000 --per-row-rows 2000
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import delete
+
+from crud.base import BaseCRUD
+from models.database import AsyncSessionLocal, Product, SessionLocal
+from models.schemas import ProductCreate, ProductUpdate
+from services.importer import PRODUCT_IMPORT, import_rows
+
+PREFIX = "bench-import-"
+
+
+class _SyncProductCRUD(BaseCRUD[Product, ProductCreate, ProductUpdate]):
+    __model__ = Product
+
+
+def synthetic_rows(count: int, tag: str):
+    for i in range(count):
+        yield {
+            "name": f"{PREFIX}{tag}-{i}",
+            "description": "Synthetic product for the import benchmark",
+            "category": "Sticker",
+            "price": 35000 + i % 100,
+            "cost": 10000,
+            "image": "https://placehold.co/300x300",
+        }
+
+
+def bench_per_row(count: int) -> float:
+    crud = _SyncProductCRUD()
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        for row in synthetic_rows(count, "row"):
+            crud.create(db, schema=ProductCreate(**row))
+        return count / (time.perf_counter() - start)
+    finally:
+        db.close()
+
+
+async def bench_copy(count: int) -> float:
+    async with AsyncSessionLocal() as db:
+        start = time.perf_counter()
+        result = await import_rows(db, PRODUCT_IMPORT, synthetic_rows(count, "copy"))
+        elapsed = time.perf_counter() - start
+    assert result.inserted == count, result
+    return count / elapsed
+
+
+def cleanup() -> None:
+    db = SessionLocal()
+    try:
+        db.execute(delete(Product).where(Product.name.like(f"{PREFIX}%")))
+        db.commit()
+    finally:
+        db.close()
+
+
+def main(args) -> None:
+    try:
+        per_row = bench_per_row(args.per_row_rows)
+        copy = asyncio.run(bench_copy(args.rows))
+    finally:
+        cleanup()
+    print(f"per-row BaseCRUD.create: {per_row:10.0f} rows/s ({args.per_row_rows} rows)")
+    print(f"COPY import pipeline:    {copy:10.0f} rows/s ({args.rows} rows)")
+    print(f"speed-up: {copy / per_row:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--per-row-rows", type=int, default=2000)
+    main(parser.parse_args())
@@ -0,0 +1,318 @@
+"""
+Load test: a weighted mix of catalog, auth and write requests.
+
+Needs the synthetic data from benchmarks.datagen (it picks products and
+distributor branches from it). ``--concurrency`` clients loop over the mix
+for ``--duration`` seconds after a ``--warmup``, against ``--base-url`` or,
+with ``--serve``, a uvicorn started here with ``--workers`` workers. Prints
+throughput, p50/p95/p99 and error counts per route, and saves them with the
+git commit to ``--output`` (JSON). ``--compare`` prints the change against a
+saved result, so runs on two commits can be compared.
+
+    python -m benchmarks.datagen --products 1000000 --orders 1000000
+    python -m benchmarks.load --serve --workers 4 --duration 60
+    python -m benchmarks.load --serve --compare load-<commit>.json
+"""
+import argparse
+import asyncio
+import http.cookiejar
+import json
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+import httpx
+from sqlalchemy import text
+
+from benchmarks.datagen import PREFIX
+from benchmarks.login_burst import percentile
+from models.database import SessionLocal
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+CATEGORIES = ["Sticker", "Bag", "Keychain", "Postcard", "Print"]
+SEARCHES = ["hoa anh", "つばめ", "mùa thu", "Tote"]
+SORTS = ["id", "-price", "name", "-stock"]
+
+
+@dataclass
+class Target:
+    """What the scenarios pick from."""
+    min_product: int
+    max_product: int
+    details: List[int]
+    credentials: Dict[str, str] = field(default_factory=dict)
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    def product(self) -> int:
+        return random.randint(self.min_product, self.max_product)
+
+
+def load_target() -> Target:
+    with SessionLocal() as db:
+        min_id, max_id = db.execute(
+            text("SELECT min(id), max(id) FROM products WHERE name LIKE :p"),
+            {"p": f"{PREFIX}%"},
+        ).one()
+        details = db.scalars(text("""
+            SELECT dd.id FROM distributor_details dd
+            JOIN distributors d ON d.id = dd.distributor_id
+            WHERE d.name LIKE :p
+        """), {"p": f"{PREFIX}%"}).all()
+    if min_id is None or not details:
+        raise SystemExit("no synthetic data; run python -m benchmarks.datagen first")
+    return Target(min_id, max_id, list(details))
+
+
+# Each scenario: (route, weight, request). Routes are templates, so results
+# group by endpoint rather than by URL.
+Request = Callable[[httpx.AsyncClient, Target], Awaitable[httpx.Response]]
+
+
+def _list_products(client: httpx.AsyncClient, target: Target):
+    params = random.choice([
+        {"limit": 50},
+        {"limit": 50, "category": random.choice(CATEGORIES)},
+        {"limit": 50, "sort": random.choice(SORTS)},
+        {"limit": 50, "q": random.choice(SEARCHES)},
+        {"limit": 50, "min_price": 100000, "max_price": 150000, "sort": "price"},
+    ])
+    return client.get("/products/", params=params)
+
+
+def _get_product(client: httpx.AsyncClient, target: Target):
+    return client.get(f"/products/{target.product()}")
+
+
+def _list_materials(client: httpx.AsyncClient, target: Target):
+    return client.get("/materials/", params={"limit": 50})
+
+
+def _me(client: httpx.AsyncClient, target: Target):
+    return client.get("/auth/me", headers=target.headers)
+
+
+def _login(client: httpx.AsyncClient, target: Target):
+    return client.post("/auth/login", json=target.credentials)
+
+
+def _place_order(client: httpx.AsyncClient, target: Target):
+    items = [
+        {"product_id": target.product(), "quantity": random.randint(1, 3)}
+        for _ in range(random.randint(1, 3))
+    ]
+    # One line per product
+    items = list({item["product_id"]: item for item in items}.values())
+    return client.post(
+        "/orders/",
+        json={"distributor_detail_id": random.choice(target.details), "items": items},
+        headers=target.headers,
+    )
+
+
+def _update_price(client: httpx.AsyncClient, target: Target):
+    return client.put(
+        f"/products/{target.product()}",
+        json={"price": random.randint(10, 500) * 1000},
+    )
+
+
+def _channel_revenue(client: httpx.AsyncClient, target: Target):
+    return client.get("/reports/revenue/channels", headers=target.headers)
+
+
+SCENARIOS: List[Tuple[str, int, Request]] = [
+    ("GET /products/", 30, _list_products),
+    ("GET /products/{id}", 30, _get_product),
+    ("GET /materials/", 5, _list_materials),
+    ("GET /auth/me", 10, _me),
+    ("POST /auth/login", 2, _login),
+    ("POST /orders/", 10, _place_order),
+    ("PUT /products/{id}", 5, _update_price),
+    ("GET /reports/revenue/channels", 3, _channel_revenue),
+]
+
+
+@dataclass
+class Samples:
+    latencies: List[float] = field(default_factory=list)  # ms, 2xx/3xx only
+    rejected: int = 0  # 4xx (e.g. 409 out of stock, 429 login cap)
+    errors: int = 0  # 5xx and transport errors
+
+
+async def client_loop(
+    client: httpx.AsyncClient,
+    target: Target,
+    results: Dict[str, Samples],
+    record_from: float,
+    stop_at: float,
+) -> None:
+    routes = [s[0] for s in SCENARIOS]
+    weights = [s[1] for s in SCENARIOS]
+    requests = {s[0]: s[2] for s in SCENARIOS}
+    while time.perf_counter() < stop_at:
+        route = random.choices(routes, weights)[0]
+        started = time.perf_counter()
+        try:
+            response = await requests[route](client, target)
+            status = response.status_code
+        except httpx.HTTPError:
+            status = 599
+        if started < record_from:
+            continue
+        samples = results[route]
+        if status >= 500:
+            samples.errors += 1
+        elif status >= 400:
+            samples.rejected += 1
+        else:
+            samples.latencies.append((time.perf_counter() - started) * 1000)
+
+
+def summarize(results: Dict[str, Samples], duration: float) -> Dict[str, dict]:
+    def stats(samples: Samples) -> dict:
+        ok = samples.latencies
+        return {
+            "requests": len(ok) + samples.rejected + samples.errors,
+            "rps": round(len(ok) / duration, 1),
+            "p50_ms": round(percentile(ok, 50), 2),
+            "p95_ms": round(percentile(ok, 95), 2),
+            "p99_ms": round(percentile(ok, 99), 2),
+            "rejected": samples.rejected,
+            "errors": samples.errors,
+        }
+
+    routes = {route: stats(results[route]) for route, _, _ in SCENARIOS if route in results}
+    total = Samples()
+    for samples in results.values():
+        total.latencies += samples.latencies
+        total.rejected += samples.rejected
+        total.errors += samples.errors
+    routes["total"] = stats(total)
+    return routes
+
+
+def print_table(routes: Dict[str, dict], baseline: Dict[str, dict]) -> None:
+    print(f"{'route':<32}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'4xx':>7}{'5xx':>7}")
+    for route, row in routes.items():
+        print(
+            f"{route:<32}{row['rps']:>9.1f}{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}"
+            f"{row['p99_ms']:>9.1f}{row['rejected']:>7}{row['errors']:>7}"
+        )
+        old = baseline.get(route)
+        if old and old["rps"] and old["p95_ms"]:
+            print(
+                f"{'  vs baseline':<32}{_change(row['rps'], old['rps']):>9}"
+                f"{_change(row['p50_ms'], old['p50_ms']):>9}"
+                f"{_change(row['p95_ms'], old['p95_ms']):>9}"
+                f"{_change(row['p99_ms'], old['p99_ms']):>9}"
+            )
+
+
+def _change(new: float, old: float) -> str:
+    return f"{(new - old) / old * 100:+.0f}%" if old else "-"
+
+
+def git_commit() -> str:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND, check=True, capture_output=True, text=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=BACKEND, check=True, capture_output=True, text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}-dirty" if dirty else commit
+
+
+def start_server(workers: int) -> tuple:
+    """Start uvicorn on a free port; returns (process, base_url)."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=BACKEND,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/")
+            return server, f"http://127.0.0.1:{port}/api"
+        except httpx.TransportError:
+            time.sleep(0.1)
+    server.terminate()
+    raise SystemExit("uvicorn did not start within 60s")
+
+
+async def run(args, base_url: str, target: Target) -> Dict[str, Samples]:
+    limits = httpx.Limits(max_connections=args.concurrency)
+    # The loops share one client, so a write's read_primary cookie would send
+    # every later read (of every loop) to the primary, past the cache; keep
+    # no cookies, like the Bearer-token API clients being modelled
+    cookies = http.cookiejar.CookieJar(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=30, cookies=cookies
+    ) as client:
+        login = await client.post("/auth/login", json=target.credentials)
+        login.raise_for_status()
+        target.headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        results: Dict[str, Samples] = defaultdict(Samples)
+        record_from = time.perf_counter() + args.warmup
+        stop_at = record_from + args.duration
+        await asyncio.gather(*(
+            client_loop(client, target, results, record_from, stop_at)
+            for _ in range(args.concurrency)
+        ))
+    return results
+
+
+def main(args) -> None:
+    target = load_target()
+    target.credentials = {"email": args.email, "password": args.password}
+    server, base_url = start_server(args.workers) if args.serve else (None, args.base_url)
+    try:
+        results = asyncio.run(run(args, base_url, target))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+    routes = summarize(results, args.duration)
+    baseline = json.loads(Path(args.compare).read_text())["routes"] if args.compare else {}
+    print_table(routes, baseline)
+
+    commit = git_commit()
+    output = Path(args.output or f"load-{commit}.json")
+    output.write_text(json.dumps({
+        "commit": commit,
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "args": {k: v for k, v in vars(args).items() if k not in ("password", "compare", "output")},
+        "routes": routes,
+    }, indent=2))
+    print(f"\nsaved {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://localhost:8002/api")
+    parser.add_argument("--serve", action="store_true", help="start uvicorn here")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers (--serve)")
+    parser.add_argument("--email", default="admin@tsubame.com")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--concurrency", type=int, default=32, help="concurrent clients")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds measured")
+    parser.add_argument("--warmup", type=float, default=5.0, help="seconds not measured")
+    parser.add_argument("--output", help="result file (default load-<commit>.json)")
+    parser.add_argument("--compare", help="earlier result file to compare against")
+    main(parser.parse_args())
@@ -0,0 +1,77 @@
+"""
+Catalog latency while the API is under a login burst.
+
+Fires ``--logins`` concurrent POST /auth/login calls in a loop and, at the same
+time, a steady stream of GET /products/ requests, then prints catalog p50/p99.
+Run it once with --logins 0 for a baseline; with bcrypt off the event loop the
+two p99s should stay close (logins past the cap get a quick 429).
+
+    python -m benchmarks.login_burst --base-url http://localhost:8002/api
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from collections import Counter
+from typing import List
+
+import httpx
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def login_loop(
+    client: httpx.AsyncClient, args, stop: asyncio.Event, codes: Counter
+) -> None:
+    body = {"email": args.email, "password": args.password}
+    while not stop.is_set():
+        r = await client.post("/auth/login", json=body)
+        codes[r.status_code] += 1
+
+
+async def catalog_loop(
+    client: httpx.AsyncClient, stop: asyncio.Event, samples: List[float]
+) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        r = await client.get("/products/", params={"limit": 20})
+        r.raise_for_status()
+        samples.append((time.perf_counter() - start) * 1000)
+
+
+async def main(args) -> None:
+    limits = httpx.Limits(max_connections=args.logins + args.readers + 4)
+    client = httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=30)
+    async with client:
+        stop = asyncio.Event()
+        samples: List[float] = []
+        codes: Counter = Counter()
+        tasks = [login_loop(client, args, stop, codes) for _ in range(args.logins)]
+        tasks += [catalog_loop(client, stop, samples) for _ in range(args.readers)]
+        tasks = [asyncio.create_task(t) for t in tasks]
+        await asyncio.sleep(args.duration)
+        stop.set()
+        await asyncio.gather(*tasks)
+
+    print(f"logins in flight: {args.logins}  login responses: {dict(codes)}")
+    print(f"catalog requests: {len(samples)}")
+    if samples:
+        print(f"catalog p50: {statistics.median(samples):.1f} ms")
+        print(f"catalog p99: {percentile(samples, 99):.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://localhost:8002/api")
+    parser.add_argument("--email", default="user@tsubame.com")
+    parser.add_argument("--password", default="user123")
+    parser.add_argument("--logins", type=int, default=32, help="concurrent login loops")
+    parser.add_argument("--readers", type=int, default=4, help="concurrent catalog loops")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,114 @@
+"""
+Per-item cost of rendering a catalog page as JSON.
+
+Builds ``--sizes`` pages of in-memory Product (with Inventory) and Material
+ORM objects and times, per item, three ways of turning a page into a body:
+
+- ``response_model``: FastAPI's default, validate into the schema, then
+  ``jsonable_encoder`` and the stdlib ``json``;
+- ``TypeAdapter``: validate with ``from_attributes``, then ``dump_json``
+  (what the cached routers did before the compiled serializers);
+- ``compiled``: ``api.caching.render_json`` with the routers' compiled
+  serializers (no validation, orjson).
+
+All three must produce the same JSON. No database is needed.
+
+    python -m benchmarks.serialization --sizes 100 1000
+"""
+import argparse
+import json
+import time
+from typing import Callable, List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from api.caching import compile_serializer, render_json
+from models.database import Inventory, Material, Product
+from models.schemas import MaterialBase, ProductWithInventory
+
+
+def products(count: int) -> list:
+    items = []
+    for i in range(count):
+        product = Product(
+            id=i,
+            name=f"Sticker {i} mùa thu つばめ",
+            description="Synthetic product for the serialization benchmark",
+            category="Sticker",
+            price=35000.0 + i,
+            cost=10000.0,
+            image="https://placehold.co/300x300",
+            shopee_link=f"https://shopee.vn/product/1/{i}" if i % 2 else None,
+        )
+        # Every tenth product has no inventory row yet
+        product.inventory = None if i % 10 == 0 else Inventory(
+            id=i, product_id=i, status="In Stock", stock=50 + i
+        )
+        items.append(product)
+    return items
+
+
+def materials(count: int) -> list:
+    return [
+        Material(
+            id=i, name=f"Vải canvas {i}", unit="m", quantity=100 + i,
+            min_stock_level=10, status="In Stock", price=12000.5,
+        )
+        for i in range(count)
+    ]
+
+
+def renderers(schema) -> dict:
+    adapter = TypeAdapter(List[schema])
+    serialize = compile_serializer(schema)
+    return {
+        "response_model": lambda items: json.dumps(
+            jsonable_encoder(adapter.validate_python(items, from_attributes=True))
+        ).encode(),
+        "TypeAdapter": lambda items: adapter.dump_json(
+            adapter.validate_python(items, from_attributes=True)
+        ),
+        "compiled": lambda items: render_json(serialize, items),
+    }
+
+
+def per_item_us(render: Callable, items: list, budget: float) -> float:
+    """Best-of-5 microseconds per item, each round lasting about ``budget`` / 5 s."""
+    render(items)
+    started = time.perf_counter()
+    render(items)
+    repeat = max(1, int(budget / 5 / max(time.perf_counter() - started, 1e-6)))
+    best = float("inf")
+    for _ in range(5):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            render(items)
+        best = min(best, (time.perf_counter() - started) / repeat)
+    return best / len(items) * 1e6
+
+
+def main(args) -> None:
+    print(f"{'page':<24}{'response_model':>16}{'TypeAdapter':>14}{'compiled':>12}{'speedup':>10}")
+    for label, make, schema in (
+        ("products", products, ProductWithInventory),
+        ("materials", materials, MaterialBase),
+    ):
+        paths = renderers(schema)
+        for size in args.sizes:
+            items = make(size)
+            bodies = {name: json.loads(render(items)) for name, render in paths.items()}
+            assert all(body == bodies["response_model"] for body in bodies.values()), label
+            costs = {name: per_item_us(render, items, args.seconds) for name, render in paths.items()}
+            print(
+                f"{f'{label} x {size}':<24}{costs['response_model']:>13.2f} us"
+                f"{costs['TypeAdapter']:>11.2f} us{costs['compiled']:>9.2f} us"
+                f"{costs['response_model'] / costs['compiled']:>9.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000], help="items per page")
+    parser.add_argument("--seconds", type=float, default=1.0, help="time per measurement")
+    main(parser.parse_args())
@@ -0,0 +1,218 @@
+"""
+Shopee listing sync against a local stand-in for the Shopee API.
+
+Starts an HTTP server that checks request signatures, adds latency and fails
+a share of requests with 429 / 500, points the sync at it, and links
+synthetic products to it. Then runs:
+
+1. a first sync (every product is pushed),
+2. a sync after changing the price or stock of ``--changed`` products
+   (only those are pushed, only the changed field),
+3. a sync with nothing changed (no requests),
+
+checks that the stand-in ended up with every product's price and stock, and
+prints requests, retries, connections opened and time per run. Everything
+it inserted is deleted afterwards.
+
+    python -m benchmarks.shopee_sync --products 2000 --changed 50
+"""
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from sqlalchemy import delete, insert, select, update
+
+from core.config import settings
+from models.database import Inventory, Product, SessionLocal
+from services.shopee import UPDATE_PRICE_PATH, UPDATE_STOCK_PATH
+from services.shopee_sync import sync_listings
+
+PREFIX = "bench-shopee-"
+PARTNER_KEY = "bench-partner-key"
+
+
+class StandIn(ThreadingHTTPServer):
+    """Records the listings' price / stock as the real API would."""
+
+    daemon_threads = True
+
+    def __init__(self, latency: float, error_rate: float) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.prices = {}
+        self.stock = {}
+        self.requests = 0
+        self.connections = 0
+        self.bad_signatures = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True  # headers and body are separate writes
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        server = self.server
+        url = urlsplit(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.requests += 1
+        time.sleep(server.latency)
+        base = (
+            f"{params.get('partner_id')}{url.path}{params.get('timestamp')}"
+            f"{params.get('access_token')}{params.get('shop_id')}"
+        )
+        sign = hmac.new(PARTNER_KEY.encode(), base.encode(), hashlib.sha256).hexdigest()
+        if params.get("sign") != sign:
+            with server.lock:
+                server.bad_signatures += 1
+            return self._reply(200, {"error": "error_sign", "message": "Wrong sign"})
+        if random.random() < server.error_rate:
+            return self._reply(random.choice((429, 500)), {"error": "error_busy"})
+        item_id = body["item_id"]
+        with server.lock:
+            if url.path == UPDATE_PRICE_PATH:
+                server.prices[item_id] = body["price_list"][0]["original_price"]
+            elif url.path == UPDATE_STOCK_PATH:
+                server.stock[item_id] = body["stock_list"][0]["seller_stock"][0]["stock"]
+            else:
+                return self._reply(404, {"error": "error_not_found"})
+        self._reply(200, {"error": "", "response": {"failure_list": []}})
+
+    def _reply(self, code: int, data: dict) -> None:
+        payload = json.dumps(data).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        if code == 429:
+            self.send_header("Retry-After", "0")
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def seed(count: int) -> dict:
+    """Insert linked products with inventory; returns item_id -> product_id."""
+    with SessionLocal() as db:
+        ids = db.scalars(
+            insert(Product).returning(Product.id),
+            [
+                {
+                    "name": f"{PREFIX}{i}",
+                    "description": "Synthetic product for the Shopee sync benchmark",
+                    "category": "Sticker",
+                    "price": 35000 + i % 100,
+                    "cost": 10000,
+                    "image": "https://placehold.co/300x300",
+                    "shopee_link": f"https://shopee.vn/{PREFIX}{i}-i.1.{900000 + i}",
+                }
+                for i in range(count)
+            ],
+        ).all()
+        db.execute(
+            insert(Inventory),
+            [{"product_id": pid, "stock": 50, "status": "In Stock"} for pid in ids],
+        )
+        db.commit()
+    return {900000 + i: pid for i, pid in enumerate(ids)}
+
+
+def change(items: dict, count: int) -> None:
+    """Bump the price of half of ``count`` products and the stock of the rest."""
+    picked = random.sample(sorted(items.values()), count)
+    with SessionLocal() as db:
+        half = count // 2
+        db.execute(update(Product).where(Product.id.in_(picked[:half])).values(price=Product.price + 1000))
+        db.execute(update(Inventory).where(Inventory.product_id.in_(picked[half:])).values(stock=Inventory.stock - 1))
+        db.commit()
+
+
+def check(server: StandIn, items: dict) -> int:
+    """Products whose listing does not match the database."""
+    with SessionLocal() as db:
+        current = {
+            pid: (price, stock)
+            for pid, price, stock in db.execute(
+                select(Product.id, Product.price, Inventory.stock)
+                .join(Inventory, Inventory.product_id == Product.id)
+                .where(Product.id.in_(list(items.values())))
+            )
+        }
+    return sum(
+        1 for item_id, pid in items.items()
+        if (server.prices.get(item_id), server.stock.get(item_id)) != current[pid]
+    )
+
+
+def cleanup(items: dict) -> None:
+    ids = list(items.values())
+    with SessionLocal() as db:
+        db.execute(delete(Inventory).where(Inventory.product_id.in_(ids)))
+        db.execute(delete(Product).where(Product.name.like(f"{PREFIX}%")))
+        db.commit()
+
+
+def run(server: StandIn, label: str) -> None:
+    requests, connections = server.requests, server.connections
+    start = time.perf_counter()
+    report = asyncio.run(sync_listings())
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<16} {report.changed:6d} changed {report.failed:4d} failed "
+        f"{server.requests - requests:7d} requests {report.retries:5d} retries "
+        f"{server.connections - connections:4d} connections {elapsed:7.2f}s"
+    )
+
+
+def main(args) -> None:
+    server = StandIn(args.latency, args.error_rate)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    settings.shopee_api_url = server.url
+    settings.shopee_partner_id = "1"
+    settings.shopee_partner_key = PARTNER_KEY
+    settings.shopee_shop_id = "1"
+    settings.shopee_access_token = "bench-token"
+    settings.shopee_rate_limit = args.rate
+    settings.shopee_max_concurrency = args.concurrency
+    items = {}
+    try:
+        items = seed(args.products)
+        run(server, "first sync")
+        change(items, args.changed)
+        run(server, f"{args.changed} changed")
+        run(server, "no changes")
+        print(f"listings out of date: {check(server, items)}, bad signatures: {server.bad_signatures}")
+    finally:
+        cleanup(items)
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--changed", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds per request")
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--rate", type=float, default=500, help="requests/s limit")
+    parser.add_argument("--concurrency", type=int, default=16)
+    main(parser.parse_args())
@@ -0,0 +1,127 @@
+"""
+Startup time: how fast a fresh worker can serve its first request.
+
+Each run starts a new interpreter that imports ``main`` (import time), runs
+the app's startup and serves ``--path`` in-process (time to first request,
+measured from interpreter start). With ``--uvicorn`` it instead starts
+``uvicorn main:app`` and polls ``--path`` until it answers, which adds
+server startup. Prints min / median / max over ``--runs`` and the modules
+that cost the most to import (``python -X importtime``).
+
+    python -m benchmarks.startup --runs 5 --path "/api/products/?limit=1"
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+# Run in the child interpreter; prints {"import": s, "first_request": s}
+_IN_PROCESS = """
+import time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+import asyncio, json, sys
+import httpx
+
+async def first_request():
+    async with main.app.router.lifespan_context(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", follow_redirects=True
+        ) as client:
+            response = await client.get(sys.argv[1])
+            assert response.status_code < 500, response.status_code
+
+asyncio.run(first_request())
+print(json.dumps({
+    "import": imported - started,
+    "first_request": time.perf_counter() - started,
+}))
+"""
+
+
+def run_in_process(path: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", _IN_PROCESS, path],
+        cwd=BACKEND, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def run_uvicorn(path: str, timeout: float = 60) -> dict:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port)],
+        cwd=BACKEND, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                response = httpx.get(f"http://127.0.0.1:{port}{path}", follow_redirects=True)
+            except httpx.TransportError:
+                time.sleep(0.01)
+                continue
+            assert response.status_code < 500, response.status_code
+            return {"first_request": time.perf_counter() - started}
+        raise TimeoutError(f"no response from uvicorn within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def slowest_imports(top: int) -> list:
+    """(cumulative seconds, module) of the ``top`` costliest imports of main."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND, check=True, capture_output=True, text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative) / 1e6, name.rstrip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def summary(label: str, values: list) -> None:
+    print(
+        f"{label:<22} min {min(values) * 1000:7.0f} ms  "
+        f"median {statistics.median(values) * 1000:7.0f} ms  "
+        f"max {max(values) * 1000:7.0f} ms"
+    )
+
+
+def main(args) -> None:
+    runs = [
+        run_uvicorn(args.path) if args.uvicorn else run_in_process(args.path)
+        for _ in range(args.runs)
+    ]
+    for key in runs[0]:
+        summary(key.replace("_", " "), [run[key] for run in runs])
+    print("\nslowest imports of main (cumulative):")
+    for seconds, name in slowest_imports(args.top):
+        print(f"{seconds * 1000:8.0f} ms  {name}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--path", default="/", help="first request (e.g. a DB-backed route)")
+    parser.add_argument("--uvicorn", action="store_true", help="measure through a real server")
+    parser.add_argument("--top", type=int, default=15)
+    main(parser.parse_args())
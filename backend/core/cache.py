@@ -0,0 +1,209 @@
+"""
+Small key/value cache with an in-process LRU backend and an optional Redis one.
+
+Values are bytes (callers serialize), every entry has a TTL, and each cache
+counts hits and misses. ``make_cache`` picks Redis when ``REDIS_URL`` is set,
+so all workers share entries and invalidations; otherwise each worker keeps
+its own bounded LRU. That includes Celery workers: without REDIS_URL, the
+invalidations a job on a real worker makes never reach the API processes,
+whose entries then live out their TTL.
+"""
+import asyncio
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from core.config import settings
+
+# Key holding the token that list-style keys embed; deleting it orphans them all
+_GENERATION_KEY = "__generation__"
+_GENERATION_TTL = 24 * 3600
+# Set by invalidate() for DB_READ_PRIMARY_SECONDS: while it lives, a replica
+# may still return the rows from before the write
+_WRITTEN_KEY = "__written__"
+
+
+class MemoryBackend:
+    """Bounded LRU with per-entry expiry, local to one worker process.
+
+    Locked, since sync code (eager Celery jobs, sync routes) invalidates from
+    threads while the event loop reads and writes.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.set_nowait(key, value, ttl)
+
+    def set_nowait(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    async def delete(self, *keys: str) -> None:
+        self.delete_nowait(*keys)
+
+    def delete_nowait(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    async def clear(self, prefix: str) -> None:
+        with self._lock:
+            for key in [k for k in self._data if k.startswith(prefix)]:
+                del self._data[key]
+
+
+class RedisBackend:
+    """Shared backend on Redis; entries expire through Redis TTLs."""
+
+    def __init__(self, url: str) -> None:
+        import redis
+        import redis.asyncio
+
+        self._client = redis.asyncio.Redis.from_url(url)
+        # For invalidations fired from sync code (ORM events, scripts)
+        self._sync_client = redis.Redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._client.set(key, value, px=max(1, int(ttl * 1000)))
+
+    def set_nowait(self, key: str, value: bytes, ttl: float) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._sync_client.set(key, value, px=max(1, int(ttl * 1000)))
+        else:
+            loop.create_task(self.set(key, value, ttl))
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self._client.delete(*keys)
+
+    def delete_nowait(self, *keys: str) -> None:
+        if not keys:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._sync_client.delete(*keys)
+        else:
+            loop.create_task(self._client.delete(*keys))
+
+    async def clear(self, prefix: str) -> None:
+        async for key in self._client.scan_iter(match=f"{prefix}*"):
+            await self._client.delete(key)
+
+
+class Cache:
+    """Namespaced cache over a backend, with hit/miss counters."""
+
+    def __init__(self, namespace: str, backend, ttl: float) -> None:
+        self.namespace = namespace
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, key: str) -> str:
+        return f"{settings.cache_key_prefix}:{self.namespace}:{key}"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        value = await self.backend.get(self._key(key))
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        await self.backend.set(self._key(key), value, self.ttl if ttl is None else ttl)
+
+    async def delete(self, *keys: str) -> None:
+        await self.backend.delete(*(self._key(k) for k in keys))
+
+    def delete_nowait(self, *keys: str) -> None:
+        """Invalidate from sync code; Redis deletes are scheduled if a loop runs."""
+        self.backend.delete_nowait(*(self._key(k) for k in keys))
+
+    async def clear(self) -> None:
+        await self.backend.clear(self._key(""))
+
+    async def generation(self) -> str:
+        """Token to embed in keys that a write must invalidate wholesale (lists).
+
+        It changes whenever invalidate() runs, so older keys are never read
+        again and simply age out; no key scan is needed on either backend.
+        """
+        key = self._key(_GENERATION_KEY)
+        value = await self.backend.get(key)
+        if value is None:
+            value = uuid.uuid4().hex.encode()
+            await self.backend.set(key, value, _GENERATION_TTL)
+        return value.decode()
+
+    async def invalidate(self, *keys: str) -> None:
+        """Drop ``keys`` and start a new generation.
+
+        Marks the namespace as just written first, so a render that misses
+        after the delete already sees the mark (see recently_written()).
+        """
+        await self.backend.set(
+            self._key(_WRITTEN_KEY), b"1", settings.db_read_primary_seconds
+        )
+        await self.delete(*keys, _GENERATION_KEY)
+
+    def invalidate_nowait(self, *keys: str) -> None:
+        """invalidate() for sync callers."""
+        self.backend.set_nowait(
+            self._key(_WRITTEN_KEY), b"1", settings.db_read_primary_seconds
+        )
+        self.delete_nowait(*keys, _GENERATION_KEY)
+
+    async def recently_written(self) -> bool:
+        """Whether invalidate() ran in the last DB_READ_PRIMARY_SECONDS, i.e.
+        a read replica may not have that write yet."""
+        return await self.backend.get(self._key(_WRITTEN_KEY)) is not None
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+_redis_backend: Optional[RedisBackend] = None
+# Every cache made by make_cache, by namespace (for /metrics)
+caches: Dict[str, Cache] = {}
+
+
+def make_cache(namespace: str, *, maxsize: int, ttl: float) -> Cache:
+    """Cache on Redis when REDIS_URL is configured, else an in-process LRU."""
+    global _redis_backend
+    if settings.redis_url:
+        if _redis_backend is None:
+            _redis_backend = RedisBackend(settings.redis_url)
+        cache = Cache(namespace, _redis_backend, ttl)
+    else:
+        cache = Cache(namespace, MemoryBackend(maxsize), ttl)
+    caches[namespace] = cache
+    return cache
@@ -0,0 +1,51 @@
+"""
+Celery app for background jobs.
+
+Run a worker (with the periodic jobs) against Redis with:
+
+    celery -A core.celery_app worker --beat --loglevel=info
+
+Without a broker configured, tasks run eagerly in the calling process
+(``task_always_eager``) over an in-memory transport, so the API, scripts and
+tests work with no worker or Redis. The API queues jobs by name through
+core/jobs.py, which loads this module on first use.
+
+A worker with a broker but no REDIS_URL keeps its own in-process caches, so
+the cache invalidations its jobs make do not reach the API processes; set
+REDIS_URL whenever a separate worker runs.
+"""
+from celery import Celery
+
+from core.config import settings
+
+celery_app = Celery(
+    "tsubame",
+    broker=settings.celery_broker_url or "memory://",
+    include=["services.tasks"],
+)
+celery_app.conf.update(
+    task_always_eager=settings.celery_always_eager,
+    task_eager_propagates=True,
+    task_ignore_result=True,
+    task_serializer="json",
+    accept_content=["json"],
+    beat_schedule={
+        "sweep-stock-statuses": {
+            "task": "services.tasks.recompute_stock_statuses",
+            "schedule": float(settings.stock_status_sweep_seconds),
+        },
+        "fold-report-deltas": {
+            "task": "services.tasks.fold_report_deltas",
+            "schedule": settings.report_fold_seconds,
+        },
+        "prune-outbox": {
+            "task": "services.tasks.prune_outbox",
+            "schedule": 3600.0,
+        },
+        "sync-shopee-listings": {
+            "task": "services.tasks.sync_shopee_listings",
+            "schedule": float(settings.shopee_sync_seconds),
+        },
+    },
+)
+
@@ -1,6 +1,6 @@
 """Application configuration."""
 import os
-from typing import Optional
+from typing import List, Optional
 
 from dotenv import load_dotenv
 
@@ -31,12 +31,132 @@ class Settings:
             f"@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
         )
 
+    @property
+    def async_database_url(self) -> str:
+        """Same database through the asyncpg driver (AsyncSession engine)."""
+        return self.database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+    # Connection pool (per engine, per worker process)
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    db_pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    db_pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    db_pool_pre_ping: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() != "false"
+    # Behind PgBouncer in transaction mode: no server-side prepared statements
+    db_pgbouncer: bool = os.getenv("DB_PGBOUNCER", "false").lower() != "false"
+
+    # Read replicas (core/replicas.py): comma-separated postgresql:// URLs for
+    # the read-only routes; empty means everything uses the primary
+    database_replica_urls: List[str] = [
+        url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()
+    ]
+    db_replica_check_seconds: float = float(os.getenv("DB_REPLICA_CHECK_SECONDS", "5"))
+    db_replica_check_timeout_seconds: float = float(
+        os.getenv("DB_REPLICA_CHECK_TIMEOUT_SECONDS", "2")
+    )
+    # After a write, the same client reads from the primary for this long
+    db_read_primary_seconds: int = int(os.getenv("DB_READ_PRIMARY_SECONDS", "10"))
+
+    # Statements slower than this are logged with the route that ran them
+    slow_query_ms: float = float(os.getenv("SLOW_QUERY_MS", "200"))
+
+    # Inventory at or below this stock is "Low Stock" (0 is "Sold Out")
+    low_stock_threshold: int = int(os.getenv("LOW_STOCK_THRESHOLD", "20"))
+
+    # Longest a worker serves its bill-of-materials results without a full
+    # recompute (its own writes are applied incrementally on the next read)
+    bom_cache_ttl_seconds: int = int(os.getenv("BOM_CACHE_TTL_SECONDS", "300"))
+
+    # Most rows (create + update + delete) accepted by one POST /<module>/bulk
+    bulk_max_rows: int = int(os.getenv("BULK_MAX_ROWS", "10000"))
+
+    # Cache: shared Redis when REDIS_URL is set, else a per-worker LRU
+    redis_url: str = os.getenv("REDIS_URL", "")
+    cache_key_prefix: str = os.getenv("CACHE_KEY_PREFIX", "tsubame")
+    user_cache_size: int = int(os.getenv("USER_CACHE_SIZE", "10000"))
+    user_cache_ttl_seconds: int = int(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+    # Serialized catalog responses (products, materials); writes invalidate them
+    response_cache_size: int = int(os.getenv("RESPONSE_CACHE_SIZE", "2048"))
+    response_cache_ttl_seconds: int = int(
+        os.getenv("RESPONSE_CACHE_TTL_SECONDS", "30")
+    )
+    # Catalog lists past their TTL are served for this much longer while one
+    # request refreshes them (stale-while-revalidate); 0 turns it off
+    response_cache_stale_seconds: float = float(
+        os.getenv("RESPONSE_CACHE_STALE_SECONDS", "0")
+    )
+
+    # Background jobs (Celery). Without a broker (no CELERY_BROKER_URL or
+    # REDIS_URL) tasks run eagerly in the calling process: no worker needed
+    celery_broker_url: str = os.getenv("CELERY_BROKER_URL", "") or redis_url
+    celery_always_eager: bool = (
+        os.getenv("CELERY_ALWAYS_EAGER", "false" if celery_broker_url else "true")
+        .lower() != "false"
+    )
+    # Full Material/Inventory status sweep run by celery beat
+    stock_status_sweep_seconds: int = int(
+        os.getenv("STOCK_STATUS_SWEEP_SECONDS", "300")
+    )
+    # Redis pub/sub channel for low-stock events (prefixed with CACHE_KEY_PREFIX)
+    stock_events_channel: str = os.getenv("STOCK_EVENTS_CHANNEL", "stock-events")
+
+    # Audit trail (services/audit.py): queued CRUD changes, flushed in batches
+    audit_queue_size: int = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+    audit_batch_size: int = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+    audit_flush_seconds: float = float(os.getenv("AUDIT_FLUSH_SECONDS", "1"))
+    # Longest a write waits for room in a full audit queue before its entries
+    # are dropped
+    audit_backpressure_seconds: float = float(
+        os.getenv("AUDIT_BACKPRESSURE_SECONDS", "5")
+    )
+
+    # Change feed (services/outbox.py)
+    outbox_poll_seconds: float = float(os.getenv("OUTBOX_POLL_SECONDS", "1"))
+    outbox_retention_hours: int = int(os.getenv("OUTBOX_RETENTION_HOURS", "168"))
+
+    # Report deltas (services/reports.py): folded by Celery beat every
+    # REPORT_FOLD_SECONDS, at most REPORT_FOLD_BATCH_SIZE per transaction
+    report_fold_seconds: float = float(os.getenv("REPORT_FOLD_SECONDS", "5"))
+    report_fold_batch_size: int = int(os.getenv("REPORT_FOLD_BATCH_SIZE", "10000"))
+
+    # Shopee listing sync (services/shopee_sync.py); disabled without a partner id
+    shopee_api_url: str = os.getenv("SHOPEE_API_URL", "https://partner.shopeemobile.com")
+    shopee_partner_id: str = os.getenv("SHOPEE_PARTNER_ID", "")
+    shopee_partner_key: str = os.getenv("SHOPEE_PARTNER_KEY", "")
+    shopee_shop_id: str = os.getenv("SHOPEE_SHOP_ID", "")
+    shopee_access_token: str = os.getenv("SHOPEE_ACCESS_TOKEN", "")
+    shopee_max_concurrency: int = int(os.getenv("SHOPEE_MAX_CONCURRENCY", "8"))
+    shopee_rate_limit: float = float(os.getenv("SHOPEE_RATE_LIMIT", "10"))  # requests/s
+    shopee_max_retries: int = int(os.getenv("SHOPEE_MAX_RETRIES", "4"))
+    shopee_timeout_seconds: float = float(os.getenv("SHOPEE_TIMEOUT_SECONDS", "10"))
+    shopee_sync_batch_size: int = int(os.getenv("SHOPEE_SYNC_BATCH_SIZE", "100"))
+    shopee_sync_seconds: int = int(os.getenv("SHOPEE_SYNC_SECONDS", "600"))
+
+    # Product images (services/images.py): variants stored under IMAGE_DIR and
+    # served from IMAGE_BASE_URL (the API serves them at /api/media/images)
+    image_dir: str = os.getenv("IMAGE_DIR", "media/images")
+    image_base_url: str = os.getenv("IMAGE_BASE_URL", f"{api_v1_prefix}/media/images")
+    image_widths: List[int] = [
+        int(w) for w in os.getenv("IMAGE_WIDTHS", "160,320,640,1280").split(",") if w.strip()
+    ]
+    # Product.image points at the WebP variant of this width after an upload
+    image_default_width: int = int(os.getenv("IMAGE_DEFAULT_WIDTH", "640"))
+    image_max_bytes: int = int(os.getenv("IMAGE_MAX_BYTES", str(20 * 1024 * 1024)))
+    image_workers: int = int(os.getenv("IMAGE_WORKERS", "2"))
+    image_max_pending: int = int(os.getenv("IMAGE_MAX_PENDING", "8"))
+
     # Auth
     secret_key: str = os.getenv("SECRET_KEY", "change-me-in-production")
     algorithm: str = os.getenv("ALGORITHM", "HS256")
     access_token_expire_minutes: int = int(
         os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
     )
+    # bcrypt runs in a thread pool of this size; logins beyond max_pending
+    # (running + queued) are rejected with 429 instead of piling up
+    password_hash_workers: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    password_hash_max_pending: int = int(
+        os.getenv("PASSWORD_HASH_MAX_PENDING", "16")
+    )
 
 
 settings = Settings()
@@ -1,9 +1,13 @@
 """FastAPI dependencies: DB session, auth."""
-from typing import Generator
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator, Generator
 
+from fastapi import HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from models.database import SessionLocal
+from core.replicas import reads_own_writes
+from models.database import AsyncSessionLocal, SessionLocal, replicas
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -13,3 +17,40 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Provide an AsyncSession per request (used by the routers)."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """AsyncSession for read-only routes: a healthy replica, else the primary.
+
+    Clients that wrote recently (see core/replicas.py) get the primary. Never
+    use it for a route that writes.
+    """
+    async with read_session(primary=reads_own_writes(request)) as db:
+        yield db
+
+
+@asynccontextmanager
+async def read_session(primary: bool = False) -> AsyncIterator[AsyncSession]:
+    """get_read_db's session outside a request (e.g. a background refresh)."""
+    replica = None if primary else replicas.pick()
+    if replica is None:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+    async with replica.sessionmaker() as db:
+        db.info["replica"] = replica.name
+        try:
+            yield db
+        except HTTPException:
+            raise
+        except Exception:
+            # Maybe the replica went away: check it now rather than at the
+            # next interval, so other requests stop using it
+            replicas.recheck(replica)
+            raise
@@ -0,0 +1,60 @@
+"""
+Bounded executors for CPU-heavy work called from async routes.
+
+The executor is created on first use. Work waiting for it is capped: past
+``max_pending`` running or queued calls, callers get a 429 straight away
+rather than queueing behind a burst.
+"""
+import asyncio
+from concurrent.futures import Executor
+from typing import Any, Callable, Optional, TypeVar
+
+from fastapi import HTTPException, status
+
+T = TypeVar("T")
+
+
+class BoundedExecutor:
+    """Executor from ``make_executor`` with at most ``max_pending`` calls in it."""
+
+    def __init__(
+        self,
+        make_executor: Callable[[], Executor],
+        max_pending: int,
+        *,
+        busy_detail: str,
+        retry_after: int,
+    ) -> None:
+        self.make_executor = make_executor
+        self.max_pending = max_pending
+        self.busy_detail = busy_detail
+        self.retry_after = retry_after
+        self.pending = 0
+        self._executor: Optional[Executor] = None
+
+    def check_capacity(self) -> None:
+        """Raise 429 if too much is queued (run() checks this as well)."""
+        if self.pending >= self.max_pending:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=self.busy_detail,
+                headers={"Retry-After": str(self.retry_after)},
+            )
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(*args)`` in the executor, or raise 429 if too much is queued."""
+        self.check_capacity()
+        # Only touched from the event loop thread, so a plain counter is safe
+        self.pending += 1
+        try:
+            if self._executor is None:
+                self._executor = self.make_executor()
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            self.pending -= 1
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,157 @@
+"""
+Request and query instrumentation for the Prometheus /metrics endpoint.
+
+``MetricsMiddleware`` records, per route template (``/api/products/{product_id}``
+rather than the concrete path, so label values stay bounded), the request
+latency, requests in flight, response size, and how many SQL statements the
+request ran and how long they took. ``instrument_engine`` hooks an engine's
+cursor events into those per-request counts and logs statements slower than
+SLOW_QUERY_MS together with the route that issued them. A request that runs
+many statements (an N+1) shows up in ``db_statements_per_request``.
+"""
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.config import settings
+from core.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# Bytes and statement counts need their own bucket ladders
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+UNMATCHED_ROUTE = "<unmatched>"
+
+REQUESTS_IN_PROGRESS = REGISTRY.family(
+    "http_requests_in_progress",
+    "Requests currently being served.",
+    "gauge",
+    ("method", "route"),
+)
+REQUEST_DURATION = REGISTRY.family(
+    "http_request_duration_seconds",
+    "Time from request start to the last response byte.",
+    "histogram",
+    ("method", "route", "status"),
+)
+RESPONSE_SIZE = REGISTRY.family(
+    "http_response_size_bytes",
+    "Response body size.",
+    "histogram",
+    ("method", "route"),
+    buckets=SIZE_BUCKETS,
+)
+DB_STATEMENTS = REGISTRY.family(
+    "db_statements_per_request",
+    "SQL statements executed while serving one request.",
+    "histogram",
+    ("method", "route"),
+    buckets=COUNT_BUCKETS,
+)
+DB_TIME = REGISTRY.family(
+    "db_time_per_request_seconds",
+    "Time spent executing SQL while serving one request.",
+    "histogram",
+    ("method", "route"),
+)
+SLOW_QUERIES = REGISTRY.family(
+    "db_slow_queries_total",
+    "Statements slower than SLOW_QUERY_MS.",
+    "counter",
+    ("route",),
+)
+
+
+@dataclass
+class RequestStats:
+    route: str
+    statements: int = 0
+    db_seconds: float = 0.0
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def route_template(app: ASGIApp, scope: Scope) -> str:
+    """Path template of the route ``scope`` will be dispatched to."""
+    partial = None
+    for route in getattr(app, "routes", ()):
+        match, _ = route.matches(scope)
+        if match is Match.FULL:
+            return route.path
+        if match is Match.PARTIAL and partial is None:
+            partial = route.path  # right path, wrong method (405)
+    return partial or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """ASGI middleware feeding the http_* and db_*_per_request metrics."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        route = route_template(scope["app"], scope)
+        stats = RequestStats(route)
+        token = _current.set(stats)
+        status, size = 500, 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(method, route)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            in_progress.dec()
+            _current.reset(token)
+            REQUEST_DURATION.labels(method, route, str(status)).observe(elapsed)
+            RESPONSE_SIZE.labels(method, route).observe(size)
+            DB_STATEMENTS.labels(method, route).observe(stats.statements)
+            DB_TIME.labels(method, route).observe(stats.db_seconds)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_start
+    stats = _current.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_seconds += elapsed
+    if elapsed * 1000 >= settings.slow_query_ms:
+        route = stats.route if stats is not None else "-"
+        SLOW_QUERIES.labels(route).inc()
+        logger.warning(
+            "Slow query (%.1f ms) on %s: %s",
+            elapsed * 1000,
+            route,
+            " ".join(statement.split())[:1000],
+        )
+
+
+def instrument_engine(engine) -> None:
+    """Count and time every statement ``engine`` runs (sync engine objects)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
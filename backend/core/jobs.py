@@ -0,0 +1,52 @@
+"""
+Queue Celery jobs by task name.
+
+Callers import this module rather than core.celery_app, so the API loads
+Celery only once it queues its first job, and the import happens here, in a
+thread, instead of at every call site.
+
+With a broker, ``enqueue`` publishes the job (``send_task``) and awaits only
+that. Without one (CELERY_ALWAYS_EAGER) the task itself runs in a thread in
+the background, so the request that queued it does not wait for it.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, Set
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Eager jobs still running (the loop only keeps weak references to tasks)
+_eager_jobs: Set[asyncio.Task] = set()
+
+
+def _send(name: str, kwargs: Dict[str, Any]) -> None:
+    # Imported here: Celery is only loaded once a job is queued
+    from core.celery_app import celery_app
+
+    celery_app.send_task(name, kwargs=kwargs)
+
+
+def _run_eager(name: str, kwargs: Dict[str, Any]) -> None:
+    from core.celery_app import celery_app
+
+    celery_app.loader.import_default_modules()  # registers services.tasks
+    celery_app.tasks[name].apply(kwargs=kwargs)
+
+
+def _eager_job_done(job: asyncio.Task) -> None:
+    _eager_jobs.discard(job)
+    if not job.cancelled() and job.exception() is not None:
+        logger.error("Background job failed", exc_info=job.exception())
+
+
+async def enqueue(name: str, **kwargs: Any) -> None:
+    """Queue the task registered as ``name`` (e.g.
+    ``services.tasks.recompute_stock_statuses``) with ``kwargs``."""
+    if not settings.celery_always_eager:
+        await asyncio.to_thread(_send, name, kwargs)
+        return
+    job = asyncio.get_running_loop().create_task(asyncio.to_thread(_run_eager, name, kwargs))
+    _eager_jobs.add(job)
+    job.add_done_callback(_eager_job_done)
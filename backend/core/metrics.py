@@ -0,0 +1,173 @@
+"""
+In-process metric primitives (counters/gauges/histograms) for the /metrics
+endpoints, and a registry that renders them in the Prometheus text format.
+
+Each worker keeps its own values; a scraper aggregates across workers.
+"""
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Seconds; tuned for DB checkouts and request latencies
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics), safe across threads."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.sum += value
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self._counts[i] += 1
+                    break
+
+    def snapshot(self) -> Dict[str, object]:
+        """Cumulative counts per upper bound, plus ``+Inf``, sum and count."""
+        with self._lock:
+            cumulative, running = {}, 0
+            for bound, count in zip(self.buckets, self._counts):
+                running += count
+                cumulative[repr(bound)] = running
+            cumulative["+Inf"] = self.count
+            return {"buckets": cumulative, "sum": self.sum, "count": self.count}
+
+
+class Counter:
+    """Monotonic counter."""
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class Gauge:
+    """Value that goes up and down (e.g. requests in flight)."""
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+_KINDS = {"counter": Counter, "gauge": Gauge, "histogram": Histogram}
+
+
+class Family:
+    """A named metric with labels; one child metric per label-value tuple."""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        kind: str,
+        labelnames: Sequence[str] = (),
+        buckets: Optional[Sequence[float]] = None,
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self._buckets = buckets
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    if self.kind == "histogram" and self._buckets is not None:
+                        child = Histogram(self._buckets)
+                    else:
+                        child = _KINDS[self.kind]()
+                    self._children[values] = child
+        return child
+
+    def attach(self, values: Tuple[str, ...], child: Any) -> None:
+        """Expose a metric object owned elsewhere (e.g. a pool's histogram)."""
+        with self._lock:
+            self._children[values] = child
+
+    def _label_text(self, values: Tuple[str, ...], extra: str = "") -> str:
+        pairs = [f'{k}="{_escape(v)}"' for k, v in zip(self.labelnames, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for values, child in sorted(self._children.items()):
+            if self.kind != "histogram":
+                yield f"{self.name}{self._label_text(values)} {_number(child.value)}"
+                continue
+            snap = child.snapshot()
+            for bound, count in snap["buckets"].items():
+                labels = self._label_text(values, f'le="{bound}"')
+                yield f"{self.name}_bucket{labels} {count}"
+            yield f"{self.name}_sum{self._label_text(values)} {_number(snap['sum'])}"
+            yield f"{self.name}_count{self._label_text(values)} {snap['count']}"
+
+
+# Refreshes gauges from live objects (pool sizes, cache counters) per scrape
+Collector = Callable[[], None]
+
+
+class Registry:
+    """Families and collectors served together in the Prometheus text format."""
+
+    def __init__(self) -> None:
+        self._families: List[Family] = []
+        self._collectors: List[Collector] = []
+
+    def family(self, *args: Any, **kwargs: Any) -> Family:
+        family = Family(*args, **kwargs)
+        self._families.append(family)
+        return family
+
+    def add_collector(self, collector: Collector) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            collector()
+        lines: List[str] = []
+        for family in self._families:
+            lines.extend(family.render())
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+REGISTRY = Registry()
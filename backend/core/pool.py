@@ -0,0 +1,61 @@
+"""
+Connection pool classes that time checkouts, and pool stats for /metrics.
+
+The wait histogram measures how long a request blocked getting a connection
+from the pool (including opening a new one when the pool may grow): near zero
+normally, growing when the pool is too small for the load or connections leak.
+"""
+import time
+from typing import Any, Dict
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from core.metrics import Histogram
+
+
+class _TimedCheckoutMixin:
+    """Records checkout wait time in ``self.wait_histogram``."""
+
+    wait_histogram: Histogram
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_histogram = Histogram()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.wait_histogram.observe(time.perf_counter() - start)
+
+    def recreate(self):
+        # Keep the histogram across pool recreation (e.g. after a disconnect)
+        new_pool = super().recreate()
+        new_pool.wait_histogram = self.wait_histogram
+        return new_pool
+
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_stats(pool) -> Dict[str, Any]:
+    """Live numbers for one engine's pool."""
+    stats: Dict[str, Any] = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+        )
+    histogram = getattr(pool, "wait_histogram", None)
+    if histogram is not None:
+        stats["checkout_wait_seconds"] = histogram.snapshot()
+    return stats
@@ -0,0 +1,127 @@
+"""
+Read replicas for read-only routes.
+
+``ReplicaSet`` holds one async engine per DATABASE_REPLICA_URLS entry and hands
+them out round-robin, skipping replicas that failed their last health check
+(``SELECT 1`` within DB_REPLICA_CHECK_TIMEOUT_SECONDS). Checks run in the
+background when a replica's last one is older than DB_REPLICA_CHECK_SECONDS,
+and right away after a request fails on it. A replica is not used until its
+first check passes.
+
+Writes always go to the primary. ``ReadYourWritesMiddleware`` sets a cookie
+on every successful write, and while it lasts (DB_READ_PRIMARY_SECONDS,
+longer than the replicas' normal lag) that client's reads also go to the
+primary, so it sees its own changes.
+"""
+import asyncio
+import itertools
+import logging
+import time
+from typing import Callable, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+READ_PRIMARY_COOKIE = "read_primary"
+_SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class Replica:
+    def __init__(self, url: str, engine: AsyncEngine) -> None:
+        self.name = make_url(url).render_as_string(hide_password=True)
+        self.engine = engine
+        self.sessionmaker = async_sessionmaker(
+            engine, autoflush=False, expire_on_commit=False
+        )
+        self.healthy = False  # until the first check passes
+        self.checked_at = float("-inf")
+        self._check: Optional[asyncio.Task] = None
+
+    def set_health(self, healthy: bool, reason: str = "") -> None:
+        if healthy != self.healthy:
+            if healthy:
+                logger.info("Read replica %s is up", self.name)
+            else:
+                logger.warning("Read replica %s is down: %s", self.name, reason)
+        self.healthy = healthy
+
+
+class ReplicaSet:
+    """Round-robin over the healthy replicas; empty without replica URLs."""
+
+    def __init__(self, urls: List[str], create_engine: Callable[[str], AsyncEngine]) -> None:
+        self.replicas = [Replica(url, create_engine(url)) for url in urls]
+        self._next = itertools.count()
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def pick(self) -> Optional[Replica]:
+        """Next healthy replica, or None (use the primary)."""
+        now = time.monotonic()
+        for replica in self.replicas:
+            if now - replica.checked_at >= settings.db_replica_check_seconds:
+                self._schedule_check(replica, now)
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[next(self._next) % len(self.replicas)]
+            if replica.healthy:
+                return replica
+        return None
+
+    def recheck(self, replica: Replica) -> None:
+        """Check ``replica`` now, e.g. after a request failed on it."""
+        self._schedule_check(replica, time.monotonic())
+
+    def _schedule_check(self, replica: Replica, now: float) -> None:
+        if replica._check is None or replica._check.done():
+            replica.checked_at = now
+            replica._check = asyncio.get_running_loop().create_task(self.check(replica))
+
+    async def check(self, replica: Replica) -> bool:
+        async def ping() -> None:
+            async with replica.engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+        try:
+            # The timeout covers connecting, which hangs on an unreachable host
+            await asyncio.wait_for(ping(), settings.db_replica_check_timeout_seconds)
+        except Exception as exc:  # any failure takes the replica out
+            replica.set_health(False, repr(exc))
+        else:
+            replica.set_health(True)
+        return replica.healthy
+
+
+def reads_own_writes(request: Request) -> bool:
+    """Whether ``request`` comes from a client that wrote recently."""
+    return READ_PRIMARY_COOKIE in request.cookies
+
+
+class ReadYourWritesMiddleware:
+    """Marks clients that just wrote, so their reads skip the replicas."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.cookie = (
+            f"{READ_PRIMARY_COOKIE}=1; Max-Age={settings.db_read_primary_seconds}; "
+            "Path=/; HttpOnly; SameSite=Lax"
+        ).encode()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in _SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                message["headers"] = [*message.get("headers", []), (b"set-cookie", self.cookie)]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
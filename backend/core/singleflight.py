@@ -0,0 +1,58 @@
+"""
+Request coalescing ("single flight") within one worker.
+
+While a call for a key is running, further calls with the same key wait for
+it and share its result (or exception) instead of running their own. Used by
+api/caching.py so that a burst of identical reads on a cache miss costs one
+query. Counts, per namespace, calls that ran (``leaders``) and calls that
+shared another's result (``coalesced``).
+"""
+import asyncio
+from collections import Counter
+from typing import Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """In-flight calls by key, for the current event loop."""
+
+    def __init__(self) -> None:
+        self._flights: Dict[Tuple[str, Hashable], asyncio.Future] = {}
+        self.leaders: Counter = Counter()
+        self.coalesced: Counter = Counter()
+
+    async def do(self, namespace: str, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """``await fn()``, unless a call for (namespace, key) is in flight."""
+        flight_key = (namespace, key)
+        joined = False
+        while flight_key in self._flights:
+            future = self._flights[flight_key]
+            if not joined:
+                self.coalesced[namespace] += 1
+                joined = True
+            try:
+                # shield: a waiter giving up must not cancel the shared call
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise  # this waiter was cancelled
+                # The running call was cancelled (its client went away): retry
+
+        future = asyncio.get_running_loop().create_future()
+        self._flights[flight_key] = future
+        self.leaders[namespace] += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # retrieved: no "never retrieved" log without waiters
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._flights[flight_key]
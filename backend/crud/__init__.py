@@ -1,6 +1,15 @@
 # CRUD package: BaseCRUD and module-specific CRUD classes
-from crud.base import BaseCRUD
+from crud.base import AsyncBaseCRUD, BaseCRUD
 from crud.product import product_crud
 from crud.material import material_crud
+from crud.order import order_crud
+from crud.audit_log import audit_log_crud
 
-__all__ = ["BaseCRUD", "product_crud", "material_crud"]
+__all__ = [
+    "BaseCRUD",
+    "AsyncBaseCRUD",
+    "product_crud",
+    "material_crud",
+    "order_crud",
+    "audit_log_crud",
+]
@@ -0,0 +1,12 @@
+"""Audit log CRUD (reads; entries are written by services/audit.py)."""
+from crud.base import AsyncBaseCRUD
+from models.database import AuditLog
+from models.schemas import AuditLogBase
+
+
+class AuditLogCRUD(AsyncBaseCRUD[AuditLog, AuditLogBase, AuditLogBase]):
+    __model__ = AuditLog
+    __audit__ = False
+
+
+audit_log_crud = AuditLogCRUD()
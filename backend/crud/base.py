@@ -2,26 +2,148 @@
 BaseCRUD: generic CRUD mixin for scaling retail modules.
 
 Usage:
-    class ProductCRUD(BaseCRUD[Product, ProductCreate, ProductUpdate]):
+    class ProductCRUD(AsyncBaseCRUD[Product, ProductCreate, ProductUpdate]):
         __model__ = Product
+        __loader_options__ = (joinedload(Product.inventory),)
     product_crud = ProductCRUD()
+
+BaseCRUD works on a sync Session (scripts, workers); AsyncBaseCRUD has the
+same methods as coroutines over an AsyncSession and is what the routers use.
+Both build their statements in CRUDQueries, so they always issue the same SQL.
 """
-from typing import Any, Generic, List, Optional, Type, TypeVar
+import base64
+import json
+import re
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Generic, List, Optional, Sequence, Tuple, Type, TypeVar
 
 from fastapi import HTTPException
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import Delete, Insert, Select, column, delete, func, insert, literal_column
+from sqlalchemy import or_, select, tuple_
+from sqlalchemy import update as sa_update
+from sqlalchemy import values
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ColumnProperty, Session, contains_eager
+
+from core.cache import Cache
+from core.config import settings
+from models.database import OutboxEvent
+from services import audit, outbox
 
 # Model = SQLAlchemy model, CreateSchema = Pydantic create, UpdateSchema = Pydantic update
 ModelT = TypeVar("ModelT")
 CreateSchemaT = TypeVar("CreateSchemaT", bound=BaseModel)
 UpdateSchemaT = TypeVar("UpdateSchemaT", bound=BaseModel)
 
+# A written row: (id, audit changes, column values after the write or, for
+# deletes, before it)
+ChangeRow = Tuple[int, Any, Dict[str, Any]]
+
+# Response header carrying the keyset cursor for the next page of a list endpoint
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+# Bind parameters per statement for the *_many helpers (Postgres allows 32767)
+MAX_BIND_PARAMS = 30000
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Pack the sort key of the last row into an opaque, URL-safe cursor."""
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
 
-class BaseCRUD(Generic[ModelT, CreateSchemaT, UpdateSchemaT]):
-    """Generic CRUD operations for any SQLAlchemy model with Pydantic schemas."""
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Unpack a cursor produced by encode_cursor, or raise 400."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except ValueError:
+        values = None
+    if not isinstance(values, list) or not values:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def _cursor_value(column: Any, value: Any) -> Any:
+    """Check a decoded cursor value against ``column``'s Python type, or raise
+    400, so a tampered cursor cannot reach the database as a mistyped
+    parameter. Dates and datetimes, which the JSON cursor carries as
+    strings, are parsed back."""
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type in (date, datetime):
+        if isinstance(value, str):
+            try:
+                return python_type.fromisoformat(value)
+            except ValueError:
+                pass
+    elif python_type is int:
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+    elif python_type in (float, Decimal):
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return value
+    elif isinstance(value, python_type):
+        return value
+    raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+class CRUDQueries(Generic[ModelT, CreateSchemaT, UpdateSchemaT]):
+    """Model config and statement builders shared by the sync and async CRUD."""
 
     __model__: Type[ModelT]
+    # Loader options (joinedload/selectinload of relationships the response
+    # schema reads) applied to every read, so serializing a page never lazy-loads
+    __loader_options__: Sequence[Any] = ()
+    # Optional cache of serialized read responses (see api/caching.py);
+    # create/update/delete invalidate it after committing
+    __cache__: Optional[Cache] = None
+    # Sortable columns of related tables: name -> (relationship, column);
+    # get_multi outer-joins the relationship when sorting by one, and rows
+    # without a related row (or with NULL there) sort last, as NULLs do in any sort
+    __sort_columns__: Dict[str, Tuple[Any, Any]] = {}
+    # Text columns matched by get_multi(search=...)
+    __search_columns__: Sequence[str] = ()
+    # Record writes in audit_logs (see services/audit.py)
+    __audit__: bool = True
+    # Publish writes to the change feed, in the same transaction (services/outbox.py)
+    __outbox__: bool = True
+
+    def _outbox_events(self, action: str, rows: List[ChangeRow]) -> List[dict]:
+        entity = self.__model__.__tablename__
+        return [outbox.event(entity, id, action, values) for id, _, values in rows]
+
+    def _row_values(self, row: Any) -> dict[str, Any]:
+        """Column values of a RETURNING row mapping."""
+        return {c.key: row[c.key] for c in self.__model__.__table__.columns}
+
+    def _updated_row(self, row: Any, patch: dict[str, Any]) -> ChangeRow:
+        """ChangeRow for a row returned by an _update_many statement."""
+        old = {k[len("old__"):]: v for k, v in row.items() if k.startswith("old__")}
+        return row["id"], audit.changed(old, patch), self._row_values(row)
+
+    def _deleted_row(self, row: Any) -> ChangeRow:
+        """ChangeRow for a row returned by a _delete_many statement."""
+        values = self._row_values(row)
+        return row["id"], audit.deleted(values), values
+
+    def item_cache_key(self, id: int) -> str:
+        return f"item:{id}"
+
+    def invalidate_cache_nowait(self, *ids: int) -> None:
+        if self.__cache__ is not None:
+            self.__cache__.invalidate_nowait(*(self.item_cache_key(i) for i in ids))
+
+    async def invalidate_cache(self, *ids: int) -> None:
+        if self.__cache__ is not None:
+            await self.__cache__.invalidate(*(self.item_cache_key(i) for i in ids))
+
+    def _snapshot(self, db_obj: ModelT) -> dict[str, Any]:
+        """Column values of a loaded row, for audit diffs."""
+        return {c.key: getattr(db_obj, c.key) for c in self.__model__.__table__.columns}
 
     def _serialize(self, schema: BaseModel, *, exclude_unset: bool = True) -> dict[str, Any]:
         """Convert Pydantic schema to dict (v1 .dict() or v2 .model_dump())."""
@@ -29,24 +151,257 @@ class BaseCRUD(Generic[ModelT, CreateSchemaT, UpdateSchemaT]):
             return schema.model_dump(exclude_unset=exclude_unset)
         return schema.dict(exclude_unset=exclude_unset)
 
+    def _select(self, join: Any = None) -> Select:
+        """Base SELECT for reads, with the CRUD's eager-loading options applied.
+
+        With ``join`` (a relationship) the related table is outer-joined and
+        loaded from that join, replacing the relationship's own loader option,
+        so a query that sorts on it joins the table only once.
+        """
+        if join is None:
+            return select(self.__model__).options(*self.__loader_options__)
+        options = [
+            option for option in self.__loader_options__
+            if list(getattr(option, "path", ()))[1:2] != [join.property]
+        ]
+        return (
+            select(self.__model__)
+            .outerjoin(join)
+            .options(contains_eager(join), *options)
+        )
+
+    def _sort_key(self, order_by: str) -> Tuple[Any, bool, Any]:
+        """Resolve ``order_by`` (a column name, ``-`` prefix for descending) to
+        ``(column, descending, join)``; 400 for anything that is not sortable."""
+        descending = order_by.startswith("-")
+        name = order_by.lstrip("-")
+        if name in self.__sort_columns__:
+            relationship, column = self.__sort_columns__[name]
+            return column, descending, relationship
+        column = getattr(self.__model__, name, None)
+        if not isinstance(getattr(column, "property", None), ColumnProperty):
+            raise HTTPException(status_code=400, detail=f"Cannot sort by {order_by!r}")
+        return column, descending, None
+
+    def _sort_value(self, item: ModelT, order_by: str) -> Any:
+        name = order_by.lstrip("-")
+        if name in self.__sort_columns__:
+            relationship, column = self.__sort_columns__[name]
+            related = getattr(item, relationship.key)
+            return getattr(related, column.key) if related is not None else None
+        return getattr(item, name)
+
+    def _search_document(self) -> Any:
+        """``coalesce(a, '') || ' ' || coalesce(b, '')`` over __search_columns__;
+        literal (not bound) constants, so it matches the expression index."""
+        parts = [
+            func.coalesce(getattr(self.__model__, name), literal_column("''"))
+            for name in self.__search_columns__
+        ]
+        document = parts[0]
+        for part in parts[1:]:
+            document = document.op("||")(literal_column("' '")).op("||")(part)
+        return document
+
+    def _filter(self, stmt: Select, key: str, value: Any) -> Select:
+        """Apply one get_multi filter: ``col=v``, ``col__gte=v`` or ``col__lte=v``.
+        Unknown columns and None values are ignored."""
+        name, _, op = key.partition("__")
+        column = getattr(self.__model__, name, None)
+        if value is None or column is None:
+            return stmt
+        if op == "gte":
+            return stmt.where(column >= value)
+        if op == "lte":
+            return stmt.where(column <= value)
+        return stmt.where(column == value) if not op else stmt
+
+    def _select_multi(
+        self,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        order_by: str = "id",
+        search: Optional[str] = None,
+        **filters: Any,
+    ) -> List[Select]:
+        """Statements behind get_multi, each limited to ``limit`` rows; run in
+        order, each with the rows still missing, until the page is full.
+
+        Without ``cursor`` this pages with OFFSET/LIMIT. With ``cursor`` (from
+        next_cursor) it seeks past the last row seen using ``(order_by, id)``,
+        so every page costs the same no matter how deep it is. NULLs sort last
+        in either direction. For a nullable column of the model itself, the
+        non-NULL rows and then the NULL rows (by id) come from two statements,
+        so both stay index ranges; a related sort column (__sort_columns__)
+        is outer-joined and ordered in one statement.
+
+        ``search`` is a case-insensitive substring match over
+        __search_columns__ (backed by a trigram index on Postgres).
+        """
+        pk = self.__model__.id
+        column, descending, join = self._sort_key(order_by)
+        stmt = self._select(join)
+        for key, value in filters.items():
+            stmt = self._filter(stmt, key, value)
+        if search and self.__search_columns__:
+            pattern = "%" + re.sub(r"([\\%_])", r"\\\1", search) + "%"
+            stmt = stmt.where(self._search_document().ilike(pattern, escape="\\"))
+        pk_order = pk.desc() if descending else pk
+        column_order = column.desc() if descending else column.asc()
+
+        def after_id(last_id: Any) -> Any:
+            return pk < last_id if descending else pk > last_id
+
+        def seek_past(value: Any, last_id: Any) -> Any:
+            seek, key = tuple_(column, pk), tuple_(_cursor_value(column, value), last_id)
+            return seek < key if descending else seek > key
+
+        key = decode_cursor(cursor) if cursor is not None else None
+        if key is not None and column is not pk and len(key) != 2:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        last_id = _cursor_value(pk, key[-1]) if key is not None else None
+
+        if column is pk:
+            if key is not None:
+                stmt = stmt.where(after_id(last_id))
+            statements = [stmt.order_by(pk_order)]
+        elif join is not None or not column.nullable:
+            if key is not None and key[0] is None and join is not None:
+                # Already among the trailing NULLs
+                stmt = stmt.where(column.is_(None), after_id(last_id))
+            elif key is not None:
+                after = seek_past(key[0], last_id)
+                stmt = stmt.where(or_(after, column.is_(None)) if join is not None else after)
+            statements = [stmt.order_by(
+                column_order.nulls_last() if join is not None else column_order, pk_order
+            )]
+        elif skip:
+            # OFFSET pages count across both parts, so they stay one statement
+            statements = [stmt.order_by(column_order.nulls_last(), pk_order)]
+        else:
+            nulls = stmt.where(column.is_(None)).order_by(pk_order)
+            if key is not None and key[0] is None:
+                statements = [nulls.where(after_id(last_id))]
+            else:
+                values = stmt.where(column.is_not(None))
+                if key is not None:
+                    values = values.where(seek_past(key[0], last_id))
+                statements = [values.order_by(column_order, pk_order), nulls]
+        if cursor is None and skip:
+            statements = [statement.offset(skip) for statement in statements]
+        return [statement.limit(limit) for statement in statements]
+
+    def _select_one(self, id: int) -> Select:
+        """Statement behind get."""
+        return self._select().where(self.__model__.id == id)
+
+    def _insert_many(self) -> Insert:
+        """INSERT returning new ids in input order; executed with a list of rows
+        it is sent as multi-row VALUES batches, not one statement per row."""
+        pk = self.__model__.id
+        return insert(self.__model__).returning(pk, sort_by_parameter_order=True)
+
+    def _update_many(self, rows: List[dict[str, Any]]) -> List[Any]:
+        """One ``UPDATE ... FROM (VALUES ...) RETURNING`` per distinct set of
+        updated fields (rows are ``{"id": ..., field: value, ...}``). Each
+        returns the updated rows plus the replaced values of those fields as
+        ``old__<field>`` (from a self-join on id)."""
+        table = self.__model__.__table__
+        old = table.alias("old")
+        groups: dict[tuple[str, ...], List[dict[str, Any]]] = {}
+        for row in rows:
+            fields = tuple(sorted(k for k in row if k != "id" and k in table.c))
+            if fields:
+                groups.setdefault(fields, []).append(row)
+        statements = []
+        for fields, group in groups.items():
+            names = ("id", *fields)
+            chunk = MAX_BIND_PARAMS // len(names)
+            for start in range(0, len(group), chunk):
+                batch = group[start:start + chunk]
+                data = values(
+                    *(column(name, table.c[name].type) for name in names),
+                    name="data",
+                ).data([tuple(row[name] for name in names) for row in batch])
+                statements.append(
+                    sa_update(table)
+                    .where(table.c.id == data.c.id, old.c.id == table.c.id)
+                    .values({name: data.c[name] for name in fields})
+                    .returning(
+                        *table.c, *(old.c[name].label(f"old__{name}") for name in fields)
+                    )
+                )
+        return statements
+
+    def _delete_many(self, ids: List[int]) -> List[Delete]:
+        """DELETEs returning the deleted rows."""
+        table = self.__model__.__table__
+        return [
+            delete(table)
+            .where(table.c.id.in_(ids[start:start + MAX_BIND_PARAMS]))
+            .returning(*table.c)
+            for start in range(0, len(ids), MAX_BIND_PARAMS)
+        ]
+
+    def next_cursor(
+        self, items: List[ModelT], *, limit: int, order_by: str = "id"
+    ) -> Optional[str]:
+        """Cursor for the page after ``items``, or None when it was the last."""
+        if not items or len(items) < limit:
+            return None
+        last = items[-1]
+        if order_by.lstrip("-") == "id":
+            return encode_cursor([last.id])
+        return encode_cursor([self._sort_value(last, order_by), last.id])
+
+
+class BaseCRUD(CRUDQueries[ModelT, CreateSchemaT, UpdateSchemaT]):
+    """Generic CRUD operations for any SQLAlchemy model with Pydantic schemas."""
+
+    def _record(self, db: Session, action: str, rows: List[ChangeRow]) -> None:
+        """Stage audit entries (waiting while the audit queue is full) and write
+        change-feed events in the current transaction. Rows without changes
+        are skipped."""
+        rows = [row for row in rows if row[1]]
+        if not rows:
+            return
+        if self.__audit__:
+            audit.audit_queue.wait_for_room(settings.audit_backpressure_seconds)
+            audit.stage(db, self.__model__.__tablename__, action, [r[:2] for r in rows])
+        if self.__outbox__:
+            db.execute(insert(OutboxEvent), self._outbox_events(action, rows))
+
     def get_multi(
         self,
         db: Session,
         *,
         skip: int = 0,
         limit: int = 100,
+        cursor: Optional[str] = None,
+        order_by: str = "id",
+        search: Optional[str] = None,
         **filters: Any,
     ) -> List[ModelT]:
-        """List records with optional pagination and filters."""
-        q = db.query(self.__model__)
-        for key, value in filters.items():
-            if value is not None and hasattr(self.__model__, key):
-                q = q.filter(getattr(self.__model__, key) == value)
-        return q.offset(skip).limit(limit).all()
+        """List records with optional pagination and filters (see _select_multi)."""
+        items: List[ModelT] = []
+        for stmt in self._select_multi(
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            order_by=order_by,
+            search=search,
+            **filters,
+        ):
+            items += db.scalars(stmt.limit(limit - len(items))).unique().all()
+            if len(items) >= limit:
+                break
+        return items
 
     def get(self, db: Session, id: int) -> Optional[ModelT]:
         """Get one record by primary key."""
-        return db.query(self.__model__).filter(self.__model__.id == id).first()
+        return db.scalars(self._select_one(id)).unique().first()
 
     def get_or_404(self, db: Session, id: int, detail: str = "Not found") -> ModelT:
         """Get one record or raise 404."""
@@ -60,8 +415,13 @@ class BaseCRUD(Generic[ModelT, CreateSchemaT, UpdateSchemaT]):
         data = self._serialize(schema, exclude_unset=False)
         db_obj = self.__model__(**data)
         db.add(db_obj)
+        db.flush()
+        self._record(
+            db, "create", [(db_obj.id, audit.created(data), self._snapshot(db_obj))]
+        )
         db.commit()
         db.refresh(db_obj)
+        self.invalidate_cache_nowait(db_obj.id)
         return db_obj
 
     def update(
@@ -75,16 +435,231 @@ class BaseCRUD(Generic[ModelT, CreateSchemaT, UpdateSchemaT]):
         """Update a record by id."""
         db_obj = self.get_or_404(db, id=id, detail=detail)
         data = self._serialize(schema)
+        old = self._snapshot(db_obj)
         for field, value in data.items():
             if hasattr(db_obj, field):
                 setattr(db_obj, field, value)
+        new = self._snapshot(db_obj)
+        self._record(db, "update", [(id, audit.changed(old, new), new)])
         db.commit()
         db.refresh(db_obj)
+        self.invalidate_cache_nowait(id)
         return db_obj
 
     def delete(self, db: Session, id: int, detail: str = "Not found") -> ModelT:
         """Delete a record by id. Returns the deleted object."""
         db_obj = self.get_or_404(db, id=id, detail=detail)
+        old = self._snapshot(db_obj)
+        self._record(db, "delete", [(id, audit.deleted(old), old)])
         db.delete(db_obj)
         db.commit()
+        self.invalidate_cache_nowait(id)
         return db_obj
+
+    def create_many(
+        self, db: Session, *, schemas: List[CreateSchemaT], commit: bool = True
+    ) -> List[int]:
+        """Insert many records in one transaction. Returns their ids, in order."""
+        if not schemas:
+            return []
+        rows = [self._serialize(s, exclude_unset=False) for s in schemas]
+        ids = list(db.scalars(self._insert_many(), rows).all())
+        self._record(db, "create", [
+            (i, audit.created(r), {"id": i, **r}) for i, r in zip(ids, rows)
+        ])
+        if commit:
+            db.commit()
+            self.invalidate_cache_nowait(*ids)
+        return ids
+
+    def update_many(
+        self, db: Session, *, rows: List[dict[str, Any]], commit: bool = True
+    ) -> List[int]:
+        """Apply ``{"id": ..., field: value}`` patches in one transaction.
+        Returns the ids that existed and were updated."""
+        patches = {row["id"]: row for row in rows}
+        ids: List[int] = []
+        changes = []
+        for stmt in self._update_many(rows):
+            for row in db.execute(stmt).mappings().all():
+                ids.append(row["id"])
+                changes.append(self._updated_row(row, patches[row["id"]]))
+        self._record(db, "update", changes)
+        if commit:
+            db.commit()
+            self.invalidate_cache_nowait(*ids)
+        return ids
+
+    def delete_many(
+        self, db: Session, *, ids: List[int], commit: bool = True
+    ) -> List[int]:
+        """Delete records by id in one statement. Returns the ids deleted."""
+        deleted: List[int] = []
+        for stmt in self._delete_many(ids):
+            rows = db.execute(stmt).mappings().all()
+            deleted.extend(row["id"] for row in rows)
+            self._record(db, "delete", [self._deleted_row(row) for row in rows])
+        if commit:
+            db.commit()
+            self.invalidate_cache_nowait(*deleted)
+        return deleted
+
+
+class AsyncBaseCRUD(CRUDQueries[ModelT, CreateSchemaT, UpdateSchemaT]):
+    """BaseCRUD over an AsyncSession, so routers await the DB instead of blocking.
+
+    Async sessions cannot lazy-load, so everything a response schema reads must
+    be covered by __loader_options__. Writes re-select the row after commit for
+    the same reason (refresh() would not load relationships).
+    """
+
+    async def _record(self, db: AsyncSession, action: str, rows: List[ChangeRow]) -> None:
+        """BaseCRUD._record over an AsyncSession."""
+        rows = [row for row in rows if row[1]]
+        if not rows:
+            return
+        if self.__audit__:
+            await audit.audit_queue.wait_for_room_async(settings.audit_backpressure_seconds)
+            audit.stage(
+                db.sync_session, self.__model__.__tablename__, action, [r[:2] for r in rows]
+            )
+        if self.__outbox__:
+            await db.execute(insert(OutboxEvent), self._outbox_events(action, rows))
+
+    async def get_multi(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        order_by: str = "id",
+        search: Optional[str] = None,
+        **filters: Any,
+    ) -> List[ModelT]:
+        """List records with optional pagination and filters (see _select_multi)."""
+        items: List[ModelT] = []
+        for stmt in self._select_multi(
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            order_by=order_by,
+            search=search,
+            **filters,
+        ):
+            items += (await db.scalars(stmt.limit(limit - len(items)))).unique().all()
+            if len(items) >= limit:
+                break
+        return items
+
+    async def get(self, db: AsyncSession, id: int) -> Optional[ModelT]:
+        """Get one record by primary key."""
+        return (await db.scalars(self._select_one(id))).unique().first()
+
+    async def get_or_404(
+        self, db: AsyncSession, id: int, detail: str = "Not found"
+    ) -> ModelT:
+        """Get one record or raise 404."""
+        obj = await self.get(db, id=id)
+        if obj is None:
+            raise HTTPException(status_code=404, detail=detail)
+        return obj
+
+    async def _reload(self, db: AsyncSession, id: int) -> ModelT:
+        """Re-read a row just written, with loader options, overwriting stale state."""
+        stmt = self._select_one(id).execution_options(populate_existing=True)
+        return (await db.scalars(stmt)).unique().one()
+
+    async def create(self, db: AsyncSession, *, schema: CreateSchemaT) -> ModelT:
+        """Create a new record."""
+        data = self._serialize(schema, exclude_unset=False)
+        db_obj = self.__model__(**data)
+        db.add(db_obj)
+        await db.flush()
+        await self._record(
+            db, "create", [(db_obj.id, audit.created(data), self._snapshot(db_obj))]
+        )
+        await db.commit()
+        await self.invalidate_cache(db_obj.id)
+        return await self._reload(db, db_obj.id)
+
+    async def update(
+        self,
+        db: AsyncSession,
+        id: int,
+        *,
+        schema: UpdateSchemaT,
+        detail: str = "Not found",
+    ) -> ModelT:
+        """Update a record by id."""
+        db_obj = await self.get_or_404(db, id=id, detail=detail)
+        data = self._serialize(schema)
+        old = self._snapshot(db_obj)
+        for field, value in data.items():
+            if hasattr(db_obj, field):
+                setattr(db_obj, field, value)
+        new = self._snapshot(db_obj)
+        await self._record(db, "update", [(id, audit.changed(old, new), new)])
+        await db.commit()
+        await self.invalidate_cache(id)
+        return await self._reload(db, id)
+
+    async def delete(
+        self, db: AsyncSession, id: int, detail: str = "Not found"
+    ) -> ModelT:
+        """Delete a record by id. Returns the deleted object."""
+        db_obj = await self.get_or_404(db, id=id, detail=detail)
+        old = self._snapshot(db_obj)
+        await self._record(db, "delete", [(id, audit.deleted(old), old)])
+        await db.delete(db_obj)
+        await db.commit()
+        await self.invalidate_cache(id)
+        return db_obj
+
+    async def create_many(
+        self, db: AsyncSession, *, schemas: List[CreateSchemaT], commit: bool = True
+    ) -> List[int]:
+        """Insert many records in one transaction. Returns their ids, in order."""
+        if not schemas:
+            return []
+        rows = [self._serialize(s, exclude_unset=False) for s in schemas]
+        ids = list((await db.scalars(self._insert_many(), rows)).all())
+        await self._record(db, "create", [
+            (i, audit.created(r), {"id": i, **r}) for i, r in zip(ids, rows)
+        ])
+        if commit:
+            await db.commit()
+            await self.invalidate_cache(*ids)
+        return ids
+
+    async def update_many(
+        self, db: AsyncSession, *, rows: List[dict[str, Any]], commit: bool = True
+    ) -> List[int]:
+        """Apply ``{"id": ..., field: value}`` patches in one transaction.
+        Returns the ids that existed and were updated."""
+        patches = {row["id"]: row for row in rows}
+        ids: List[int] = []
+        changes = []
+        for stmt in self._update_many(rows):
+            for row in (await db.execute(stmt)).mappings().all():
+                ids.append(row["id"])
+                changes.append(self._updated_row(row, patches[row["id"]]))
+        await self._record(db, "update", changes)
+        if commit:
+            await db.commit()
+            await self.invalidate_cache(*ids)
+        return ids
+
+    async def delete_many(
+        self, db: AsyncSession, *, ids: List[int], commit: bool = True
+    ) -> List[int]:
+        """Delete records by id in one statement. Returns the ids deleted."""
+        deleted: List[int] = []
+        for stmt in self._delete_many(ids):
+            rows = (await db.execute(stmt)).mappings().all()
+            deleted.extend(row["id"] for row in rows)
+            await self._record(db, "delete", [self._deleted_row(row) for row in rows])
+        if commit:
+            await db.commit()
+            await self.invalidate_cache(*deleted)
+        return deleted
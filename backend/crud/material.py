@@ -1,11 +1,33 @@
-"""Material CRUD using BaseCRUD pattern."""
-from crud.base import BaseCRUD
+"""Material CRUD using BaseCRUD pattern (async flavour)."""
+from core.cache import make_cache
+from core.config import settings
+from core.jobs import enqueue
+from crud.base import AsyncBaseCRUD
 from models.database import Material
 from models.schemas import MaterialCreate, MaterialUpdate
+from services.bom import bom_engine
 
 
-class MaterialCRUD(BaseCRUD[Material, MaterialCreate, MaterialUpdate]):
+class MaterialCRUD(AsyncBaseCRUD[Material, MaterialCreate, MaterialUpdate]):
     __model__ = Material
+    __cache__ = make_cache(
+        "materials",
+        maxsize=settings.response_cache_size,
+        ttl=settings.response_cache_ttl_seconds,
+    )
+
+    # Every write path (single, bulk, import) invalidates through these, so
+    # they also mark the materials for the BOM engine; async writes also queue
+    # a status recompute (the periodic sweep covers sync writers)
+    def invalidate_cache_nowait(self, *ids: int) -> None:
+        bom_engine.mark_materials(ids)
+        super().invalidate_cache_nowait(*ids)
+
+    async def invalidate_cache(self, *ids: int) -> None:
+        bom_engine.mark_materials(ids)
+        await super().invalidate_cache(*ids)
+        if ids:
+            await enqueue("services.tasks.recompute_stock_statuses", material_ids=list(ids))
 
 
 material_crud = MaterialCRUD()
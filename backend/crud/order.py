@@ -0,0 +1,15 @@
+"""Order CRUD (reads; orders are placed through services/orders.py)."""
+from sqlalchemy.orm import selectinload
+
+from crud.base import AsyncBaseCRUD
+from models.database import Order
+from models.schemas import OrderCreate
+
+
+class OrderCRUD(AsyncBaseCRUD[Order, OrderCreate, OrderCreate]):
+    __model__ = Order
+    # OrderWithDetails reads .order_details (one-to-many): one extra IN query
+    __loader_options__ = (selectinload(Order.order_details),)
+
+
+order_crud = OrderCRUD()
@@ -1,11 +1,25 @@
-"""Product CRUD using BaseCRUD pattern."""
-from crud.base import BaseCRUD
-from models.database import Product
+"""Product CRUD using BaseCRUD pattern (async flavour)."""
+from sqlalchemy.orm import joinedload
+
+from core.cache import make_cache
+from core.config import settings
+from crud.base import AsyncBaseCRUD
+from models.database import Inventory, Product
 from models.schemas import ProductCreate, ProductUpdate
 
 
-class ProductCRUD(BaseCRUD[Product, ProductCreate, ProductUpdate]):
+class ProductCRUD(AsyncBaseCRUD[Product, ProductCreate, ProductUpdate]):
     __model__ = Product
+    __cache__ = make_cache(
+        "products",
+        maxsize=settings.response_cache_size,
+        ttl=settings.response_cache_ttl_seconds,
+    )
+    # ProductWithInventory reads .inventory (one-to-one), so join it in the same query
+    __loader_options__ = (joinedload(Product.inventory),)
+    __sort_columns__ = {"stock": (Product.inventory, Inventory.stock)}
+    # Trigram-indexed (ix_products_search_trgm); keep in sync with that migration
+    __search_columns__ = ("name", "description")
 
 
 # Singleton instance for dependency injection and direct use
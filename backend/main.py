@@ -14,23 +14,31 @@ OpenAPI:   /api/openapi.json
 import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from alembic import command
-from alembic.config import Config
-from pathlib import Path
-import os
 
 from core.config import settings
-from models.database import Base
-from api import auth, materials, products
-
-def run_migrations():
-    cfg = Config(str(Path(__file__).with_name("alembic.ini")))
-    cfg.set_main_option("sqlalchemy.url", settings.database_url)
-    cfg.set_main_option("script_location", str(Path(__file__).with_name("alembic")))
-    command.upgrade(cfg, "head")
+from core.instrumentation import MetricsMiddleware
+from core.replicas import ReadYourWritesMiddleware
+from crud.base import NEXT_CURSOR_HEADER
+from models.database import Base, replicas
+from api import (
+    audit_logs,
+    auth,
+    bom,
+    changes,
+    exports,
+    materials,
+    media,
+    metrics,
+    orders,
+    products,
+    reports,
+    shopee,
+)
+from services.audit import audit_queue
+from services.hashing import hash_pool
+from services.images import image_pool
 
-if os.getenv("RUN_MIGRATIONS_AT_STARTUP", "false").lower() != "false":
-    run_migrations()
+# Migrations are not run here (every worker would race); see migrate.py
 
 app = FastAPI(
     title=settings.project_name,
@@ -53,12 +61,54 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
     allow_origin_regex=_origin_regex,
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
+# Only needed to steer readers away from replicas after they write
+if replicas:
+    app.add_middleware(ReadYourWritesMiddleware)
+# Outermost, so latency includes the other middleware
+app.add_middleware(MetricsMiddleware)
 
 # API v1 routers under /api
 app.include_router(products.router, prefix=settings.api_v1_prefix)
 app.include_router(materials.router, prefix=settings.api_v1_prefix)
+app.include_router(orders.router, prefix=settings.api_v1_prefix)
+app.include_router(bom.router, prefix=settings.api_v1_prefix)
 app.include_router(auth.router, prefix=settings.api_v1_prefix)
+app.include_router(exports.router, prefix=settings.api_v1_prefix)
+app.include_router(reports.router, prefix=settings.api_v1_prefix)
+app.include_router(audit_logs.router, prefix=settings.api_v1_prefix)
+app.include_router(changes.router, prefix=settings.api_v1_prefix)
+app.include_router(shopee.router, prefix=settings.api_v1_prefix)
+app.include_router(metrics.router, prefix=settings.api_v1_prefix)
+
+
+# Uploaded product images
+os.makedirs(settings.image_dir, exist_ok=True)
+app.mount(
+    f"{settings.api_v1_prefix}/media/images",
+    media.ImmutableFiles(directory=settings.image_dir),
+    name="images",
+)
+
+# Prometheus scrape target: outside /api, so the proxy does not expose it, and
+# without auth (/api/metrics requires a Bearer token)
+app.add_api_route("/metrics", metrics.prometheus_metrics, include_in_schema=False)
+
+
+@app.on_event("shutdown")
+def shutdown_hash_pool():
+    hash_pool.shutdown()
+
+
+@app.on_event("shutdown")
+def shutdown_image_pool():
+    image_pool.shutdown()
+
+
+@app.on_event("shutdown")
+def flush_audit_queue():
+    audit_queue.close()
 
 
 @app.get("/")
@@ -0,0 +1,48 @@
+"""
+One-shot schema migration, run once per deploy before the API workers start:
+
+    python -m migrate            # alembic upgrade head
+    python -m migrate <revision>
+
+Holds a Postgres advisory lock for the whole upgrade, so when several
+containers start together one migrates and the others wait, then find the
+schema at head and do nothing. Alembic is imported only here, never by the
+app itself.
+"""
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+
+from core.config import settings
+
+# pg_advisory_lock key serializing migrations
+MIGRATION_LOCK = 0x7B5A3E16
+
+_HERE = Path(__file__).parent
+
+
+def upgrade(revision: str = "head") -> None:
+    from alembic import command
+    from alembic.config import Config
+
+    cfg = Config(str(_HERE / "alembic.ini"))
+    cfg.set_main_option("script_location", str(_HERE / "alembic"))
+    engine = create_engine(settings.database_url, poolclass=NullPool)
+    with engine.connect() as connection:
+        # Session-level: held across the transactions alembic runs
+        connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK})
+        connection.commit()
+        try:
+            cfg.attributes["connection"] = connection
+            command.upgrade(cfg, revision)
+        finally:
+            connection.rollback()
+            connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK})
+            connection.commit()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    upgrade(*sys.argv[1:2])
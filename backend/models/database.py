@@ -1,15 +1,84 @@
+import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from core.config import settings
+from core.instrumentation import instrument_engine
+from core.pool import TimedAsyncQueuePool, TimedQueuePool
+from core.replicas import ReplicaSet
+from services.image_urls import variant_urls
 
 DATABASE_URL = settings.database_url
-engine = create_engine(DATABASE_URL)
+_POOL_OPTIONS = dict(
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=settings.db_pool_pre_ping,
+)
+# asyncpg prepares every statement; PgBouncer (transaction mode) can hand the
+# next transaction a different server connection, so disable the caches and
+# use unique names for the statements it still prepares
+_ASYNC_CONNECT_ARGS = (
+    {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+    }
+    if settings.db_pgbouncer
+    else {}
+)
+
+engine = create_engine(DATABASE_URL, poolclass=TimedQueuePool, **_POOL_OPTIONS)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Async engine for the routers; expire_on_commit=False because expired
+# attributes would need a lazy (blocking) refresh after every commit
+async_engine = create_async_engine(
+    settings.async_database_url,
+    poolclass=TimedAsyncQueuePool,
+    connect_args=_ASYNC_CONNECT_ARGS,
+    **_POOL_OPTIONS,
+)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
+
+def _replica_engine(url: str):
+    replica = create_async_engine(
+        url.replace("postgresql://", "postgresql+asyncpg://", 1),
+        poolclass=TimedAsyncQueuePool,
+        connect_args=_ASYNC_CONNECT_ARGS,
+        **_POOL_OPTIONS,
+    )
+    instrument_engine(replica.sync_engine)
+    return replica
+
+
+# Read-only routes use these through core.deps.get_read_db
+replicas = ReplicaSet(settings.database_replica_urls, _replica_engine)
+
+# Per-request statement counts/time and the slow query log
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
 Base = declarative_base()
 
 
@@ -47,6 +116,13 @@ class ProductMaterial(Base):
 
 class Product(Base):
     __tablename__ = "products"
+    # (column, id) so filtered/sorted pages and keyset cursors walk one index;
+    # the trigram index for search is expression-based (see its migration)
+    __table_args__ = (
+        Index("ix_products_category_id", "category", "id"),
+        Index("ix_products_price_id", "price", "id"),
+        Index("ix_products_name_id", "name", "id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String)
     description = Column(Text)
@@ -55,14 +131,23 @@ class Product(Base):
     cost = Column(Float)
     image = Column(String)
     shopee_link = Column(String)
+    # Uploaded image (services/images.py): content hash and stored widths
+    image_key = Column(String(64))
+    image_widths = Column(ARRAY(Integer))
 
     product_materials = relationship("ProductMaterial", back_populates="product")
     inventory = relationship("Inventory", back_populates="product", uselist=False)
     order_details = relationship("OrderDetail", back_populates="product")
 
+    @property
+    def image_variants(self):
+        """Per-width URLs of the uploaded image; empty once ``image`` is replaced."""
+        return variant_urls(self.image_key, self.image_widths, self.image)
+
 
 class Inventory(Base):
     __tablename__ = "inventory"
+    __table_args__ = (Index("ix_inventory_stock_product_id", "stock", "product_id"),)
     id = Column(Integer, primary_key=True, index=True)
     product_id = Column(Integer, ForeignKey("products.id"), unique=True, index=True)
     status = Column(String) # For Enum: In Stock, Sold Out, Low Stock
@@ -98,7 +183,7 @@ class Order(Base):
     __tablename__ = "orders"
     id = Column(Integer, primary_key=True, index=True)
     date = Column(DateTime, default=datetime.utcnow)
-    distributor_detail_id = Column(Integer, ForeignKey("distributor_details.id"))
+    distributor_detail_id = Column(Integer, ForeignKey("distributor_details.id"), index=True)
     total_price = Column(Float)
 
     distributor_detail = relationship("DistributorDetail", back_populates="orders")
@@ -109,8 +194,10 @@ class Order(Base):
 class OrderDetail(Base):
     __tablename__ = "order_details"
     id = Column(Integer, primary_key=True, index=True)
-    order_id = Column(Integer, ForeignKey("orders.id"))
-    product_id = Column(Integer, ForeignKey("products.id"))
+    # Indexed: order lines are loaded by order_id, and deleting an order or
+    # product checks these foreign keys
+    order_id = Column(Integer, ForeignKey("orders.id"), index=True)
+    product_id = Column(Integer, ForeignKey("products.id"), index=True)
     quantity = Column(Integer)
     price = Column(Float)
 
@@ -122,7 +209,7 @@ class Payment(Base):
     __tablename__ = "payments"
     id = Column(Integer, primary_key=True, index=True)
     date = Column(DateTime, default=datetime.utcnow)
-    order_id = Column(Integer, ForeignKey("orders.id"))
+    order_id = Column(Integer, ForeignKey("orders.id"), index=True)
     method = Column(String)
     status = Column(String)
     amount = Column(Float)
@@ -133,6 +220,14 @@ class Payment(Base):
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
+    # GET /audit-logs: one entity's history, or everything, newest first
+    __table_args__ = (
+        Index(
+            "ix_audit_logs_entity_entity_id_timestamp",
+            "entity", "entity_id", "timestamp", "id",
+        ),
+        Index("ix_audit_logs_timestamp_id", "timestamp", "id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     entity = Column(String)
     entity_id = Column(Integer)
@@ -140,3 +235,76 @@ class AuditLog(Base):
     changed_by = Column(String)
     timestamp = Column(DateTime, default=datetime.utcnow)
     details = Column(Text)
+
+
+# Last price / stock pushed to each product's Shopee listing (see
+# services/shopee_sync.py)
+class ShopeeListing(Base):
+    __tablename__ = "shopee_listings"
+    product_id = Column(
+        Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True
+    )
+    item_id = Column(BigInteger)
+    synced_price = Column(Float)
+    synced_stock = Column(Integer)
+    synced_at = Column(DateTime)
+    last_error = Column(Text)  # set while the last push failed
+
+
+# Change feed (see services/outbox.py). Writers insert events in the same
+# transaction as the change; ``seq`` is assigned after commit, in commit order.
+class OutboxEvent(Base):
+    __tablename__ = "outbox"
+    __table_args__ = (
+        Index("ix_outbox_seq", "seq", unique=True),
+        Index("ix_outbox_entity_seq", "entity", "seq"),
+        Index("ix_outbox_unsequenced", "id", postgresql_where=text("seq IS NULL")),
+    )
+    id = Column(BigInteger, primary_key=True)
+    seq = Column(BigInteger)
+    entity = Column(String, nullable=False)  # table name, e.g. products
+    entity_id = Column(Integer, nullable=False)  # inventory: the product_id
+    action = Column(String, nullable=False)  # create, update or delete
+    payload = Column(Text)  # JSON row after the change (before, for delete)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+# Reporting summaries (see services/reports.py). Database triggers on orders,
+# order_details and payments append signed deltas to report_deltas; they are
+# folded into the daily tables periodically and before each report read.
+class ReportDelta(Base):
+    __tablename__ = "report_deltas"
+    id = Column(BigInteger, primary_key=True)
+    report = Column(String, nullable=False)  # product, channel or payment_status
+    day = Column(Date, nullable=False)
+    key = Column(String, nullable=False)  # product id, channel or payment status
+    count = Column(Integer, nullable=False, default=0)
+    quantity = Column(Integer, nullable=False, default=0)
+    amount = Column(Float, nullable=False, default=0)
+
+
+class DailyProductRevenue(Base):
+    __tablename__ = "revenue_daily_product"
+    __table_args__ = (
+        Index("ix_revenue_daily_product_product_id_day", "product_id", "day"),
+    )
+    day = Column(Date, primary_key=True)
+    product_id = Column(Integer, primary_key=True)
+    quantity = Column(BigInteger, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
+
+
+class DailyChannelRevenue(Base):
+    __tablename__ = "revenue_daily_channel"
+    day = Column(Date, primary_key=True)
+    channel = Column(String, primary_key=True)
+    orders = Column(BigInteger, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
+
+
+class DailyPaymentStatus(Base):
+    __tablename__ = "payments_daily_status"
+    day = Column(Date, primary_key=True)
+    status = Column(String, primary_key=True)
+    payments = Column(BigInteger, nullable=False, default=0)
+    amount = Column(Float, nullable=False, default=0)
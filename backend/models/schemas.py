@@ -1,6 +1,6 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional
-from datetime import datetime
+from pydantic import BaseModel, EmailStr, Field
+from typing import Any, Dict, List, Optional
+from datetime import date, datetime
 
 
 # User schemas
@@ -49,6 +49,10 @@ class MaterialCreate(BaseModel):
     price: float
 
 
+class MaterialImportRow(MaterialCreate):
+    """A row of a material import file without ``id``: a new material."""
+
+
 class MaterialUpdate(BaseModel):
     name: Optional[str] = None
     unit: Optional[str] = None
@@ -58,6 +62,11 @@ class MaterialUpdate(BaseModel):
     price: Optional[float] = None
 
 
+class MaterialImportUpdateRow(MaterialUpdate):
+    """A row of a material import file with ``id``: updates the fields it gives."""
+    id: int
+
+
 class ProductMaterialBase(BaseModel):
     id: int
     material_id: int
@@ -68,6 +77,35 @@ class ProductMaterialBase(BaseModel):
         from_attributes = True
 
 
+# Bill of materials (GET /bom): per-product cost / buildable units from
+# ProductMaterial, plus materials below their min_stock_level
+class BomProductRow(BaseModel):
+    product_id: int
+    material_cost: float
+    buildable: int  # whole units the current material stock allows
+    low_stock_material_ids: List[int] = []
+
+
+class LowStockMaterial(BaseModel):
+    id: int
+    name: str
+    unit: str
+    quantity: int
+    min_stock_level: int
+
+
+class BomReport(BaseModel):
+    products: List[BomProductRow]
+    low_stock_materials: List[LowStockMaterial]
+
+
+class ImageVariant(BaseModel):
+    """One width of an uploaded product image, in each format."""
+    width: int
+    avif: str
+    webp: str
+
+
 class ProductBase(BaseModel):
     id: int
     name: str
@@ -77,6 +115,8 @@ class ProductBase(BaseModel):
     cost: float
     image: str
     shopee_link: Optional[str] = None
+    # Smallest first; empty unless the image was uploaded (POST /products/{id}/image)
+    image_variants: List[ImageVariant] = []
 
     class Config:
         from_attributes = True
@@ -106,6 +146,12 @@ class ProductCreate(BaseModel):
     shopee_link: Optional[str] = None
 
 
+class ProductImportRow(ProductCreate):
+    """A row of a product import file without ``id``: a new product."""
+    stock: Optional[int] = None
+    inventory_status: Optional[str] = None
+
+
 class ProductUpdate(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
@@ -116,6 +162,20 @@ class ProductUpdate(BaseModel):
     shopee_link: Optional[str] = None
 
 
+class ProductImportUpdateRow(ProductUpdate):
+    """A row of a product import file with ``id``: updates the fields it gives."""
+    id: int
+    stock: Optional[int] = None
+    inventory_status: Optional[str] = None
+
+
+class ProductImageUpdate(BaseModel):
+    """What an image upload writes to the product (services/images.py)."""
+    image: str
+    image_key: str
+    image_widths: List[int]
+
+
 # Distributor schemas
 class DistributorBase(BaseModel):
     id: int
@@ -160,6 +220,20 @@ class OrderDetailBase(BaseModel):
         from_attributes = True
 
 
+class OrderLineCreate(BaseModel):
+    product_id: int
+    quantity: int = Field(gt=0)
+
+
+class OrderCreate(BaseModel):
+    distributor_detail_id: int
+    items: List[OrderLineCreate] = Field(min_length=1)
+
+
+class OrderWithDetails(OrderBase):
+    order_details: List[OrderDetailBase] = []
+
+
 class PaymentBase(BaseModel):
     id: int
     date: datetime
@@ -185,3 +259,98 @@ class AuditLogBase(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+# Change feed (GET /changes): outbox events in feed order
+class ChangeEvent(BaseModel):
+    seq: int
+    entity: str
+    entity_id: int
+    action: str
+    payload: Optional[Dict[str, Any]] = None  # row after the change (before, for delete)
+    created_at: datetime
+
+
+class ChangeFeedPage(BaseModel):
+    changes: List[ChangeEvent]
+    last_seq: int  # pass as ``after`` to continue
+
+
+# Shopee sync state (GET /shopee/listings), one row per linked product
+class ShopeeListingBase(BaseModel):
+    product_id: int
+    item_id: Optional[int] = None
+    synced_price: Optional[float] = None
+    synced_stock: Optional[int] = None
+    synced_at: Optional[datetime] = None
+    last_error: Optional[str] = None  # set while the last push failed
+
+    class Config:
+        from_attributes = True
+
+
+# Report rows (GET /reports/...), one per day and key
+class DailyProductRevenueRow(BaseModel):
+    day: date
+    product_id: int
+    quantity: int
+    revenue: float
+
+    class Config:
+        from_attributes = True
+
+
+class DailyChannelRevenueRow(BaseModel):
+    day: date
+    channel: str
+    orders: int
+    revenue: float
+
+    class Config:
+        from_attributes = True
+
+
+class DailyPaymentStatusRow(BaseModel):
+    day: date
+    status: str
+    payments: int
+    amount: float
+
+    class Config:
+        from_attributes = True
+
+
+# Bulk write schemas (POST /<module>/bulk). Rows are validated one by one so a
+# bad row is reported by position instead of rejecting the whole request.
+class BulkWriteRequest(BaseModel):
+    create: List[Dict[str, Any]] = []
+    update: List[Dict[str, Any]] = []  # each row: {"id": ..., <fields to change>}
+    delete: List[int] = []
+
+
+class BulkRowError(BaseModel):
+    op: str  # create, update or delete
+    index: int  # position of the row in that list
+    detail: Any
+
+
+class BulkWriteResult(BaseModel):
+    created: List[int] = []
+    updated: List[int] = []
+    deleted: List[int] = []
+    errors: List[BulkRowError] = []
+
+
+# Import (POST /<module>/import) results
+class ImportRowError(BaseModel):
+    row: int  # 1-based data row / line in the uploaded file
+    detail: Any
+
+
+class ImportResult(BaseModel):
+    inserted: int = 0
+    updated: int = 0
+    error_count: int = 0
+    errors: List[ImportRowError] = []  # first 100 only; see error_count
+    inserted_ids: List[int] = Field(default=[], exclude=True)
+    updated_ids: List[int] = Field(default=[], exclude=True)
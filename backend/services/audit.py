@@ -0,0 +1,184 @@
+"""
+Audit trail: CRUD writes -> in-process queue -> batched INSERTs into audit_logs.
+
+BaseCRUD / AsyncBaseCRUD stage one entry per written row (``details`` is a
+JSON object of field -> {"old", "new"}) on the session. Staged entries are
+queued when that transaction commits and dropped on rollback, so the write
+itself costs no extra round trip. A flusher thread inserts the queue in
+batches of AUDIT_BATCH_SIZE, or whatever accumulated after
+AUDIT_FLUSH_SECONDS.
+
+The queue is bounded (AUDIT_QUEUE_SIZE). When it is full, writers wait up to
+AUDIT_BACKPRESSURE_SECONDS for the flusher to make room before writing;
+entries that still do not fit are dropped and counted. The app flushes what
+is left on shutdown (and at interpreter exit for scripts and workers).
+"""
+import asyncio
+import atexit
+import json
+import logging
+import threading
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from models.database import AuditLog, SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Who is writing; set by get_current_user, "system" for scripts and workers
+audit_actor: ContextVar[str] = ContextVar("audit_actor", default="system")
+
+Changes = Dict[str, Dict[str, Any]]
+
+
+def created(values: Dict[str, Any]) -> Changes:
+    return {k: {"old": None, "new": v} for k, v in values.items() if k != "id"}
+
+
+def changed(old: Dict[str, Any], new: Dict[str, Any]) -> Changes:
+    """Fields of ``new`` whose value differs from ``old``."""
+    return {
+        k: {"old": old.get(k), "new": v}
+        for k, v in new.items()
+        if k != "id" and old.get(k) != v
+    }
+
+
+def deleted(values: Dict[str, Any]) -> Changes:
+    return {k: {"old": v, "new": None} for k, v in values.items() if k != "id"}
+
+
+def stage(
+    session: Session, entity: str, action: str, rows: Iterable[Tuple[int, Changes]]
+) -> None:
+    """Record ``(entity_id, changes)`` rows, to be queued if ``session`` commits.
+
+    Rows without changes (e.g. an update to the same values) are skipped.
+    """
+    actor = audit_actor.get()
+    now = datetime.utcnow()
+    entries = [
+        {
+            "entity": entity,
+            "entity_id": entity_id,
+            "action": action,
+            "changed_by": actor,
+            "timestamp": now,
+            "details": json.dumps(changes, default=str),
+        }
+        for entity_id, changes in rows
+        if changes
+    ]
+    if entries:
+        session.info.setdefault("audit", []).extend(entries)
+
+
+class AuditQueue:
+    """Bounded buffer of audit entries drained by one flusher thread."""
+
+    def __init__(self, maxsize: int, batch_size: int, flush_interval: float) -> None:
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self._entries: Deque[dict] = deque()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def put(self, entries: List[dict]) -> None:
+        """Queue ``entries`` without blocking; what does not fit is dropped."""
+        with self._cond:
+            room = self.maxsize - len(self._entries)
+            if len(entries) > room:
+                self.dropped += len(entries) - max(room, 0)
+                logger.warning(
+                    "Audit queue full, dropped %d entries", len(entries) - max(room, 0)
+                )
+                entries = entries[:max(room, 0)]
+            self._entries.extend(entries)
+            if len(self._entries) >= self.batch_size:
+                self._cond.notify_all()
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(
+                    target=self._run, name="audit-flusher", daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.close)
+
+    def wait_for_room(self, timeout: float) -> bool:
+        """Block until the queue is below its bound (False on timeout)."""
+        with self._cond:
+            return self._cond.wait_for(lambda: len(self._entries) < self.maxsize, timeout)
+
+    async def wait_for_room_async(self, timeout: float) -> bool:
+        if len(self._entries) < self.maxsize:
+            return True
+        return await asyncio.to_thread(self.wait_for_room, timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Write what is queued and stop the flusher thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._closed or len(self._entries) >= self.batch_size,
+                    self.flush_interval,
+                )
+                count = min(self.batch_size, len(self._entries))
+                batch = [self._entries.popleft() for _ in range(count)]
+                closing = self._closed
+                # Writers waiting for room can go on
+                self._cond.notify_all()
+            if batch:
+                self._write(batch)
+            elif closing:
+                return
+
+    def _write(self, batch: List[dict]) -> None:
+        try:
+            with SessionLocal() as db:
+                db.execute(insert(AuditLog), batch)
+                db.commit()
+        except Exception:
+            self.failed += len(batch)
+            logger.exception("Failed to write %d audit entries", len(batch))
+        else:
+            self.written += len(batch)
+
+
+audit_queue = AuditQueue(
+    maxsize=settings.audit_queue_size,
+    batch_size=settings.audit_batch_size,
+    flush_interval=settings.audit_flush_seconds,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _queue_staged(session: Session) -> None:
+    entries = session.info.pop("audit", None)
+    if entries:
+        audit_queue.put(entries)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_staged(session: Session) -> None:
+    session.info.pop("audit", None)
@@ -0,0 +1,208 @@
+"""
+Bill-of-materials engine: material cost and buildable units per product.
+
+One grouped query over product_materials x materials computes, for every
+product with a BOM, its material cost (sum of qty x price) and how many
+units the current material stock can build (min of stock // qty), plus the
+materials below min_stock_level. The result is kept in memory per worker.
+Writes mark materials/products dirty (ORM events and the material CRUD's
+cache invalidation, which also covers bulk writes and imports); the next
+read recomputes only the products that use them, in one query. A full
+recompute happens after BOM_CACHE_TTL_SECONDS, which also bounds how long a
+worker misses changes made by other workers.
+"""
+import asyncio
+import time
+from typing import Dict, Iterable, Optional, Set
+
+from sqlalchemy import bindparam, event, inspect, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from core.config import settings
+from models.database import Material, ProductMaterial
+from models.schemas import BomProductRow, BomReport, LowStockMaterial
+
+BOM_SQL = """
+SELECT pm.product_id,
+       sum(coalesce(pm.quantity, 0) * coalesce(m.price, 0)) AS material_cost,
+       coalesce(min(greatest(m.quantity, 0) / pm.quantity)
+                FILTER (WHERE pm.quantity > 0), 0) AS buildable,
+       coalesce(array_agg(DISTINCT m.id)
+                FILTER (WHERE m.quantity < m.min_stock_level), '{{}}') AS low_stock
+FROM product_materials pm
+JOIN materials m ON m.id = pm.material_id
+WHERE pm.product_id IS NOT NULL {where}
+GROUP BY pm.product_id
+"""
+
+LOW_STOCK_SQL = """
+SELECT id, name, unit, quantity, min_stock_level
+FROM materials
+WHERE quantity < min_stock_level {where}
+"""
+
+_ALL_PRODUCTS = text(BOM_SQL.format(where=""))
+_SOME_PRODUCTS = text(
+    BOM_SQL.format(where="AND pm.product_id IN :ids")
+).bindparams(bindparam("ids", expanding=True))
+_PRODUCTS_USING = text(
+    "SELECT DISTINCT product_id FROM product_materials WHERE material_id IN :ids"
+).bindparams(bindparam("ids", expanding=True))
+_ALL_LOW_STOCK = text(LOW_STOCK_SQL.format(where=""))
+_SOME_LOW_STOCK = text(
+    LOW_STOCK_SQL.format(where="AND id IN :ids")
+).bindparams(bindparam("ids", expanding=True))
+
+
+def _product_row(row) -> BomProductRow:
+    return BomProductRow(
+        product_id=row.product_id,
+        material_cost=row.material_cost,
+        buildable=row.buildable,
+        low_stock_material_ids=sorted(row.low_stock),
+    )
+
+
+class BomEngine:
+    """Worker-local BOM results with dirty tracking."""
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self._products: Dict[int, BomProductRow] = {}
+        self._low_stock: Dict[int, LowStockMaterial] = {}
+        self._dirty_products: Set[int] = set()
+        self._dirty_materials: Set[int] = set()
+        self._computed_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self.full_refreshes = 0
+        self.partial_refreshes = 0
+
+    def mark_materials(self, ids: Iterable[int]) -> None:
+        self._dirty_materials.update(i for i in ids if i is not None)
+
+    def mark_products(self, ids: Iterable[int]) -> None:
+        self._dirty_products.update(i for i in ids if i is not None)
+
+    def reset(self) -> None:
+        """Force a full recompute on the next read."""
+        self._computed_at = None
+
+    async def report(self, db: AsyncSession) -> BomReport:
+        """Results for the whole catalog."""
+        await self._refresh(db)
+        return BomReport(
+            products=[self._products[k] for k in sorted(self._products)],
+            low_stock_materials=[self._low_stock[k] for k in sorted(self._low_stock)],
+        )
+
+    async def product(self, db: AsyncSession, product_id: int) -> Optional[BomProductRow]:
+        """Results for one product, or None if it has no BOM."""
+        await self._refresh(db)
+        return self._products.get(product_id)
+
+    async def _refresh(self, db: AsyncSession) -> None:
+        async with self._lock:
+            expired = (
+                self._computed_at is None
+                or time.monotonic() - self._computed_at > self.ttl
+            )
+            if expired:
+                await self._refresh_all(db)
+            elif self._dirty_products or self._dirty_materials:
+                await self._refresh_dirty(db)
+
+    async def _refresh_all(self, db: AsyncSession) -> None:
+        # Marks arriving while we query are kept for the next read
+        self._dirty_products.clear()
+        self._dirty_materials.clear()
+        started = time.monotonic()
+        products = {
+            row.product_id: _product_row(row)
+            for row in (await db.execute(_ALL_PRODUCTS)).all()
+        }
+        low_stock = {
+            row.id: LowStockMaterial.model_validate(row, from_attributes=True)
+            for row in (await db.execute(_ALL_LOW_STOCK)).all()
+        }
+        self._products, self._low_stock = products, low_stock
+        self._computed_at = started
+        self.full_refreshes += 1
+
+    async def _refresh_dirty(self, db: AsyncSession) -> None:
+        # Marks arriving while we query are kept for the next read; if a query
+        # fails, the taken ones are put back and the cached rows left as they were
+        products, self._dirty_products = self._dirty_products, set()
+        materials, self._dirty_materials = self._dirty_materials, set()
+        try:
+            low_stock = {}
+            if materials:
+                products |= set(
+                    (await db.scalars(_PRODUCTS_USING, {"ids": list(materials)})).all()
+                )
+                low_stock = {
+                    row.id: LowStockMaterial.model_validate(row, from_attributes=True)
+                    for row in (
+                        await db.execute(_SOME_LOW_STOCK, {"ids": list(materials)})
+                    ).all()
+                }
+            rows = {}
+            if products:
+                rows = {
+                    row.product_id: _product_row(row)
+                    for row in (
+                        await db.execute(_SOME_PRODUCTS, {"ids": list(products)})
+                    ).all()
+                }
+        except BaseException:
+            self._dirty_products |= products
+            self._dirty_materials |= materials
+            raise
+        # Dirty materials drop out unless they are still below minimum, and
+        # products whose BOM is now empty drop out
+        for material_id in materials:
+            self._low_stock.pop(material_id, None)
+        self._low_stock.update(low_stock)
+        for product_id in products:
+            self._products.pop(product_id, None)
+        self._products.update(rows)
+        self.partial_refreshes += 1
+
+
+bom_engine = BomEngine(ttl=settings.bom_cache_ttl_seconds)
+
+
+# ORM writes are applied once their transaction commits, so a read in between
+# cannot recompute from the old rows and clear the mark
+def _pending(target) -> Dict[str, Set[int]]:
+    session = object_session(target)
+    return session.info.setdefault("bom_dirty", {"materials": set(), "products": set()})
+
+
+@event.listens_for(Material, "after_insert")
+@event.listens_for(Material, "after_update")
+@event.listens_for(Material, "after_delete")
+def _material_changed(mapper, connection, target: Material) -> None:
+    _pending(target)["materials"].add(target.id)
+
+
+@event.listens_for(ProductMaterial, "after_insert")
+@event.listens_for(ProductMaterial, "after_update")
+@event.listens_for(ProductMaterial, "after_delete")
+def _bom_link_changed(mapper, connection, target: ProductMaterial) -> None:
+    # A link moved to another product changes the old product's BOM too
+    history = inspect(target).attrs["product_id"].history
+    _pending(target)["products"].update([target.product_id, *history.deleted])
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending(session: Session) -> None:
+    pending = session.info.pop("bom_dirty", None)
+    if pending:
+        bom_engine.mark_materials(pending["materials"])
+        bom_engine.mark_products(pending["products"])
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending(session: Session) -> None:
+    session.info.pop("bom_dirty", None)
@@ -1,3 +1,5 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from models.database import User, Product
 from models.schemas import UserCreate, ProductCreate, ProductUpdate
@@ -5,6 +7,8 @@ from passlib.context import CryptContext
 from typing import Optional, List
 from fastapi import HTTPException
 
+from services.hashing import hash_pool
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
@@ -17,9 +21,20 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+async def get_password_hash_async(password: str) -> str:
+    return await hash_pool.run(pwd_context.hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await hash_pool.run(pwd_context.verify, plain_password, hashed_password)
+
+
 def get_user_by_email(db: Session, email: str):
     return db.query(User).filter(User.email == email).first()
 
+async def get_user_by_email_async(db: AsyncSession, email: str):
+    return await db.scalar(select(User).where(User.email == email))
+
 def create_user(db: Session, user: UserCreate):
     hashed_password = get_password_hash(user.password)
     db_user = User(email=user.email, hashed_password=hashed_password, role=user.role)
@@ -34,6 +49,19 @@ def authenticate_user(db: Session, email: str, password: str):
         return False
     return user
 
+async def authenticate_user_async(db: AsyncSession, email: str, password: str):
+    # A full hash pool answers 429 before any DB work
+    hash_pool.check_capacity()
+    user = await get_user_by_email_async(db, email)
+    if user:
+        # Keep its loaded attributes: the rollback would expire them
+        db.expunge(user)
+    # Return the connection to the pool for the length of the verify
+    await db.rollback()
+    if not user or not await verify_password_async(password, user.hashed_password):
+        return False
+    return user
+
 # Product services
 def get_products(db: Session) -> List[Product]:
     return db.query(Product).all()
@@ -0,0 +1,63 @@
+"""
+Streaming CSV / NDJSON export.
+
+Rows come off a server-side cursor in ``yield_per`` batches and are encoded
+batch by batch, so memory stays flat however many rows the table has.
+"""
+import csv
+import io
+import json
+from datetime import date
+from typing import AsyncIterator, List, Sequence
+
+from sqlalchemy import Select
+
+from models.database import AsyncSessionLocal
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _encode_csv(columns: Sequence[str], rows: List[Sequence], header: bool) -> bytes:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    if header:
+        writer.writerow(columns)
+    writer.writerows(rows)
+    return buf.getvalue().encode()
+
+
+def _json_default(value):
+    return value.isoformat() if isinstance(value, date) else str(value)
+
+
+def _encode_ndjson(columns: Sequence[str], rows: List[Sequence]) -> bytes:
+    lines = (
+        json.dumps(dict(zip(columns, row)), default=_json_default, ensure_ascii=False)
+        for row in rows
+    )
+    return ("\n".join(lines) + "\n").encode()
+
+
+async def stream_export(
+    stmt: Select, fmt: str, *, batch_size: int = 1000
+) -> AsyncIterator[bytes]:
+    """Yield ``stmt``'s rows encoded as ``fmt``, one chunk per fetched batch.
+
+    Uses its own session: the request's session may be closed before a
+    StreamingResponse finishes sending.
+    """
+    columns = [c.name for c in stmt.selected_columns]
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(stmt.execution_options(yield_per=batch_size))
+        first = True
+        async for partition in result.partitions():
+            if fmt == "csv":
+                yield _encode_csv(columns, partition, header=first)
+            else:
+                yield _encode_ndjson(columns, partition)
+            first = False
+        if first and fmt == "csv":
+            yield _encode_csv(columns, [], header=True)
@@ -0,0 +1,24 @@
+"""Run password hashing off the event loop.
+
+bcrypt burns 100-300 ms of CPU per hash/verify. Calling it inline from an
+``async def`` route stalls every other request on the worker, so it runs in a
+small thread pool instead (bcrypt releases the GIL while hashing). Past
+``password_hash_max_pending`` logins in the pool, callers get a 429 (see
+core/executors.py).
+"""
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from core.config import settings
+from core.executors import BoundedExecutor
+
+hash_pool = BoundedExecutor(
+    partial(
+        ThreadPoolExecutor,
+        max_workers=settings.password_hash_workers,
+        thread_name_prefix="pwd-hash",
+    ),
+    settings.password_hash_max_pending,
+    busy_detail="Too many login attempts in progress, retry shortly",
+    retry_after=1,
+)
@@ -0,0 +1,40 @@
+"""
+URLs of stored product image variants (see services/images.py).
+
+Kept apart from the upload pipeline, with no framework imports, because the
+models use it to list a product's variants.
+"""
+from typing import Any, Dict, List, Optional, Sequence
+
+from core.config import settings
+
+FORMATS = ("avif", "webp")
+
+
+def variant_path(key: str, width: int, fmt: str) -> str:
+    """Path of a variant relative to IMAGE_DIR (and IMAGE_BASE_URL)."""
+    return f"{key[:2]}/{key}/{width}.{fmt}"
+
+
+def variant_url(key: str, width: int, fmt: str) -> str:
+    return f"{settings.image_base_url}/{variant_path(key, width, fmt)}"
+
+
+def default_url(key: str, widths: Sequence[int]) -> str:
+    """URL that an upload puts in ``Product.image``: the WebP variant closest
+    to IMAGE_DEFAULT_WIDTH without going over (else the smallest)."""
+    fitting = [w for w in widths if w <= settings.image_default_width]
+    return variant_url(key, max(fitting) if fitting else min(widths), "webp")
+
+
+def variant_urls(
+    key: Optional[str], widths: Optional[Sequence[int]], image: Optional[str]
+) -> List[Dict[str, Any]]:
+    """``[{"width": w, "avif": url, "webp": url}, ...]`` for a product, or []
+    when it has no uploaded image or ``image`` was since set to another URL."""
+    if not key or not widths or image != default_url(key, widths):
+        return []
+    return [
+        {"width": width, **{fmt: variant_url(key, width, fmt) for fmt in FORMATS}}
+        for width in widths
+    ]
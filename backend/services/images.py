@@ -0,0 +1,118 @@
+"""
+Product images: resized WebP / AVIF variants, stored by content hash.
+
+An upload is decoded and resized in a process pool (Pillow holds the GIL for
+much of the work, and AVIF encoding takes a good fraction of a second per
+size). Files go under IMAGE_DIR as ``<hash[:2]>/<hash>/<width>.<format>``,
+where the hash is the SHA-256 of the uploaded bytes, plus the original and a
+``manifest.json`` written last. Identical uploads therefore share one
+directory and are only processed once, and a variant's URL never changes
+content, so it can be cached for good (URLs: services/image_urls.py). Widths
+come from IMAGE_WIDTHS; an image narrower than a width gets one variant at
+its own width instead.
+"""
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import List, Sequence
+
+from core.config import settings
+from core.executors import BoundedExecutor
+from services.image_urls import FORMATS
+
+# Pillow encoder options per format; AVIF quality 60 looks like WebP 80
+_ENCODER_OPTIONS = {
+    "webp": {"quality": 80, "method": 4},
+    "avif": {"quality": 60, "speed": 6},
+}
+# Formats accepted for upload (Pillow format names)
+UPLOAD_FORMATS = ("JPEG", "PNG", "WEBP", "AVIF", "GIF")
+_MANIFEST = "manifest.json"
+
+
+@dataclass
+class StoredImage:
+    key: str  # SHA-256 of the uploaded bytes
+    width: int
+    height: int
+    widths: List[int]
+
+
+def image_key(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def process_image(data: bytes, root: str, widths: Sequence[int]) -> StoredImage:
+    """Decode ``data`` and store its variants under ``root``; runs in the pool.
+
+    Raises ValueError for anything that is not a readable image.
+    """
+    # Imported here: only the pool processes load Pillow
+    from PIL import Image, ImageOps
+
+    key = image_key(data)
+    directory = Path(root) / key[:2] / key
+    manifest = directory / _MANIFEST
+    if manifest.exists():
+        return StoredImage(**json.loads(manifest.read_text()))
+    try:
+        with Image.open(io.BytesIO(data), formats=UPLOAD_FORMATS) as source:
+            source_format = source.format
+            image = ImageOps.exif_transpose(source)
+            image.load()
+    except (OSError, SyntaxError, Image.DecompressionBombError) as exc:
+        raise ValueError("Not a supported image (JPEG, PNG, WebP, AVIF or GIF)") from exc
+    has_alpha = image.mode in ("RGBA", "LA") or "transparency" in image.info
+    image = image.convert("RGBA" if has_alpha else "RGB")
+
+    directory.mkdir(parents=True, exist_ok=True)
+    _write_atomic(directory / f"original.{source_format.lower()}", data)
+    stored_widths = sorted({min(width, image.width) for width in widths})
+    for width in stored_widths:
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.LANCZOS, reducing_gap=3.0)
+        for fmt in FORMATS:
+            buffer = io.BytesIO()
+            resized.save(buffer, fmt.upper(), **_ENCODER_OPTIONS[fmt])
+            _write_atomic(directory / f"{width}.{fmt}", buffer.getvalue())
+    stored = StoredImage(key, image.width, image.height, stored_widths)
+    _write_atomic(manifest, json.dumps(stored.__dict__).encode())
+    return stored
+
+
+# spawn: forking a worker with live DB pools and threads is unsafe
+image_pool = BoundedExecutor(
+    partial(
+        ProcessPoolExecutor,
+        max_workers=settings.image_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    ),
+    settings.image_max_pending,
+    busy_detail="Too many image uploads in progress, retry shortly",
+    retry_after=5,
+)
+
+
+async def store_image(data: bytes) -> StoredImage:
+    """Process an upload in the pool; ValueError if it is not an image."""
+    return await image_pool.run(
+        process_image, data, settings.image_dir, tuple(settings.image_widths)
+    )
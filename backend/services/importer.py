@@ -0,0 +1,237 @@
+"""
+Bulk import of catalog and material files through PostgreSQL COPY.
+
+An uploaded CSV or NDJSON file is parsed and validated in chunks; valid rows
+are COPYed into a temporary staging table and then merged into the target
+table with a few set-based statements:
+
+- rows with an ``id`` update that record (unknown ids, and ids already given
+  by an earlier row, are reported); they are validated against an all-optional
+  schema, and fields a row leaves empty keep their current value,
+- rows without one are inserted, with ids drawn from the table's sequence,
+- for products, ``stock`` / ``inventory_status`` are upserted into inventory,
+- change-feed events are written for every row touched (services/outbox.py).
+
+Everything happens in one transaction; the staging table is dropped on commit.
+"""
+import csv
+import io
+import json
+from dataclasses import dataclass, field
+from typing import IO, Any, Dict, Iterator, List, Optional, Sequence, Type
+
+import asyncpg
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import Table, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.database import Material, Product
+from services.outbox import ROW_EVENTS_SQL, row_events
+from models.schemas import (
+    ImportResult,
+    ImportRowError,
+    MaterialImportRow,
+    MaterialImportUpdateRow,
+    ProductImportRow,
+    ProductImportUpdateRow,
+)
+
+CHUNK_SIZE = 5000
+MAX_REPORTED_ERRORS = 100
+
+
+@dataclass
+class ImportSpec:
+    table: Table
+    # Rows without an id (inserts) and with one (updates)
+    row_schema: Type[BaseModel]
+    update_schema: Type[BaseModel]
+    # Columns copied from each row into the target table (besides id)
+    fields: Sequence[str]
+    # Extra staging-only columns: name -> SQL type
+    extra_columns: Dict[str, str] = field(default_factory=dict)
+    # Statements run after the merge, with the staging table as {staging}
+    post_merge: Sequence[str] = ()
+
+    @property
+    def staging(self) -> str:
+        return f"import_{self.table.name}"
+
+    @property
+    def staging_columns(self) -> List[str]:
+        return ["row_no", "id", *self.fields, *self.extra_columns]
+
+
+PRODUCT_IMPORT = ImportSpec(
+    table=Product.__table__,
+    row_schema=ProductImportRow,
+    update_schema=ProductImportUpdateRow,
+    fields=(
+        "name", "description", "category", "price", "cost", "image", "shopee_link"
+    ),
+    extra_columns={"stock": "integer", "inventory_status": "varchar"},
+    post_merge=(
+        """
+        INSERT INTO inventory (product_id, stock, status)
+        SELECT s.id, s.stock, coalesce(
+            s.inventory_status,
+            CASE WHEN s.stock > 0 THEN 'In Stock' ELSE 'Sold Out' END
+        )
+        FROM {staging} s JOIN products p ON p.id = s.id
+        WHERE s.stock IS NOT NULL
+        ON CONFLICT (product_id)
+        DO UPDATE SET stock = EXCLUDED.stock, status = EXCLUDED.status
+        """,
+        ROW_EVENTS_SQL.format(
+            table="inventory",
+            key="product_id",
+            action="update",
+            where="t.product_id IN (SELECT s.id FROM {staging} s WHERE s.stock IS NOT NULL)",
+        ),
+    ),
+)
+
+MATERIAL_IMPORT = ImportSpec(
+    table=Material.__table__,
+    row_schema=MaterialImportRow,
+    update_schema=MaterialImportUpdateRow,
+    fields=("name", "unit", "quantity", "min_stock_level", "status", "price"),
+)
+
+
+def upload_format(filename: str, fmt: Optional[str]) -> str:
+    """Explicit ``fmt``, else guessed from the file extension (default CSV)."""
+    if fmt:
+        return fmt
+    return "ndjson" if filename.lower().endswith((".ndjson", ".jsonl")) else "csv"
+
+
+def iter_upload_rows(upload: IO[bytes], fmt: str) -> Iterator[Dict[str, Any]]:
+    """Yield raw row dicts from a CSV (header row) or NDJSON file object."""
+    stream = io.TextIOWrapper(upload, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        for row in csv.DictReader(stream):
+            # Empty CSV cells mean "not provided", not empty strings
+            yield {k: v for k, v in row.items() if k and v != ""}
+    else:
+        for line_no, line in enumerate(stream, start=1):
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    raise ValueError(f"Line {line_no} is not valid JSON") from None
+
+
+def _chunks(rows: Iterator[Dict[str, Any]], size: int) -> Iterator[List[Dict]]:
+    chunk: List[Dict[str, Any]] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _staging_ddl(spec: ImportSpec) -> str:
+    dialect = postgresql.dialect()
+    columns = ["row_no integer", "id integer"]
+    for name in spec.fields:
+        columns.append(f"{name} {spec.table.c[name].type.compile(dialect=dialect)}")
+    columns += [f"{name} {sql_type}" for name, sql_type in spec.extra_columns.items()]
+    return f"CREATE TEMP TABLE {spec.staging} ({', '.join(columns)}) ON COMMIT DROP"
+
+
+async def import_rows(
+    db: AsyncSession, spec: ImportSpec, rows: Iterator[Dict[str, Any]]
+) -> ImportResult:
+    """Validate, COPY and merge ``rows`` into ``spec.table``; commits on success.
+
+    Raises ValueError (before committing) if the file itself cannot be parsed,
+    or if Postgres rejects a chunk of values (out of range, too long).
+    """
+    result = ImportResult()
+    table, staging = spec.table.name, spec.staging
+    await db.execute(text(_staging_ddl(spec)))
+    raw = await (await db.connection()).get_raw_connection()
+    driver = raw.driver_connection  # asyncpg.Connection, inside the same transaction
+
+    def reject(row_no: int, detail: Any) -> None:
+        result.error_count += 1
+        if len(result.errors) < MAX_REPORTED_ERRORS:
+            result.errors.append(ImportRowError(row=row_no, detail=detail))
+
+    row_no = 0
+    # id -> row that gave it; a second row for the same record is rejected, as
+    # the merge could only apply one of them
+    id_rows: Dict[int, int] = {}
+    for chunk in _chunks(rows, CHUNK_SIZE):
+        records = []
+        for raw_row in chunk:
+            row_no += 1
+            has_id = isinstance(raw_row, dict) and raw_row.get("id") is not None
+            schema = spec.update_schema if has_id else spec.row_schema
+            try:
+                data = schema.model_validate(raw_row).model_dump()
+            except ValidationError as exc:
+                reject(row_no, json.loads(exc.json(include_url=False)))
+                continue
+            if "id" in data:
+                first = id_rows.setdefault(data["id"], row_no)
+                if first != row_no:
+                    reject(row_no, f"Duplicate id {data['id']} (first given in row {first})")
+                    continue
+            data["row_no"] = row_no
+            records.append(tuple(data.get(name) for name in spec.staging_columns))
+        if records:
+            try:
+                await driver.copy_records_to_table(
+                    staging, records=records, columns=spec.staging_columns
+                )
+            except (asyncpg.DataError, OverflowError) as exc:
+                raise ValueError(
+                    f"Rows {records[0][0]}-{records[-1][0]}: {exc}"
+                ) from None
+
+    # Rows naming an id that does not exist are reported and dropped
+    missing = await db.scalars(text(
+        f"DELETE FROM {staging} s WHERE s.id IS NOT NULL"
+        f" AND NOT EXISTS (SELECT 1 FROM {table} t WHERE t.id = s.id)"
+        f" RETURNING row_no"
+    ))
+    for missing_row in sorted(missing):
+        reject(missing_row, "Not found")
+
+    # Empty cells / missing keys are None: keep the stored value
+    assignments = ", ".join(
+        f"{name} = coalesce(s.{name}, t.{name})" for name in spec.fields
+    )
+    updated = await db.scalars(text(
+        f"UPDATE {table} t SET {assignments} FROM {staging} s"
+        f" WHERE t.id = s.id RETURNING t.id"
+    ))
+    result.updated_ids = list(updated)
+    result.updated = len(result.updated_ids)
+
+    # New rows: draw ids up front so later statements can join on them
+    await db.execute(text(
+        f"UPDATE {staging} SET id = nextval(pg_get_serial_sequence('{table}', 'id'))"
+        f" WHERE id IS NULL"
+    ))
+    columns = ", ".join(spec.fields)
+    inserted = await db.scalars(text(
+        f"INSERT INTO {table} (id, {columns})"
+        f" SELECT s.id, {columns} FROM {staging} s"
+        f" WHERE NOT EXISTS (SELECT 1 FROM {table} t WHERE t.id = s.id)"
+        f" RETURNING id"
+    ))
+    result.inserted_ids = list(inserted)
+    result.inserted = len(result.inserted_ids)
+    for action, ids in (("update", result.updated_ids), ("create", result.inserted_ids)):
+        if ids:
+            await db.execute(row_events(table, action), {"ids": ids})
+    for statement in spec.post_merge:
+        await db.execute(text(statement.format(staging=staging)))
+    await db.commit()
+    return result
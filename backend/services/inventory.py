@@ -0,0 +1,121 @@
+"""
+Stock reservation against the inventory table.
+
+Stock is decremented with one conditional UPDATE per call (``stock >= qty``),
+never read-modify-write, so concurrent checkouts cannot oversell: Postgres
+re-checks the condition against the latest row version after waiting for a
+competing writer's lock. Rows are locked in product_id order so two orders
+over the same products cannot deadlock. The same statement writes the
+change-feed events for the new stock (services/outbox.py).
+"""
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import Integer, Text, case, column, func, insert, literal, literal_column
+from sqlalchemy import select, update, values
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from models.database import Inventory, OutboxEvent
+
+
+# Statuses that raise a low-stock event when a row enters them
+ALERT_STATUSES = ("Low Stock", "Sold Out")
+
+
+def stock_status(stock):
+    """SQL expression for the Inventory.status matching ``stock``."""
+    return case(
+        (stock <= 0, "Sold Out"),
+        (stock <= settings.low_stock_threshold, "Low Stock"),
+        else_="In Stock",
+    )
+
+
+def material_status(quantity, min_stock_level):
+    """SQL expression for the Material.status matching its stock level."""
+    return case(
+        (quantity <= 0, "Sold Out"),
+        (quantity < min_stock_level, "Low Stock"),
+        else_="In Stock",
+    )
+
+
+class StockChange(NamedTuple):
+    stock: int
+    status: str
+    previous_status: Optional[str]
+
+
+async def reserve_stock(
+    db: AsyncSession, quantities: Dict[int, int]
+) -> Tuple[Dict[int, StockChange], List[int]]:
+    """Take ``quantities`` (product_id -> qty) out of inventory in one statement.
+
+    Returns ``(StockChange by product_id, product_ids short of stock)``.
+    Products without an inventory row count as short. Nothing is committed;
+    the caller must roll back if anything was short, and should commit soon
+    otherwise, since the reserved rows stay locked until then.
+    """
+    wanted = values(
+        column("product_id", Integer), column("quantity", Integer), name="wanted"
+    ).data(sorted(quantities.items()))
+    # Locking reads the latest committed row, so this is the status we replace
+    locked = (
+        select(Inventory.id, Inventory.status.label("previous_status"))
+        .join(wanted, wanted.c.product_id == Inventory.product_id)
+        .order_by(Inventory.product_id)
+        .with_for_update()
+        .cte("locked")
+        .prefix_with("MATERIALIZED")
+    )
+    remaining = Inventory.stock - wanted.c.quantity
+    reserved = (
+        update(Inventory)
+        .where(
+            Inventory.id == locked.c.id,
+            Inventory.product_id == wanted.c.product_id,
+            Inventory.stock >= wanted.c.quantity,
+        )
+        .values(stock=remaining, status=stock_status(remaining))
+        .returning(
+            Inventory.id,
+            Inventory.product_id,
+            Inventory.stock,
+            Inventory.status,
+            locked.c.previous_status,
+        )
+        .cte("reserved")
+    )
+    # Change-feed events for the new stock, in the same statement
+    events = (
+        insert(OutboxEvent)
+        .from_select(
+            ["entity", "entity_id", "action", "payload", "created_at"],
+            select(
+                literal("inventory"),
+                reserved.c.product_id,
+                literal("update"),
+                func.json_build_object(
+                    *(
+                        arg
+                        for name in ("id", "product_id", "status", "stock")
+                        for arg in (literal_column(f"'{name}'"), reserved.c[name])
+                    )
+                ).cast(Text),
+                func.timezone("utc", func.now()),
+            ),
+        )
+        .cte("events")
+    )
+    stmt = select(
+        reserved.c.product_id,
+        reserved.c.stock,
+        reserved.c.status,
+        reserved.c.previous_status,
+    ).add_cte(events)
+    changes = {
+        product_id: StockChange(*change)
+        for product_id, *change in (await db.execute(stmt)).all()
+    }
+    short = sorted(set(quantities) - set(changes))
+    return changes, short
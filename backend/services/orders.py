@@ -0,0 +1,79 @@
+"""
+Order placement: one transaction that records the order and reserves stock.
+
+The order and its lines are inserted first and the inventory rows are
+reserved last, right before commit, so the hot rows stay locked only for
+the reserve statement and the commit itself.
+"""
+from collections import Counter
+from typing import Dict, List
+
+from fastapi import HTTPException, status
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.jobs import enqueue
+from crud.order import order_crud
+from crud.product import product_crud
+from models.database import DistributorDetail, Order, OrderDetail, Product
+from models.schemas import OrderCreate
+from services.inventory import reserve_stock
+from services.stock_alerts import StatusChange, stock_events
+
+
+async def place_order(db: AsyncSession, payload: OrderCreate) -> Order:
+    """Create an order and decrement inventory atomically, or raise.
+
+    404 for an unknown distributor detail or product, 409 (nothing written)
+    when any product is short of stock.
+    """
+    quantities: Dict[int, int] = Counter()
+    for line in payload.items:
+        quantities[line.product_id] += line.quantity
+
+    if await db.get(DistributorDetail, payload.distributor_detail_id) is None:
+        raise HTTPException(status_code=404, detail="Distributor detail not found")
+    prices = dict(
+        (await db.execute(
+            select(Product.id, Product.price).where(Product.id.in_(quantities))
+        )).all()
+    )
+    unknown = sorted(set(quantities) - set(prices))
+    if unknown:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Product not found: {', '.join(map(str, unknown))}",
+        )
+
+    order_id = await db.scalar(
+        insert(Order)
+        .values(
+            distributor_detail_id=payload.distributor_detail_id,
+            total_price=sum(prices[pid] * qty for pid, qty in quantities.items()),
+        )
+        .returning(Order.id)
+    )
+    lines: List[dict] = [
+        {"order_id": order_id, "product_id": pid, "quantity": qty, "price": prices[pid]}
+        for pid, qty in quantities.items()
+    ]
+    await db.execute(insert(OrderDetail), lines)
+
+    reserved, short = await reserve_stock(db, quantities)
+    if short:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Insufficient stock for product: {', '.join(map(str, short))}",
+        )
+    await db.commit()
+    # Product responses embed inventory
+    await product_crud.invalidate_cache(*quantities)
+    # Statuses were set by the reserve itself; only the alerts go to the worker
+    events = stock_events(
+        StatusChange("product", pid, change.stock, change.status, change.previous_status)
+        for pid, change in reserved.items()
+    )
+    if events:
+        await enqueue("services.tasks.publish_stock_events", events=events)
+    return await order_crud.get_or_404(db, order_id, detail="Order not found")
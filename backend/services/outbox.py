@@ -0,0 +1,139 @@
+"""
+Transactional outbox and change feed.
+
+Every catalog write inserts an ``outbox`` event in the same transaction:
+BaseCRUD for products and materials, plus the writers that bypass it (stock
+reservation, imports, the stock-status job) for ``inventory``. An event
+carries the whole row after the change (before it, for deletes), so
+consumers never read the source tables.
+
+Events get their feed position (``seq``) only after they commit: each feed
+read first numbers the committed, unnumbered events under an advisory lock.
+A transaction that commits late therefore lands after everything already
+served, and a consumer that resumes from the last ``seq`` it saw never
+misses an event, whatever order the writers committed in. Reads and
+numbering walk indexes, so their cost grows with the events returned, not
+with the size of the tables.
+"""
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import TextClause, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from models.database import OutboxEvent
+
+# pg_advisory_xact_lock key serializing seq assignment
+SEQUENCER_LOCK = 0x0B7B0C5E
+SEQUENCE_BATCH = 10000
+
+_HAS_UNSEQUENCED = text("SELECT EXISTS (SELECT 1 FROM outbox WHERE seq IS NULL)")
+_ASSIGN_SEQ = text("""
+UPDATE outbox o SET seq = p.seq
+FROM (
+    SELECT id, nextval('outbox_seq') AS seq
+    FROM (SELECT id FROM outbox WHERE seq IS NULL ORDER BY id LIMIT :batch) n
+    ORDER BY id
+) p
+WHERE o.id = p.id
+""")
+
+# Events for rows written with raw SQL; the placeholders are trusted
+# identifiers / SQL, not user input
+ROW_EVENTS_SQL = """
+INSERT INTO outbox (entity, entity_id, action, payload, created_at)
+SELECT '{table}', t.{key}, '{action}', row_to_json(t)::text, now() AT TIME ZONE 'utc'
+FROM {table} t
+WHERE {where}
+"""
+
+
+def event(entity: str, entity_id: int, action: str, values: Dict[str, Any]) -> dict:
+    """One outbox row for a change made through the ORM."""
+    return {
+        "entity": entity,
+        "entity_id": entity_id,
+        "action": action,
+        "payload": json.dumps(dict(values), default=str),
+    }
+
+
+def row_events(table: str, action: str, key: str = "id") -> TextClause:
+    """INSERT ... SELECT of the ``table`` rows whose ``key`` is in ``:ids``, as
+    events (entity_id is ``key``)."""
+    return text(ROW_EVENTS_SQL.format(
+        table=table, key=key, action=action, where=f"t.{key} = ANY(:ids)"
+    ))
+
+
+async def assign_sequence(db: AsyncSession) -> None:
+    """Number committed events that have no ``seq`` yet, then commit."""
+    if not await db.scalar(_HAS_UNSEQUENCED):
+        await db.commit()
+        return
+    await db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": SEQUENCER_LOCK})
+    while (await db.execute(_ASSIGN_SEQ, {"batch": SEQUENCE_BATCH})).rowcount:
+        pass
+    await db.commit()
+
+
+async def read_changes(
+    db: AsyncSession,
+    after: int = 0,
+    *,
+    limit: int = 100,
+    entities: Sequence[str] = (),
+) -> List[OutboxEvent]:
+    """Events with ``seq > after``, oldest first.
+
+    Ends the transaction, so callers can wait between reads without holding
+    a pooled connection.
+    """
+    await assign_sequence(db)
+    stmt = (
+        select(OutboxEvent)
+        .where(OutboxEvent.seq > after)
+        .order_by(OutboxEvent.seq)
+        .limit(limit)
+    )
+    if entities:
+        stmt = stmt.where(OutboxEvent.entity.in_(entities))
+    events = list((await db.scalars(stmt)).all())
+    await db.commit()
+    return events
+
+
+async def wait_for_changes(
+    db: AsyncSession,
+    after: int,
+    *,
+    wait: float,
+    limit: int = 100,
+    entities: Sequence[str] = (),
+) -> List[OutboxEvent]:
+    """read_changes, polling every OUTBOX_POLL_SECONDS for up to ``wait``
+    seconds while there is nothing new."""
+    deadline = time.monotonic() + wait
+    while True:
+        events = await read_changes(db, after, limit=limit, entities=entities)
+        remaining = deadline - time.monotonic()
+        if events or remaining <= 0:
+            return events
+        await asyncio.sleep(min(settings.outbox_poll_seconds, remaining))
+
+
+def prune_statement():
+    """DELETE of events older than OUTBOX_RETENTION_HOURS (consumers further
+    behind must resync). It walks the primary key from the oldest row, so it
+    touches only what it deletes (nothing until a newer event exists)."""
+    return text("""
+        DELETE FROM outbox
+        WHERE id < (
+            SELECT id FROM outbox
+            WHERE created_at >= now() AT TIME ZONE 'utc' - make_interval(hours => :hours)
+            ORDER BY id LIMIT 1
+        )
+    """).bindparams(hours=settings.outbox_retention_hours)
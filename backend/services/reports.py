@@ -0,0 +1,86 @@
+"""
+Daily revenue reports served from summary tables.
+
+Triggers on orders, order_details and payments (see the revenue_reports
+migration) append signed deltas to ``report_deltas`` in the writing
+transaction. ``FOLD_DELTAS`` moves up to REPORT_FOLD_BATCH_SIZE pending
+deltas into the daily tables in one statement. Celery beat runs it every
+REPORT_FOLD_SECONDS (``fold_report_deltas``), and a report read folds one
+more batch first, so a read costs at most one batch plus the rows it
+returns, however long the order history is.
+"""
+from datetime import date, datetime, timedelta
+from typing import Any, List, Optional
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+
+
+# Days covered when a report request gives no start date
+DEFAULT_REPORT_DAYS = 30
+
+FOLD_DELTAS = text("""
+WITH pending AS (
+    -- SKIP LOCKED: concurrent folds take different deltas instead of waiting
+    DELETE FROM report_deltas WHERE id IN (
+        SELECT id FROM report_deltas ORDER BY id LIMIT :batch FOR UPDATE SKIP LOCKED
+    )
+    RETURNING report, day, key, count, quantity, amount
+), products AS (
+    INSERT INTO revenue_daily_product AS t (day, product_id, quantity, revenue)
+    SELECT day, key::integer, sum(quantity), sum(amount)
+    FROM pending WHERE report = 'product' GROUP BY day, key
+    ON CONFLICT (day, product_id) DO UPDATE
+    SET quantity = t.quantity + EXCLUDED.quantity, revenue = t.revenue + EXCLUDED.revenue
+), channels AS (
+    INSERT INTO revenue_daily_channel AS t (day, channel, orders, revenue)
+    SELECT day, key, sum(count), sum(amount)
+    FROM pending WHERE report = 'channel' GROUP BY day, key
+    ON CONFLICT (day, channel) DO UPDATE
+    SET orders = t.orders + EXCLUDED.orders, revenue = t.revenue + EXCLUDED.revenue
+), payments AS (
+    INSERT INTO payments_daily_status AS t (day, status, payments, amount)
+    SELECT day, key, sum(count), sum(amount)
+    FROM pending WHERE report = 'payment_status' GROUP BY day, key
+    ON CONFLICT (day, status) DO UPDATE
+    SET payments = t.payments + EXCLUDED.payments, amount = t.amount + EXCLUDED.amount
+)
+SELECT count(*) FROM pending
+""")
+
+
+async def fold_deltas(db: AsyncSession) -> int:
+    """Apply up to one batch of pending report deltas and commit; returns
+    how many were folded."""
+    folded = (await db.execute(
+        FOLD_DELTAS, {"batch": settings.report_fold_batch_size}
+    )).scalar_one()
+    await db.commit()
+    return folded
+
+
+async def daily_report(
+    db: AsyncSession,
+    model: Any,
+    *,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    **filters: Any,
+) -> List[Any]:
+    """Rows of one summary ``model`` for ``start``..``end`` (inclusive).
+
+    Days are UTC dates, like the order and payment timestamps they bucket.
+    Defaults to the last DEFAULT_REPORT_DAYS days; ``filters`` are exact
+    matches on the key column (None = all). Run ``fold_deltas`` in the
+    same primary session first, so the rows include it.
+    """
+    end = end or datetime.utcnow().date()
+    start = start or end - timedelta(days=DEFAULT_REPORT_DAYS - 1)
+    stmt = select(model).where(model.day >= start, model.day <= end)
+    for key, value in filters.items():
+        if value is not None:
+            stmt = stmt.where(getattr(model, key) == value)
+    stmt = stmt.order_by(*model.__table__.primary_key.columns)
+    return list(await db.scalars(stmt))
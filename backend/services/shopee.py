@@ -0,0 +1,171 @@
+"""
+Shopee Open Platform (v2) client for listing price / stock updates.
+
+One ``ShopeeClient`` owns one keep-alive ``httpx.AsyncClient``, so every
+request of a sync run reuses the same pooled connections. Requests are
+bounded three ways:
+
+- at most SHOPEE_MAX_CONCURRENCY in flight,
+- at most SHOPEE_RATE_LIMIT started per second,
+- retried up to SHOPEE_MAX_RETRIES times on transport errors, 429 and 5xx,
+  with exponential backoff and full jitter (``Retry-After`` wins if sent).
+
+Items are assumed to have a single model (``model_id`` 0).
+"""
+import asyncio
+import hashlib
+import hmac
+import random
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+from core.config import settings
+
+UPDATE_PRICE_PATH = "/api/v2/product/update_price"
+UPDATE_STOCK_PATH = "/api/v2/product/update_stock"
+
+# Item id in a product page URL: .../product/<shop_id>/<item_id> or
+# .../<slug>-i.<shop_id>.<item_id> (a Postgres regex, see services/shopee_sync.py)
+LINK_PATTERN = r"(?:/product/|-i\.)\d+[./](\d+)"
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 30.0
+
+
+class ShopeeError(Exception):
+    """A request that failed for good (non-retryable, or out of retries)."""
+
+
+class RateLimiter:
+    """Spaces request starts at least 1/rate seconds apart."""
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class ShopeeClient:
+    """Signed, rate-limited Shopee API calls over one connection pool.
+
+    Use as ``async with ShopeeClient() as client``; the pool is closed on exit.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        *,
+        max_concurrency: Optional[int] = None,
+        rate_limit: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        concurrency = max_concurrency or settings.shopee_max_concurrency
+        self.max_retries = settings.shopee_max_retries if max_retries is None else max_retries
+        self.requests = 0
+        self.retries = 0
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._limiter = RateLimiter(
+            settings.shopee_rate_limit if rate_limit is None else rate_limit
+        )
+        self._http = httpx.AsyncClient(
+            base_url=base_url or settings.shopee_api_url,
+            timeout=timeout or settings.shopee_timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=concurrency, max_keepalive_connections=concurrency
+            ),
+        )
+
+    async def __aenter__(self) -> "ShopeeClient":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self._http.aclose()
+
+    async def update_price(self, item_id: int, price: float) -> None:
+        await self._post(UPDATE_PRICE_PATH, {
+            "item_id": item_id,
+            "price_list": [{"model_id": 0, "original_price": price}],
+        })
+
+    async def update_stock(self, item_id: int, stock: int) -> None:
+        await self._post(UPDATE_STOCK_PATH, {
+            "item_id": item_id,
+            "stock_list": [{"model_id": 0, "seller_stock": [{"stock": stock}]}],
+        })
+
+    def _signed_params(self, path: str) -> Dict[str, Any]:
+        timestamp = int(time.time())
+        base = (
+            f"{settings.shopee_partner_id}{path}{timestamp}"
+            f"{settings.shopee_access_token}{settings.shopee_shop_id}"
+        )
+        sign = hmac.new(
+            settings.shopee_partner_key.encode(), base.encode(), hashlib.sha256
+        ).hexdigest()
+        return {
+            "partner_id": settings.shopee_partner_id,
+            "timestamp": timestamp,
+            "access_token": settings.shopee_access_token,
+            "shop_id": settings.shopee_shop_id,
+            "sign": sign,
+        }
+
+    async def _post(self, path: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                await self._limiter.wait()
+                self.requests += 1
+                retry_after: Optional[float] = None
+                try:
+                    response = await self._http.post(
+                        path, params=self._signed_params(path), json=body
+                    )
+                except httpx.TransportError as exc:
+                    reason = f"{type(exc).__name__}: {exc}"
+                else:
+                    if response.status_code not in RETRY_STATUSES:
+                        return self._result(response)
+                    reason = f"HTTP {response.status_code}"
+                    retry_after = _retry_after(response)
+                if attempt == self.max_retries:
+                    raise ShopeeError(f"{path}: {reason} (after {attempt + 1} attempts)")
+                self.retries += 1
+                await asyncio.sleep(retry_after if retry_after is not None else _backoff(attempt))
+        raise AssertionError("unreachable")
+
+    @staticmethod
+    def _result(response: httpx.Response) -> Dict[str, Any]:
+        try:
+            data = response.json()
+        except ValueError:
+            data = {}
+        if response.is_error or data.get("error"):
+            message = data.get("message") or data.get("error") or response.text[:200]
+            raise ShopeeError(f"HTTP {response.status_code}: {message}")
+        failures = (data.get("response") or {}).get("failure_list") or []
+        if failures:
+            raise ShopeeError(f"Rejected: {failures[0].get('failed_reason', failures[0])}")
+        return data
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    try:
+        return min(float(response.headers["Retry-After"]), BACKOFF_MAX_SECONDS)
+    except (KeyError, ValueError):
+        return None
+
+
+def _backoff(attempt: int) -> float:
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
@@ -0,0 +1,151 @@
+"""
+Batched push of product price / stock to linked Shopee listings.
+
+``shopee_listings`` keeps what was last pushed for each product. A run reads,
+in product id order and SHOPEE_SYNC_BATCH_SIZE rows at a time, only the
+products whose ``shopee_link`` names a listing and whose price, stock or
+listing differs from that state, pushes just the changed fields concurrently
+over one pooled client (services/shopee.py), then upserts the state for the
+batch. A failed push keeps the old state and records ``last_error``, so the
+product is picked up again by the next run. Links that name no listing are
+skipped. Runs from the ``sync_shopee_listings`` Celery task.
+
+The database work goes through the sync engine in a thread (the task calls
+``asyncio.run``, so a pooled asyncpg connection would outlive its loop), which
+keeps the event loop free for the batches still in flight.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+
+from core.config import settings
+from models.database import SessionLocal, ShopeeListing
+from services.shopee import LINK_PATTERN, ShopeeClient, ShopeeError
+
+logger = logging.getLogger(__name__)
+
+BATCHES_IN_FLIGHT = 2
+
+_CHANGED = text("""
+SELECT p.id AS product_id, l.item_id, p.price, i.stock,
+       s.item_id AS synced_item_id, s.synced_price, s.synced_stock
+FROM products p
+CROSS JOIN LATERAL (
+    SELECT substring(p.shopee_link FROM :pattern)::bigint AS item_id
+) l
+LEFT JOIN inventory i ON i.product_id = p.id
+LEFT JOIN shopee_listings s ON s.product_id = p.id
+WHERE p.id > :after
+  AND l.item_id IS NOT NULL
+  AND (s.product_id IS NULL
+       OR s.item_id IS DISTINCT FROM l.item_id
+       OR s.synced_price IS DISTINCT FROM p.price
+       OR s.synced_stock IS DISTINCT FROM i.stock)
+ORDER BY p.id
+LIMIT :batch
+""")
+
+
+@dataclass
+class SyncReport:
+    changed: int = 0  # products that differed from the last pushed state
+    synced: int = 0
+    failed: int = 0
+    requests: int = 0  # HTTP requests made, retries included
+    retries: int = 0
+
+
+async def _push(client: ShopeeClient, row) -> Dict[str, Any]:
+    """Push ``row``'s changed fields; returns its new shopee_listings row."""
+    relisted = row.synced_item_id != row.item_id
+    state = {
+        "product_id": row.product_id,
+        "item_id": row.item_id,
+        "synced_price": None if relisted else row.synced_price,
+        "synced_stock": None if relisted else row.synced_stock,
+        "synced_at": datetime.utcnow(),
+        "last_error": None,
+    }
+    pushes = {}
+    if row.price is not None and (relisted or row.price != row.synced_price):
+        pushes["synced_price"] = (client.update_price(row.item_id, row.price), row.price)
+    if row.stock is not None and (relisted or row.stock != row.synced_stock):
+        pushes["synced_stock"] = (client.update_stock(row.item_id, row.stock), row.stock)
+    results = await asyncio.gather(
+        *(call for call, _ in pushes.values()), return_exceptions=True
+    )
+    for (field, (_, value)), result in zip(pushes.items(), results):
+        if isinstance(result, ShopeeError):
+            state["last_error"] = str(result)
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            state[field] = value
+    return state
+
+
+async def _sync_batch(client: ShopeeClient, rows, report: SyncReport) -> None:
+    states = await asyncio.gather(*(_push(client, row) for row in rows))
+    await asyncio.to_thread(_save, states)
+    report.changed += len(states)
+    report.failed += sum(1 for s in states if s["last_error"])
+
+
+def _changed(after: int):
+    with SessionLocal() as db:
+        return db.execute(_CHANGED, {
+            "pattern": LINK_PATTERN,
+            "after": after,
+            "batch": settings.shopee_sync_batch_size,
+        }).all()
+
+
+def _save(states) -> None:
+    stmt = insert(ShopeeListing).values(states)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ShopeeListing.product_id],
+        set_={
+            name: stmt.excluded[name]
+            for name in ("item_id", "synced_price", "synced_stock", "synced_at", "last_error")
+        },
+    )
+    with SessionLocal() as db:
+        db.execute(stmt)
+        db.commit()
+
+
+async def sync_listings() -> SyncReport:
+    """Push every changed product once; a no-op without SHOPEE_PARTNER_ID."""
+    report = SyncReport()
+    if not settings.shopee_partner_id:
+        logger.info("Shopee sync skipped: SHOPEE_PARTNER_ID is not set")
+        return report
+    async with ShopeeClient() as client:
+        # The next batch is read while the previous one finishes, so a slow
+        # retry does not leave the connections idle
+        in_flight = set()
+        after = 0
+        while True:
+            rows = await asyncio.to_thread(_changed, after)
+            if not rows:
+                break
+            after = rows[-1].product_id
+            in_flight.add(asyncio.create_task(_sync_batch(client, rows, report)))
+            if len(in_flight) >= BATCHES_IN_FLIGHT:
+                done, in_flight = await asyncio.wait(
+                    in_flight, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    task.result()
+        for task in in_flight:
+            await task
+        report.synced = report.changed - report.failed
+        report.requests, report.retries = client.requests, client.retries
+    if report.failed:
+        logger.warning("Shopee sync: %d of %d listings failed", report.failed, report.changed)
+    return report
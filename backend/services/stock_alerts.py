@@ -0,0 +1,130 @@
+"""
+Bulk Material/Inventory status recompute and low-stock events.
+
+Statuses follow the stock level: "Sold Out" at zero, "Low Stock" below a
+material's min_stock_level (at or below LOW_STOCK_THRESHOLD for inventory),
+"In Stock" otherwise. Each recompute is one UPDATE per table that only
+touches rows whose status is wrong and returns the status it replaced, so a
+sweep over an up-to-date catalog writes nothing. Rows entering "Low Stock" or
+"Sold Out" become events, published on Redis (``<CACHE_KEY_PREFIX>:
+<STOCK_EVENTS_CHANNEL>``) when REDIS_URL is set and passed to in-process
+listeners. Runs from the Celery tasks in services.tasks.
+"""
+import json
+import logging
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import func, literal, update
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from models.database import Inventory, Material
+from services.inventory import ALERT_STATUSES, material_status, stock_status
+
+logger = logging.getLogger(__name__)
+
+StockEvent = Dict[str, object]
+
+_listeners: List[Callable[[StockEvent], None]] = []
+_redis = None
+
+
+def add_listener(listener: Callable[[StockEvent], None]) -> None:
+    """Call ``listener(event)`` for every event published by this process."""
+    _listeners.append(listener)
+
+
+class StatusChange(NamedTuple):
+    kind: str  # "material" or "product"
+    id: int  # material id or product id
+    level: Optional[int]  # quantity or stock left
+    status: str
+    previous_status: Optional[str]
+
+
+def stock_events(changes: Iterable[StatusChange]) -> List[StockEvent]:
+    """Events for the changes that enter an alert status."""
+    return [
+        change._asdict()
+        for change in changes
+        if change.status in ALERT_STATUSES and change.status != change.previous_status
+    ]
+
+
+def _changes(db: Session, stmt) -> List[StatusChange]:
+    rows = db.execute(stmt.execution_options(synchronize_session=False)).all()
+    return [StatusChange(*row) for row in rows]
+
+
+def recompute_materials(
+    db: Session, ids: Optional[Iterable[int]] = None
+) -> List[StatusChange]:
+    """Fix Material.status (all rows, or ``ids``); returns the rows changed."""
+    old = Material.__table__.alias("old")
+    status = material_status(
+        func.coalesce(Material.quantity, 0), func.coalesce(Material.min_stock_level, 0)
+    )
+    stmt = (
+        update(Material)
+        .where(old.c.id == Material.id, Material.status.is_distinct_from(status))
+        .values(status=status)
+        .returning(
+            literal("material"),
+            Material.id,
+            Material.quantity,
+            Material.status,
+            old.c.status,
+        )
+    )
+    if ids is not None:
+        stmt = stmt.where(Material.id.in_(list(ids)))
+    return _changes(db, stmt)
+
+
+def recompute_inventory(
+    db: Session, product_ids: Optional[Iterable[int]] = None
+) -> List[StatusChange]:
+    """Fix Inventory.status (all rows, or ``product_ids``); returns the rows changed."""
+    old = Inventory.__table__.alias("old")
+    status = stock_status(func.coalesce(Inventory.stock, 0))
+    stmt = (
+        update(Inventory)
+        .where(old.c.id == Inventory.id, Inventory.status.is_distinct_from(status))
+        .values(status=status)
+        .returning(
+            literal("product"),
+            Inventory.product_id,
+            Inventory.stock,
+            Inventory.status,
+            old.c.status,
+        )
+    )
+    if product_ids is not None:
+        stmt = stmt.where(Inventory.product_id.in_(list(product_ids)))
+    return _changes(db, stmt)
+
+
+def publish(events: List[StockEvent]) -> None:
+    """Log ``events`` and hand them to Redis subscribers and local listeners."""
+    global _redis
+    for event in events:
+        logger.warning(
+            "%s %s is %s (level %s)",
+            event["kind"].capitalize(), event["id"], event["status"], event["level"],
+        )
+    if events and settings.redis_url:
+        if _redis is None:
+            import redis
+
+            _redis = redis.Redis.from_url(settings.redis_url)
+        channel = f"{settings.cache_key_prefix}:{settings.stock_events_channel}"
+        with _redis.pipeline(transaction=False) as pipe:
+            for event in events:
+                pipe.publish(channel, json.dumps(event))
+            pipe.execute()
+    for event in events:
+        for listener in _listeners:
+            try:
+                listener(event)
+            except Exception:
+                logger.exception("Stock event listener failed")
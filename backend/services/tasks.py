@@ -0,0 +1,84 @@
+"""Celery tasks (see core.celery_app for running a worker)."""
+import asyncio
+from dataclasses import asdict
+from typing import Dict, List, Optional
+
+from core.celery_app import celery_app
+from core.config import settings
+from crud.material import material_crud
+from crud.product import product_crud
+from models.database import SessionLocal
+from services import outbox, stock_alerts
+from services.reports import FOLD_DELTAS
+
+
+@celery_app.task
+def recompute_stock_statuses(
+    material_ids: Optional[List[int]] = None,
+    product_ids: Optional[List[int]] = None,
+) -> int:
+    """Fix Material/Inventory statuses and publish low-stock events.
+
+    With no ids this sweeps both tables (the periodic job); otherwise only
+    the given materials / products are checked. Returns the event count.
+    """
+    sweep = material_ids is None and product_ids is None
+    with SessionLocal() as db:
+        changes = []
+        if sweep or material_ids:
+            changes += stock_alerts.recompute_materials(db, material_ids)
+        if sweep or product_ids:
+            changes += stock_alerts.recompute_inventory(db, product_ids)
+        for table, key, kind in (
+            ("materials", "id", "material"), ("inventory", "product_id", "product")
+        ):
+            ids = [c.id for c in changes if c.kind == kind]
+            if ids:
+                db.execute(outbox.row_events(table, "update", key), {"ids": ids})
+        db.commit()
+    for crud, kind in ((material_crud, "material"), (product_crud, "product")):
+        ids = [c.id for c in changes if c.kind == kind]
+        if ids:
+            crud.invalidate_cache_nowait(*ids)
+    events = stock_alerts.stock_events(changes)
+    stock_alerts.publish(events)
+    return len(events)
+
+
+@celery_app.task
+def publish_stock_events(events: List[dict]) -> None:
+    """Publish events found on the request path (e.g. by order placement)."""
+    stock_alerts.publish(events)
+
+
+@celery_app.task
+def prune_outbox() -> int:
+    """Delete change-feed events past OUTBOX_RETENTION_HOURS."""
+    with SessionLocal() as db:
+        deleted = db.execute(outbox.prune_statement()).rowcount
+        db.commit()
+    return deleted
+
+
+@celery_app.task
+def fold_report_deltas() -> int:
+    """Fold pending report deltas into the daily tables, one
+    REPORT_FOLD_BATCH_SIZE batch per transaction; returns the count."""
+    batch = settings.report_fold_batch_size
+    folded = 0
+    with SessionLocal() as db:
+        while True:
+            count = db.execute(FOLD_DELTAS, {"batch": batch}).scalar_one()
+            db.commit()
+            folded += count
+            if count < batch:
+                return folded
+
+
+@celery_app.task
+def sync_shopee_listings() -> Dict[str, int]:
+    """Push changed prices / stock to Shopee; returns the SyncReport counts."""
+    # Imported here: the HTTP client stack is only needed by this task
+    from services import shopee_sync
+
+    return asdict(asyncio.run(shopee_sync.sync_listings()))
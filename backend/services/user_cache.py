@@ -0,0 +1,72 @@
+"""
+Resolved-user cache for get_current_user.
+
+Maps a token ``sub`` (the user's email) to a UserBase snapshot so protected
+routes skip the users lookup. The TTL never exceeds the token lifetime, and
+changing a user's role or password (or deleting the user) through the ORM
+evicts the entry as soon as that change commits. Evicting at flush instead
+would let a concurrent login re-cache the old row for a whole TTL, and would
+evict for changes that then roll back.
+"""
+from typing import Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from core.cache import make_cache
+from core.config import settings
+from models.database import User
+from models.schemas import UserBase
+
+user_cache = make_cache(
+    "user",
+    maxsize=settings.user_cache_size,
+    ttl=min(settings.user_cache_ttl_seconds, settings.access_token_expire_minutes * 60),
+)
+
+
+async def get_cached_user(email: str) -> Optional[UserBase]:
+    raw = await user_cache.get(email)
+    return UserBase.model_validate_json(raw) if raw is not None else None
+
+
+async def cache_user(user: UserBase) -> None:
+    await user_cache.set(user.email, user.model_dump_json().encode())
+
+
+def invalidate_user(email: str) -> None:
+    user_cache.delete_nowait(email)
+
+
+def _stage_eviction(target: User, *emails: Optional[str]) -> None:
+    session = inspect(target).session
+    if session is not None:
+        session.info.setdefault("evict_users", set()).update(e for e in emails if e)
+
+
+@event.listens_for(User, "after_update")
+def _evict_on_credentials_change(mapper, connection, target: User) -> None:
+    state = inspect(target)
+    if not any(
+        state.attrs[attr].history.has_changes()
+        for attr in ("email", "role", "hashed_password")
+    ):
+        return
+    # Entries are keyed by email: an email change must also evict the old one
+    _stage_eviction(target, target.email, *state.attrs.email.history.deleted)
+
+
+@event.listens_for(User, "after_delete")
+def _evict_on_delete(mapper, connection, target: User) -> None:
+    _stage_eviction(target, target.email)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_staged(session: Session) -> None:
+    for email in session.info.pop("evict_users", ()):
+        invalidate_user(email)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_staged(session: Session) -> None:
+    session.info.pop("evict_users", None)
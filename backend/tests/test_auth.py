@@ -0,0 +1,41 @@
+"""Login: bcrypt runs without holding a DB connection, and 429s before the query."""
+import pytest
+from fastapi import HTTPException
+
+from models.database import AsyncSessionLocal, User, async_engine
+from services import crud
+from services.crud import authenticate_user_async, get_password_hash
+from services.hashing import hash_pool
+
+
+async def add_user(db) -> None:
+    db.add(User(email="staff@tsubame.vn", hashed_password=get_password_hash("pw"), role="staff"))
+    await db.commit()
+
+
+async def test_verify_runs_with_the_connection_returned(db, monkeypatch):
+    await add_user(db)
+    await db.close()
+    checked_out = []
+    verify = crud.pwd_context.verify
+
+    def recording_verify(*args):
+        checked_out.append(async_engine.pool.checkedout())
+        return verify(*args)
+
+    monkeypatch.setattr(crud.pwd_context, "verify", recording_verify)
+    async with AsyncSessionLocal() as session:
+        user = await authenticate_user_async(session, "staff@tsubame.vn", "pw")
+        assert (user.email, user.role) == ("staff@tsubame.vn", "staff")
+        assert await authenticate_user_async(session, "staff@tsubame.vn", "nope") is False
+    assert checked_out == [0, 0]
+
+
+async def test_full_hash_pool_answers_429_without_a_query(db, count_statements, monkeypatch):
+    await add_user(db)
+    monkeypatch.setattr(hash_pool, "pending", hash_pool.max_pending)
+    with count_statements() as statements:
+        with pytest.raises(HTTPException) as raised:
+            await authenticate_user_async(db, "staff@tsubame.vn", "pw")
+    assert raised.value.status_code == 429
+    assert statements == []
@@ -0,0 +1,35 @@
+"""BOM engine dirty tracking."""
+import time
+
+import pytest
+
+from models.schemas import BomProductRow
+from services.bom import BomEngine
+
+
+class FailingSession:
+    """Stands in for an AsyncSession whose queries fail (e.g. a dropped connection)."""
+
+    async def scalars(self, *args, **kwargs):
+        raise ConnectionError("connection lost")
+
+    execute = scalars
+
+
+async def test_failed_partial_refresh_keeps_marks_and_rows():
+    engine = BomEngine(ttl=300)
+    row = BomProductRow(
+        product_id=1, material_cost=10.0, buildable=3, low_stock_material_ids=[]
+    )
+    engine._products = {1: row}
+    engine._computed_at = time.monotonic()
+    engine.mark_products([1])
+    engine.mark_materials([5])
+
+    with pytest.raises(ConnectionError):
+        await engine.report(FailingSession())
+
+    assert engine._dirty_products == {1}
+    assert engine._dirty_materials == {5}
+    assert engine._products == {1: row}
+    assert engine.partial_refreshes == 0
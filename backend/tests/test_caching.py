@@ -0,0 +1,115 @@
+"""Response cache: stale-while-revalidate, and replica renders after a write."""
+import time
+from contextlib import asynccontextmanager
+
+import asyncio
+
+import httpx
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+
+from api import caching
+from core.cache import Cache, MemoryBackend
+from core.config import settings
+from core.replicas import READ_PRIMARY_COOKIE
+from crud.material import material_crud
+from main import app
+from models.database import Material
+
+
+async def add_material(db, name: str) -> None:
+    await db.execute(insert(Material).values(
+        name=name, unit="pcs", quantity=10, min_stock_level=1, status="In Stock", price=1.0,
+    ))
+    await db.commit()
+
+
+@pytest.fixture
+async def client(monkeypatch):
+    monkeypatch.setattr(settings, "response_cache_stale_seconds", 60.0)
+    await material_crud.__cache__.clear()
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        yield client
+
+
+async def test_stale_page_is_refreshed_in_its_own_session(db, client, monkeypatch):
+    sessions = []
+    read_session = caching.read_session
+
+    @asynccontextmanager
+    async def recording_session(primary: bool = False):
+        async with read_session(primary) as session:
+            sessions.append(session)
+            yield session
+
+    monkeypatch.setattr(caching, "read_session", recording_session)
+    await add_material(db, "Washi tape")
+    first = await client.get("/api/materials/")
+    assert [m["name"] for m in first.json()] == ["Washi tape"]
+
+    # Raw insert: no invalidation, so only the refresh can pick it up
+    await add_material(db, "Kraft paper")
+    later = time.time() + material_crud.__cache__.ttl + 1
+    monkeypatch.setattr(caching.time, "time", lambda: later)
+    stale_before = caching.stale_served["materials"]
+
+    stale = await client.get("/api/materials/")
+    assert stale.content == first.content
+    assert caching.stale_served["materials"] == stale_before + 1
+    assert len(sessions) == 1
+
+    refreshed = await client.get("/api/materials/")
+    assert [m["name"] for m in refreshed.json()] == ["Washi tape", "Kraft paper"]
+    assert len(sessions) == 1
+
+
+def read_request(cookie: bool = False) -> Request:
+    headers = [(b"cookie", f"{READ_PRIMARY_COOKIE}=1".encode())] if cookie else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+class LaggingReplica:
+    """Renders on a replica stand-in return the rows from before the write."""
+
+    def __init__(self) -> None:
+        self.version = b"old"
+        self.caught_up = True
+        self.primary = AsyncSession()
+        self.replica = AsyncSession()
+        self.replica.info["replica"] = "stand-in"
+
+    async def render(self, db: AsyncSession):
+        lagging = db is self.replica and not self.caught_up
+        return (b"old" if lagging else self.version), {}
+
+
+async def test_replica_render_after_write_is_not_cached(monkeypatch):
+    monkeypatch.setattr(settings, "db_read_primary_seconds", 0.2)
+    cache = Cache("lagging", MemoryBackend(16), ttl=60)
+    data = LaggingReplica()
+
+    async def get(db, cookie=False):
+        response = await caching.cached_json(
+            read_request(cookie), db, cache, "item:1", data.render
+        )
+        return response.body
+
+    assert await get(data.replica) == b"old"
+    # The write: the primary has it, the replica does not yet
+    data.version, data.caught_up = b"new", False
+    await cache.invalidate("item:1")
+
+    assert await get(data.replica) == b"old"
+    assert await cache.get("item:1") is None
+    # The writer reads the primary, and its render is stored for everyone
+    assert await get(data.primary, cookie=True) == b"new"
+    assert await get(data.replica) == b"new"
+
+    # Past DB_READ_PRIMARY_SECONDS, replica renders are cached again
+    await asyncio.sleep(0.25)
+    data.version, data.caught_up = b"newer", True
+    await cache.delete("item:1")
+    assert await get(data.replica) == b"newer"
+    assert await cache.get("item:1") is not None
@@ -0,0 +1,72 @@
+"""Image processing (runs in-process here, not in the pool)."""
+import io
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from services.image_urls import variant_path
+from services.images import process_image
+
+WIDTHS = (160, 320, 640)
+
+
+def encode(image: Image.Image, fmt: str) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, fmt)
+    return buffer.getvalue()
+
+
+def variant(root: Path, key: str, width: int, fmt: str) -> Image.Image:
+    return Image.open(root / variant_path(key, width, fmt))
+
+
+def test_widths_are_clamped_to_the_image_and_deduplicated(tmp_path):
+    data = encode(Image.new("RGB", (200, 100), "red"), "JPEG")
+    stored = process_image(data, str(tmp_path), WIDTHS)
+    assert (stored.width, stored.height, stored.widths) == (200, 100, [160, 200])
+    assert variant(tmp_path, stored.key, 200, "webp").size == (200, 100)
+    assert variant(tmp_path, stored.key, 160, "avif").size == (160, 80)
+
+    narrow = process_image(encode(Image.new("RGB", (90, 30)), "PNG"), str(tmp_path), WIDTHS)
+    assert narrow.widths == [90]
+
+
+@pytest.mark.parametrize("source, expected", [
+    (Image.new("RGBA", (64, 64), (0, 0, 255, 128)), "RGBA"),
+    (Image.new("LA", (64, 64), (90, 200)), "RGBA"),
+    (Image.new("L", (64, 64), 90), "RGB"),
+    (Image.new("CMYK", (64, 64)), "RGB"),
+])
+def test_alpha_is_kept_and_other_modes_become_rgb(tmp_path, source, expected):
+    fmt = "JPEG" if source.mode == "CMYK" else "PNG"
+    stored = process_image(encode(source, fmt), str(tmp_path), WIDTHS)
+    assert variant(tmp_path, stored.key, 64, "webp").mode == expected
+
+
+def test_palette_transparency_counts_as_alpha(tmp_path):
+    source = Image.new("P", (32, 32), 0)
+    source.info["transparency"] = 0
+    stored = process_image(encode(source, "PNG"), str(tmp_path), WIDTHS)
+    assert variant(tmp_path, stored.key, 32, "webp").mode == "RGBA"
+
+
+def test_same_upload_reuses_the_manifest(tmp_path):
+    data = encode(Image.new("RGB", (400, 200), "green"), "PNG")
+    first = process_image(data, str(tmp_path), WIDTHS)
+    variant_file = tmp_path / variant_path(first.key, 320, "webp")
+    variant_file.unlink()
+
+    # Not decoded again: the missing variant is not rewritten
+    again = process_image(data, str(tmp_path), (100,))
+    assert again == first
+    assert not variant_file.exists()
+
+
+def test_non_images_are_rejected_without_files(tmp_path):
+    with pytest.raises(ValueError, match="Not a supported image"):
+        process_image(b"%PDF-1.7 not an image", str(tmp_path), WIDTHS)
+    # A format Pillow reads but uploads do not allow
+    with pytest.raises(ValueError):
+        process_image(encode(Image.new("RGB", (8, 8)), "BMP"), str(tmp_path), WIDTHS)
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,55 @@
+"""CSV / NDJSON import: partial updates keep the stored values."""
+import io
+
+from sqlalchemy import select
+
+from models.database import Inventory, Material, Product
+from services.importer import MATERIAL_IMPORT, PRODUCT_IMPORT, import_rows, iter_upload_rows
+
+
+def csv_rows(text: str):
+    return iter_upload_rows(io.BytesIO(text.encode()), "csv")
+
+
+async def test_update_row_may_give_only_some_fields(db):
+    created = await import_rows(db, PRODUCT_IMPORT, csv_rows(
+        "name,description,category,price,cost,image,stock\n"
+        "Fox sticker,Vinyl,Sticker,35000,12000,https://img/fox.png,20\n"
+    ))
+    assert created.inserted == 1
+    product_id = created.inserted_ids[0]
+
+    updated = await import_rows(db, PRODUCT_IMPORT, csv_rows(
+        f"id,price,stock\n{product_id},36000,\n"
+    ))
+    assert (updated.updated, updated.error_count) == (1, 0)
+
+    product = await db.scalar(
+        select(Product).where(Product.id == product_id).execution_options(populate_existing=True)
+    )
+    assert (product.name, product.image, product.price) == (
+        "Fox sticker", "https://img/fox.png", 36000.0
+    )
+    assert await db.scalar(
+        select(Inventory.stock).where(Inventory.product_id == product_id)
+    ) == 20
+
+
+async def test_new_rows_still_need_every_required_field(db):
+    result = await import_rows(db, MATERIAL_IMPORT, iter_upload_rows(io.BytesIO(
+        b'{"name": "Washi tape", "price": 1.5}\n'
+        b'{"name": "Kraft paper", "unit": "sheet", "quantity": 100,'
+        b' "min_stock_level": 10, "status": "In Stock", "price": 0.5}\n'
+    ), "ndjson"))
+    assert (result.inserted, result.error_count) == (1, 1)
+    assert result.errors[0].row == 1
+
+    material_id = result.inserted_ids[0]
+    partial = await import_rows(db, MATERIAL_IMPORT, iter_upload_rows(io.BytesIO(
+        f'{{"id": {material_id}, "quantity": 80}}\n'.encode()
+    ), "ndjson"))
+    assert (partial.updated, partial.error_count) == (1, 0)
+    material = await db.scalar(
+        select(Material).where(Material.id == material_id).execution_options(populate_existing=True)
+    )
+    assert (material.name, material.quantity, material.unit) == ("Kraft paper", 80, "sheet")
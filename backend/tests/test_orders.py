@@ -0,0 +1,63 @@
+"""Order placement under contention: concurrent checkouts never oversell."""
+import asyncio
+
+from fastapi import HTTPException
+from sqlalchemy import func, insert, select
+
+from models.database import (
+    AsyncSessionLocal,
+    Distributor,
+    DistributorDetail,
+    Inventory,
+    OrderDetail,
+    Product,
+)
+from models.schemas import OrderCreate, OrderLineCreate
+from services.orders import place_order
+
+STOCK = 300
+QUANTITY = 2
+CHECKOUTS = 400
+
+
+async def checkout(detail_id: int, product_id: int) -> bool:
+    payload = OrderCreate(
+        distributor_detail_id=detail_id,
+        items=[OrderLineCreate(product_id=product_id, quantity=QUANTITY)],
+    )
+    # Each on its own session, so they race for the same inventory row
+    async with AsyncSessionLocal() as session:
+        try:
+            await place_order(session, payload)
+        except HTTPException as exc:
+            assert exc.status_code == 409
+            return False
+    return True
+
+
+async def test_concurrent_checkouts_do_not_oversell(db):
+    distributor_id = await db.scalar(
+        insert(Distributor).values(name="contention").returning(Distributor.id)
+    )
+    detail_id = await db.scalar(
+        insert(DistributorDetail)
+        .values(distributor_id=distributor_id, channel="ONLINE")
+        .returning(DistributorDetail.id)
+    )
+    product_id = await db.scalar(
+        insert(Product).values(name="contention", price=35000).returning(Product.id)
+    )
+    await db.execute(
+        insert(Inventory).values(product_id=product_id, stock=STOCK, status="In Stock")
+    )
+    await db.commit()
+
+    results = await asyncio.gather(
+        *(checkout(detail_id, product_id) for _ in range(CHECKOUTS))
+    )
+
+    stock = await db.scalar(select(Inventory.stock).where(Inventory.product_id == product_id))
+    sold = await db.scalar(select(func.sum(OrderDetail.quantity)))
+    assert stock >= 0
+    assert sum(results) * QUANTITY == STOCK - stock == sold
+    assert stock < QUANTITY  # every checkout that could be served was
@@ -0,0 +1,75 @@
+"""Product list queries: eager loading keeps the statement count flat."""
+from sqlalchemy import insert
+
+from api.products import _serialize
+from crud.product import product_crud
+from models.database import Inventory, Product
+
+
+async def add_products(db, count: int) -> None:
+    ids = (await db.scalars(
+        insert(Product).returning(Product.id),
+        [{"name": f"Product {i}", "price": 1000.0 + i} for i in range(count)],
+    )).all()
+    # Every third product has no inventory row
+    await db.execute(insert(Inventory), [
+        {"product_id": id, "stock": n % 4, "status": "In Stock"}
+        for n, id in enumerate(ids) if n % 3
+    ])
+    await db.commit()
+
+
+async def test_product_page_statement_count_does_not_grow(db, count_statements):
+    counts = {}
+    for size in (5, 50):
+        await add_products(db, size)
+        db.expunge_all()
+        with count_statements() as statements:
+            page = await product_crud.get_multi(db, limit=size)
+            # What the route does with the page; a lazy load would run more SQL
+            # (or fail outright on an AsyncSession)
+            [_serialize(product) for product in page]
+        assert len(page) == size
+        counts[size] = len(statements)
+    assert counts[5] == counts[50] == 1
+
+
+async def test_stock_sort_keeps_products_without_inventory(db, count_statements):
+    await add_products(db, 30)  # 10 of them without inventory
+    for order_by in ("stock", "-stock"):
+        seen, cursor = [], None
+        while True:
+            with count_statements() as statements:
+                page = await product_crud.get_multi(
+                    db, limit=7, cursor=cursor, order_by=order_by
+                )
+            assert statements[0].count("JOIN inventory") == 1
+            seen += page
+            cursor = product_crud.next_cursor(page, limit=7, order_by=order_by)
+            if cursor is None:
+                break
+        assert sorted(p.id for p in seen) == list(range(1, 31))
+        stocks = [p.inventory.stock for p in seen[:20]]
+        assert stocks == sorted(stocks, reverse=order_by.startswith("-"))
+        # Products without inventory come last either way
+        assert all(p.inventory is None for p in seen[20:])
+
+
+async def test_price_sort_pages_through_null_prices(db):
+    await add_products(db, 12)
+    await db.execute(insert(Product), [{"name": f"Unpriced {i}"} for i in range(5)])
+    await db.commit()
+    for order_by in ("price", "-price"):
+        seen, cursor = [], None
+        while True:
+            page = await product_crud.get_multi(db, limit=4, cursor=cursor, order_by=order_by)
+            seen += page
+            cursor = product_crud.next_cursor(page, limit=4, order_by=order_by)
+            if cursor is None:
+                break
+        assert sorted(p.id for p in seen) == list(range(1, 18))
+        prices = [p.price for p in seen[:12]]
+        assert prices == sorted(prices, reverse=order_by.startswith("-"))
+        # Unpriced products come last either way, ordered by id like the rest
+        unpriced = [p.id for p in seen[12:]]
+        assert unpriced == sorted(range(13, 18), reverse=order_by.startswith("-"))
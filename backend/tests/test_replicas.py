@@ -0,0 +1,112 @@
+"""Read replica routing: round-robin, health checks, read-your-writes."""
+import time
+from typing import List
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core import deps
+from core.deps import get_read_db
+from core.replicas import READ_PRIMARY_COOKIE, ReadYourWritesMiddleware, Replica, ReplicaSet
+from models.database import _replica_engine, async_engine
+
+# Nothing listens on port 1, so connecting fails at once
+UNREACHABLE_URL = "postgresql://postgres@127.0.0.1:1/replica"
+
+
+def healthy_set(count: int) -> ReplicaSet:
+    """``count`` replicas marked healthy and just checked (no checks run)."""
+    replicas = ReplicaSet(
+        [f"postgresql://postgres@replica-{n}:5432/db" for n in range(count)],
+        _replica_engine,
+    )
+    for replica in replicas.replicas:
+        replica.set_health(True)
+        replica.checked_at = time.monotonic()
+    return replicas
+
+
+def picks(replicas: ReplicaSet, count: int) -> List[Replica]:
+    return [replicas.pick() for _ in range(count)]
+
+
+async def test_picks_replicas_round_robin():
+    replicas = healthy_set(3)
+    assert picks(replicas, 6) == replicas.replicas * 2
+
+
+async def test_unhealthy_replica_is_skipped():
+    replicas = healthy_set(3)
+    replicas.replicas[1].set_health(False)
+    first, _, third = replicas.replicas
+    assert picks(replicas, 4) == [first, third] * 2
+
+    for replica in replicas.replicas:
+        replica.set_health(False)
+    assert replicas.pick() is None
+
+
+async def test_failed_check_takes_replica_out():
+    replicas = ReplicaSet([UNREACHABLE_URL], _replica_engine)
+    replica = replicas.replicas[0]
+    replica.set_health(True)
+
+    assert await replicas.check(replica) is False
+    assert replicas.pick() is None
+
+
+async def test_new_replica_waits_for_first_check():
+    replicas = ReplicaSet([UNREACHABLE_URL], _replica_engine)
+    # Never checked: pick() schedules a check and uses the primary meanwhile
+    assert replicas.pick() is None
+    await replicas.replicas[0]._check
+    assert replicas.pick() is None
+
+
+@pytest.fixture
+def client(monkeypatch):
+    replicas = healthy_set(1)
+    monkeypatch.setattr(deps, "replicas", replicas)
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware)
+
+    @app.get("/read")
+    async def read(db: AsyncSession = Depends(get_read_db)):
+        return {"primary": db.bind is async_engine}
+
+    @app.post("/write")
+    async def write():
+        return {}
+
+    @app.post("/reject")
+    async def reject():
+        raise ValueError("rejected")
+
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app, raise_app_exceptions=False),
+        base_url="http://test",
+    )
+
+
+async def test_reads_go_to_a_replica(client):
+    async with client:
+        response = await client.get("/read")
+    assert response.json() == {"primary": False}
+    assert READ_PRIMARY_COOKIE not in response.cookies
+
+
+async def test_client_reads_own_writes_from_primary(client):
+    async with client:
+        write = await client.post("/write")
+        assert READ_PRIMARY_COOKIE in write.cookies
+        assert (await client.get("/read")).json() == {"primary": True}
+
+
+async def test_failed_write_does_not_pin_to_primary(client):
+    async with client:
+        reject = await client.post("/reject")
+        assert reject.status_code == 500
+        assert READ_PRIMARY_COOKIE not in reject.cookies
+        assert (await client.get("/read")).json() == {"primary": False}
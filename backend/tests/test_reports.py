@@ -0,0 +1,36 @@
+"""Report deltas are folded in bounded batches."""
+from datetime import date
+
+from sqlalchemy import func, insert, select
+
+from core.config import settings
+from models.database import DailyChannelRevenue, ReportDelta
+from services.reports import fold_deltas
+from services.tasks import fold_report_deltas
+
+
+async def add_deltas(db, count: int) -> None:
+    await db.execute(insert(ReportDelta), [
+        {"report": "channel", "day": date(2026, 1, 1), "key": "ONLINE",
+         "count": 1, "quantity": 0, "amount": 10.0}
+        for _ in range(count)
+    ])
+    await db.commit()
+
+
+async def channel_orders(db) -> int:
+    return await db.scalar(select(DailyChannelRevenue.orders))
+
+
+async def test_read_folds_one_batch_and_the_task_the_rest(db, monkeypatch):
+    monkeypatch.setattr(settings, "report_fold_batch_size", 2)
+    await add_deltas(db, 5)
+
+    assert await fold_deltas(db) == 2
+    assert await channel_orders(db) == 2
+    assert await db.scalar(select(func.count()).select_from(ReportDelta)) == 3
+
+    assert fold_report_deltas() == 3
+    assert await channel_orders(db) == 5
+    assert await db.scalar(select(func.count()).select_from(ReportDelta)) == 0
+    assert await db.scalar(select(DailyChannelRevenue.revenue)) == 50.0
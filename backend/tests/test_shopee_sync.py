@@ -0,0 +1,158 @@
+"""Shopee listing sync against a local stand-in for the Shopee API."""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Tuple
+from urllib.parse import urlsplit
+
+import pytest
+from sqlalchemy import insert, select, update
+
+from core.config import settings
+from models.database import Inventory, Product, ShopeeListing
+from services import shopee
+from services.shopee import UPDATE_PRICE_PATH, UPDATE_STOCK_PATH
+from services.shopee_sync import sync_listings
+
+
+class StandIn(ThreadingHTTPServer):
+    """Accepts every update, after answering the first ``failures`` requests
+    with those statuses; records (path, item_id) of each accepted update."""
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.failures: List[int] = []
+        self.failing_items: set = set()  # always answered with 500
+        self.requests = 0
+        self.updates: List[Tuple[str, int]] = []
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        server = self.server
+        path = urlsplit(self.path).path
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.requests += 1
+            status = server.failures.pop(0) if server.failures else 200
+            if body["item_id"] in server.failing_items:
+                status = 500
+            if status == 200:
+                server.updates.append((path, body["item_id"]))
+        payload = json.dumps(
+            {"error": "", "response": {"failure_list": []}} if status == 200
+            else {"error": "error_busy"}
+        ).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        if status == 429:
+            self.send_header("Retry-After", "0")
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+@pytest.fixture
+def stand_in(monkeypatch):
+    server = StandIn()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(settings, "shopee_api_url", server.url)
+    monkeypatch.setattr(settings, "shopee_partner_id", "1")
+    monkeypatch.setattr(settings, "shopee_partner_key", "test-key")
+    monkeypatch.setattr(settings, "shopee_rate_limit", 0)
+    monkeypatch.setattr(settings, "shopee_max_retries", 2)
+    monkeypatch.setattr(shopee, "BACKOFF_BASE_SECONDS", 0.01)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+async def add_linked_products(db, count: int) -> List[int]:
+    """Products linked to listings 1000 + n, with stock."""
+    ids = (await db.scalars(
+        insert(Product).returning(Product.id),
+        [
+            {
+                "name": f"Product {n}",
+                "price": 35000.0,
+                "shopee_link": f"https://shopee.vn/product/1/{1000 + n}",
+            }
+            for n in range(count)
+        ],
+    )).all()
+    await db.execute(insert(Inventory), [
+        {"product_id": id, "stock": 50, "status": "In Stock"} for id in ids
+    ])
+    await db.commit()
+    return list(ids)
+
+
+async def test_unchanged_catalog_makes_no_requests(db, stand_in):
+    await add_linked_products(db, 5)
+    first = await sync_listings()
+    assert (first.changed, first.synced, first.requests) == (5, 5, 10)
+
+    second = await sync_listings()
+    assert (second.changed, second.requests) == (0, 0)
+    assert stand_in.requests == 10
+
+
+async def test_only_changed_fields_are_pushed(db, stand_in):
+    ids = await add_linked_products(db, 5)
+    await sync_listings()
+    stand_in.updates.clear()
+
+    await db.execute(update(Product).where(Product.id == ids[1]).values(price=36000.0))
+    await db.execute(update(Inventory).where(Inventory.product_id == ids[3]).values(stock=49))
+    await db.commit()
+    report = await sync_listings()
+
+    assert (report.changed, report.synced, report.requests) == (2, 2, 2)
+    assert sorted(stand_in.updates) == [(UPDATE_PRICE_PATH, 1001), (UPDATE_STOCK_PATH, 1003)]
+
+
+async def test_429_and_5xx_are_retried(db, stand_in):
+    await add_linked_products(db, 1)
+    stand_in.failures = [429, 503]
+
+    report = await sync_listings()
+
+    assert (report.synced, report.failed, report.retries, report.requests) == (1, 0, 2, 4)
+    assert sorted(stand_in.updates) == [(UPDATE_PRICE_PATH, 1000), (UPDATE_STOCK_PATH, 1000)]
+
+
+async def test_failed_push_keeps_last_error_and_is_retried(db, stand_in):
+    ids = await add_linked_products(db, 2)
+    stand_in.failing_items = {1001}
+
+    report = await sync_listings()
+
+    assert (report.changed, report.synced, report.failed) == (2, 1, 1)
+    listings = {
+        listing.product_id: listing
+        for listing in (await db.scalars(select(ShopeeListing))).all()
+    }
+    assert listings[ids[0]].last_error is None
+    assert "HTTP 500" in listings[ids[1]].last_error
+    assert listings[ids[1]].synced_price is None
+
+    # The next run picks the failed listing up again, and only that one
+    stand_in.failing_items = set()
+    retry = await sync_listings()
+    assert (retry.changed, retry.synced) == (1, 1)
+    db.expire_all()
+    listing = await db.get(ShopeeListing, ids[1])
+    assert listing.last_error is None
+    assert listing.synced_price == 35000.0
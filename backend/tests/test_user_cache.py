@@ -0,0 +1,51 @@
+"""Resolved-user cache: credential changes evict the right keys on commit."""
+from sqlalchemy import select
+
+from models.database import User
+from services import user_cache
+
+
+async def add_user(db) -> User:
+    user = User(email="staff@tsubame.vn", hashed_password="hash-1", role="staff")
+    db.add(user)
+    await db.commit()
+    return user
+
+
+def record_evictions(monkeypatch):
+    evicted = []
+    monkeypatch.setattr(user_cache, "invalidate_user", evicted.append)
+    return evicted
+
+
+async def test_role_or_password_change_evicts_only_the_email(db, monkeypatch):
+    user = await add_user(db)
+    evicted = record_evictions(monkeypatch)
+
+    user.role = "admin"
+    user.hashed_password = "hash-2"
+    await db.commit()
+
+    assert evicted == ["staff@tsubame.vn"]
+
+
+async def test_email_change_evicts_old_and_new_email(db, monkeypatch):
+    user = await add_user(db)
+    evicted = record_evictions(monkeypatch)
+
+    user.email = "owner@tsubame.vn"
+    await db.commit()
+
+    assert sorted(evicted) == ["owner@tsubame.vn", "staff@tsubame.vn"]
+
+
+async def test_rolled_back_change_evicts_nothing(db, monkeypatch):
+    user = await add_user(db)
+    evicted = record_evictions(monkeypatch)
+
+    user.role = "admin"
+    await db.flush()
+    await db.rollback()
+
+    assert evicted == []
+    assert await db.scalar(select(User.role)) == "staff"
@@ -121,11 +121,22 @@ export const authAPI = {
   },
 };
 
+// Server-side filters/sorting for GET /products/ (sort: column, "-" prefix = descending)
+export interface ProductQuery {
+  q?: string;
+  category?: string;
+  min_price?: number;
+  max_price?: number;
+  sort?: 'id' | '-id' | 'name' | '-name' | 'price' | '-price' | 'stock' | '-stock';
+  skip?: number;
+  limit?: number;
+}
+
 // Products API
 export const productsAPI = {
-  getAll: async (): Promise<Product[]> => {
+  getAll: async (params?: ProductQuery): Promise<Product[]> => {
     try {
-      const response = await api.get('/products/');
+      const response = await api.get('/products/', { params });
       const data = response.data;
       return Array.isArray(data) ? data : [];
     } catch {